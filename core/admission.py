@@ -0,0 +1,130 @@
+"""
+Admission control for AURA's pipeline stages.
+Each stage (LLM calls, tool execution, TTS) gets a concurrency limit and a
+bounded wait queue with a deadline, so overload is shed quickly with a
+429/503 instead of letting every request's latency collapse together.
+"""
+
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from core.logger import get_logger
+from core.metrics import QUEUE_DEPTH, STAGE_ACTIVE, STAGE_REJECTED
+from settings.config_loader import config
+
+logger = get_logger(__name__)
+
+# Default (concurrency, queue_size, queue_timeout seconds) per stage
+STAGE_DEFAULTS = {
+    "llm": (32, 128, 10.0),
+    "tools": (32, 128, 5.0),
+    "tts": (4, 32, 10.0),
+}
+
+
+class OverloadedError(Exception):
+    """Raised when a stage cannot admit more work."""
+
+    def __init__(self, stage: str, status_code: int, retry_after: int, reason: str):
+        """
+        Args:
+            stage: Name of the stage that rejected the work
+            status_code: 429 when the wait queue is full, 503 when the wait timed out
+            retry_after: Suggested seconds before retrying
+            reason: Human-readable explanation
+        """
+        super().__init__(f"{stage} stage overloaded: {reason}")
+        self.stage = stage
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class StageLimiter:
+    """Concurrency limit plus a bounded, deadline-aware wait queue."""
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, queue_timeout: float):
+        """
+        Args:
+            name: Stage name (used in errors, logs and metrics)
+            concurrency: Maximum units of work running at once
+            queue_size: Maximum callers allowed to wait for a slot
+            queue_timeout: Seconds a caller may wait before being rejected
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Smoothed time a slot is held, used to estimate Retry-After
+        self._avg_hold = 1.0
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a slot is likely to be free."""
+        backlog = (self.waiting + 1) / max(self.concurrency, 1)
+        return max(1, math.ceil(backlog * self._avg_hold))
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one slot of this stage for the duration of the block.
+
+        Raises:
+            OverloadedError: 429 if the wait queue is full, 503 if no slot
+                freed up within queue_timeout
+        """
+        if self._semaphore.locked() and self.waiting >= self.queue_size:
+            logger.warning(f"Rejecting {self.name} work: queue full ({self.waiting} waiting)")
+            STAGE_REJECTED.inc(stage=self.name, status="429")
+            raise OverloadedError(self.name, 429, self._retry_after(), "queue full")
+
+        self.waiting += 1
+        QUEUE_DEPTH.set(self.waiting, stage=self.name)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            logger.warning(f"Rejecting {self.name} work: no slot within {self.queue_timeout}s")
+            STAGE_REJECTED.inc(stage=self.name, status="503")
+            raise OverloadedError(self.name, 503, self._retry_after(), "queue wait timed out")
+        finally:
+            self.waiting -= 1
+            QUEUE_DEPTH.set(self.waiting, stage=self.name)
+
+        self.active += 1
+        STAGE_ACTIVE.set(self.active, stage=self.name)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            yield
+        finally:
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * (loop.time() - start)
+            self.active -= 1
+            STAGE_ACTIVE.set(self.active, stage=self.name)
+            self._semaphore.release()
+
+
+def _build_limiters() -> Dict[str, StageLimiter]:
+    """Create one limiter per stage from the 'limits' config section."""
+    limiters = {}
+    for stage, (concurrency, queue_size, queue_timeout) in STAGE_DEFAULTS.items():
+        limiters[stage] = StageLimiter(
+            stage,
+            concurrency=config.get(f'limits.{stage}.concurrency', concurrency),
+            queue_size=config.get(f'limits.{stage}.queue_size', queue_size),
+            queue_timeout=config.get(f'limits.{stage}.queue_timeout', queue_timeout)
+        )
+    return limiters
+
+
+# Global limiters shared by Brain, Mouth and the API
+limiters = _build_limiters()
+
+
+def get_limiter(stage: str) -> StageLimiter:
+    """Return the limiter for a stage ('llm', 'tools' or 'tts')."""
+    return limiters[stage]
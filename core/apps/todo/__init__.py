@@ -12,7 +12,9 @@ from .todo_tool import (
     delete_task,
     complete_task,
     search_tasks,
-    get_tasks_data
+    get_tasks_data,
+    tasks_hud,
+    warm_up_todo_storage
 )
 
 __all__ = [
@@ -24,5 +26,7 @@ __all__ = [
     'delete_task',
     'complete_task',
     'search_tasks',
-    'get_tasks_data'
+    'get_tasks_data',
+    'tasks_hud',
+    'warm_up_todo_storage'
 ]
@@ -464,6 +464,103 @@ def get_tasks_data(
         return {'tasks': [], 'statistics': {}, 'count': 0}
 
 
+def tasks_hud(args: dict, result) -> list:
+    """HUD renderer for the to-do tools: task statistics and the task list.
+    
+    Action tools (add, update, complete) don't return the list, so it is
+    read from the task database as it stands after the call.
+    """
+    tasks_data = get_tasks_data(
+        args.get("status"), args.get("priority"), args.get("category"), args.get("limit", 10)
+    )
+    if tasks_data['count'] == 0:
+        return []
+    
+    table_rows = []
+    for task in tasks_data['tasks']:
+        # Format priority with emoji
+        priority_display = {
+            'high': '🔴 HIGH',
+            'medium': '🟡 MEDIUM',
+            'low': '🟢 LOW'
+        }.get(task['priority'], task['priority'].upper())
+        
+        # Format status with emoji
+        status_display = {
+            'pending': '⏳ Pending',
+            'in_progress': '🔄 In Progress',
+            'completed': '✅ Completed'
+        }.get(task['status'], task['status'])
+        
+        # Format due date
+        due_display = "No deadline"
+        if task['due_date']:
+            due_date = datetime.fromisoformat(task['due_date'])
+            diff = (due_date - datetime.now()).days
+            
+            if diff < 0:
+                due_display = f"⚠️ {abs(diff)} day{'s' if abs(diff) > 1 else ''} overdue"
+            elif diff == 0:
+                due_display = "📅 Today"
+            elif diff == 1:
+                due_display = "📅 Tomorrow"
+            else:
+                due_display = due_date.strftime("%b %d, %Y")
+        
+        row_data = {
+            "Priority": priority_display,
+            "Task": task['title'],
+            "Due Date": due_display,
+            "Status": status_display
+        }
+        
+        # Highlight high priority pending tasks
+        if task['priority'] == 'high' and task['status'] == 'pending':
+            row_data["_highlight"] = True
+        
+        table_rows.append(row_data)
+    
+    sections = []
+    
+    # Add statistics as key-value section
+    stats = tasks_data['statistics']
+    stats_items = []
+    if 'pending' in stats:
+        stats_items.append({"key": "⏳ Pending", "value": str(stats['pending'])})
+    if 'in_progress' in stats:
+        stats_items.append({"key": "🔄 In Progress", "value": str(stats['in_progress'])})
+    if 'completed' in stats:
+        stats_items.append({"key": "✅ Completed", "value": str(stats['completed'])})
+    if 'overdue' in stats and stats['overdue'] > 0:
+        stats_items.append({"key": "⚠️ Overdue", "value": str(stats['overdue'])})
+    
+    if stats_items:
+        sections.append({
+            "title": "Task Statistics",
+            "type": "keyvalue",
+            "data": {
+                "items": stats_items
+            }
+        })
+    
+    # Add task table
+    sections.append({
+        "title": "To-Do List",
+        "type": "table",
+        "data": {
+            "headers": ["Priority", "Task", "Due Date", "Status"],
+            "rows": table_rows
+        }
+    })
+    return sections
+
+
+def warm_up_todo_storage() -> bool:
+    """Open the task database and run a query ahead of the first request"""
+    _todo_app.get_statistics()
+    return True
+
+
 def _format_due_date(due_date: datetime) -> str:
     """Format due date for display"""
     now = datetime.now()
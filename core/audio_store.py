@@ -0,0 +1,106 @@
+"""
+Short-lived in-memory store for synthesized audio.
+Replies reference audio by ID and the browser fetches the raw WAV from
+GET /audio/{id}, instead of receiving it base64-encoded inside JSON.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AudioStore:
+    """Keeps recent audio clips addressable by a random ID until they expire."""
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 256):
+        """
+        Initialize the store.
+
+        Args:
+            ttl_seconds: How long a clip stays retrievable after it is stored
+            max_entries: Upper bound on stored clips; oldest are dropped first
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clips: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes) -> str:
+        """
+        Store a clip and return its ID.
+
+        Args:
+            data: Complete WAV file bytes
+
+        Returns:
+            str: URL-safe ID for GET /audio/{id}
+        """
+        audio_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._evict(time.monotonic())
+            self._clips[audio_id] = (time.monotonic() + self.ttl_seconds, data)
+            while len(self._clips) > self.max_entries:
+                self._clips.popitem(last=False)
+        logger.debug(f"Stored audio {audio_id} ({len(data)} bytes)")
+        return audio_id
+
+    def get(self, audio_id: str) -> Optional[bytes]:
+        """Return the clip bytes, or None if unknown or expired."""
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._clips.get(audio_id)
+        return entry[1] if entry else None
+
+    def _evict(self, now: float):
+        """Drop expired clips (insertion order equals expiry order)."""
+        while self._clips:
+            audio_id, (expires_at, _) = next(iter(self._clips.items()))
+            if expires_at > now:
+                break
+            del self._clips[audio_id]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clips)
+
+
+def parse_range(range_header: str, size: int) -> Tuple[int, int]:
+    """
+    Parse a single-range HTTP Range header.
+
+    Args:
+        range_header: Header value such as "bytes=0-1023", "bytes=500-" or "bytes=-500"
+        size: Total size of the resource in bytes
+
+    Returns:
+        tuple: Inclusive (start, end) byte offsets
+
+    Raises:
+        ValueError: If the header is malformed or the range is unsatisfiable
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError(f"Unsupported range: {range_header}")
+
+    start_str, _, end_str = spec.strip().partition("-")
+    if start_str:
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+    else:
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length <= 0:
+            raise ValueError(f"Unsatisfiable range: {range_header}")
+        start = max(size - length, 0)
+        end = size - 1
+
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Unsatisfiable range: {range_header}")
+    return start, end
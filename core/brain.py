@@ -1,12 +1,169 @@
+import asyncio
+import time
+from typing import Dict, FrozenSet, Optional
+
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
-from core.tools import TOOL_DECLARATIONS, TOOL_FUNCTIONS
+from core.tools import (
+    TOOL_DECLARATIONS, TOOL_FUNCTIONS, ASYNC_TOOL_FUNCTIONS, TOOL_RESOURCES, TOOL_GROUPS, HUD_RENDERERS, ToolResult
+)
+from core import deadline
+from core.admission import OverloadedError, get_limiter
+from core.context import GenerationContext, ToolCallRecord
+from core.intents import IntentMatch, IntentMatcher
+from core.model_calls import ModelCaller
+from core.model_router import (
+    DEFAULT_CAPABLE_GROUPS, DEFAULT_CAPABLE_KEYWORDS, ModelChoice, ModelRouter, default_choice
+)
+from core.metrics import (
+    FAST_PATH_REQUESTS, FAST_PATH_SAVED_SECONDS, FAST_PATH_SECONDS, MODEL_CALLS_SAVED, MODEL_TIER_SECONDS,
+    MODEL_TIER_TOKENS, MODEL_TIER_TURNS, PREFETCH_CALLS, PREFETCH_WASTED_SECONDS, PROMPT_CACHE_EVENTS, STAGE_SECONDS, TOOL_CALLS, TOOL_DEADLINE_EXCEEDED,
+    TOOL_DECLARATIONS_SENT, TOOL_ERRORS, TOOL_GROUPS_SELECTED, TOOL_SECONDS
+)
+from core.prefetch import call_key, predict_calls
+from core.prompt_cache import PromptCache
+from core.responses import RESPONSE_TEMPLATES, render_reply
+from core.tool_router import DEFAULT_ALWAYS_GROUPS, DEFAULT_FALLBACK_GROUPS, ToolRouter
 from core.logger import get_logger
 from settings.config_loader import config
 
 logger = get_logger(__name__)
 
+# Tools whose result fully answers the user, so their reply can come from a
+# template instead of a second model round (responses.templated_tools)
+DEFAULT_TEMPLATED_TOOLS = ["turn_on_light", "set_scene", "add_task", "complete_task", "get_time"]
+
+# System instruction for AI personality and behavior. The tool sections are
+# assembled from the groups declared for a request (see system_instruction())
+SYSTEM_INSTRUCTION_HEAD = """
+You are AURA, a helpful AI assistant with a female butler personality.
+
+Personality Traits:
+- Highly respectful and formal, yet witty and engaging
+- Always address the user as 'Sir'
+- Provide accurate, concise, and helpful responses
+- Use your available tools when needed to assist the user
+"""
+
+# One line per tool for "Available Tools:", by tool group (see TOOL_GROUPS)
+TOOL_DESCRIPTIONS = {
+    "weather": [
+        "get_weather: Get current weather conditions for any location"
+    ],
+    "calendar": [
+        "get_calendar_events: Fetch upcoming events from user's Google Calendar"
+    ],
+    "search": [
+        "search_web: Search the web for information, news, facts, or any topic"
+    ],
+    "lights": [
+        "turn_on_light: Turn on smart lights with brightness, color, scene, or temperature control",
+        "turn_off_light: Turn off smart lights",
+        "get_light_state: Check current status of smart lights (on/off, brightness, color)",
+        "set_brightness: Adjust light brightness (0-255)",
+        "set_color: Change light color using RGB values",
+        "set_scene: Activate predefined light scenes (Party, Focus, Relax, Bedtime, etc.)",
+        "discover_lights: Find all smart lights in the network"
+    ],
+    "todo": [
+        "add_task: Add a new task to the to-do list with optional priority, due date, category",
+        "get_tasks: Get tasks from to-do list with optional filters (status, priority, category)",
+        "update_task: Update an existing task's details",
+        "delete_task: Remove a task from the to-do list",
+        "complete_task: Mark a task as completed",
+        "search_tasks: Search tasks by keywords in title or description"
+    ],
+    "time": [
+        "get_time: Get current time in Indonesia (WIB)",
+        "get_date: Get today's date in Indonesia (WIB)"
+    ]
+}
+
+# "Tool Usage Guidelines:" lines, by tool group
+TOOL_GUIDELINES = {
+    "calendar": [
+        "\"next event\" / \"closest schedule\" / \"what's next\" → use get_calendar_events(max_results=1)",
+        "\"today's schedule\" / \"what do I have today\" → use get_calendar_events(max_results=5)",
+        "\"this week\" / \"all events\" → use get_calendar_events(max_results=10)"
+    ],
+    "search": [
+        "\"search for\" / \"look up\" / \"find information about\" → use search_web(query=\"...\", max_results=3, fetch_content=True)",
+        "For quick facts: search_web(max_results=3, fetch_content=False)",
+        "For analysis/summary/conclusion: search_web(max_results=3-5, fetch_content=True)"
+    ],
+    "lights": [
+        "\"turn on/off the light(s)\" → use turn_on_light() or turn_off_light()",
+        "\"set brightness to 50%\" → use set_brightness(128) [0-255 scale]",
+        "\"make it red/blue/green\" → use set_color(r, g, b)",
+        "\"party mode\" / \"focus mode\" / \"relax\" → use set_scene(scene_id) [Party=4, Focus=15, Relax=16, Bedtime=10]",
+        "\"warm white\" → use turn_on_light(color_temp=2700)",
+        "\"cool white\" / \"daylight\" → use turn_on_light(color_temp=6500)"
+    ],
+    "todo": [
+        "\"add task\" / \"remember to\" / \"I need to\" → use add_task(title=\"...\", priority=\"medium\", due_date=\"...\")",
+        "\"show my tasks\" / \"what's on my list\" → use get_tasks() or get_tasks(status=\"pending\")",
+        "\"high priority tasks\" → use get_tasks(priority=\"high\")",
+        "\"mark as done\" / \"I finished\" → use complete_task(task_identifier=\"...\")"
+    ]
+}
+
+SYSTEM_INSTRUCTION_TAIL = """Response Guidelines:
+- Keep responses SHORT and conversational (1-2 sentences max)
+- For search results: ONE concise paragraph in natural speech (2-3 sentences max)
+- Speak like a butler reporting findings: "I've reviewed the latest AI news, Sir. The main developments include..."
+- Weave key points into flowing narrative, not bullet lists
+- Example: "I've analyzed the latest AI news, Sir. OpenAI is developing a new music generation tool, Amazon has deployed Blue Jay robotics for warehouse automation, and there are growing security concerns around AI browser agents."
+
+Special Cases:
+- When user asks for TUTORIALS/RESOURCES/COURSES: Give ONLY top recommendation + why
+- Example: "I'd recommend the Official Python Tutorial (docs.python.org), Sir. It's comprehensive and assumes basic programming knowledge. The HUD shows alternative options."
+- When user asks for PRODUCTS/TOOLS: Give ONLY 1-2 top picks + key reason
+- Example: "For AI coding, I'd suggest GitHub Copilot, Sir. It integrates directly with VS Code and understands context well."
+- DON'T explain what each resource covers - user can see full details in HUD
+- Focus on RECOMMENDATION, not comprehensive overview
+
+General:
+- Only use bullet points (•) when listing specific items user explicitly asks for (e.g., "list the features")
+- Focus on WHAT'S NEW and ACTIONABLE - skip redundant details
+- When showing SINGLE event: "Your next event is at 8:00 AM: Sesi Kerja, Sir."
+- When showing MULTIPLE events: use line breaks for readability
+- Format: "You have 5 events today, Sir:\n- at 8:00 AM: Event 1\n- at 12:00 PM: Event 2"
+- Use "\n" (newline) between each event for better readability
+- Group events by date and only mention the date ONCE
+- DO NOT repeat dates or full timestamps - the HUD shows complete details
+- After calling a tool, acknowledge briefly then LET THE HUD DO THE TALKING
+- For weather: "Clear skies in Jakarta, Sir. 28 degrees Celsius with light breeze." (HUD shows details)
+- For tasks: "I've added 'Buy groceries' to your list, Sir." or "You have 3 pending tasks." (HUD shows full list)
+- For numbers with units: Use full unit names for TTS clarity (e.g., "degrees Celsius" not "°C", "percent" not "%", "kilometers per hour" not "km/h")
+- If user speaks another language, understand but respond in English
+- Always maintain a professional yet friendly tone
+"""
+
+
+def system_instruction(groups: Optional[FrozenSet[str]] = None) -> str:
+    """
+    System instruction describing only the tools that are declared.
+    
+    Args:
+        groups: Tool groups declared for the request, or None for every tool
+    """
+    selected = [group for group in TOOL_GROUPS if groups is None or group in groups]
+    sections = [SYSTEM_INSTRUCTION_HEAD]
+    tools = [f"- {line}" for group in selected for line in TOOL_DESCRIPTIONS.get(group, [])]
+    if tools:
+        sections.append("Available Tools:\n" + "\n".join(tools) + "\n")
+    guidelines = [f"- {line}" for group in selected for line in TOOL_GUIDELINES.get(group, [])]
+    if guidelines:
+        sections.append("Tool Usage Guidelines:\n" + "\n".join(guidelines) + "\n")
+    sections.append(SYSTEM_INSTRUCTION_TAIL)
+    return "\n".join(sections)
+
+
+# Instruction for requests that declare every tool
+SYSTEM_INSTRUCTION = system_instruction()
+
 class Brain:
     """AI Brain using Google GenAI for content generation with function calling."""
     
@@ -18,301 +175,674 @@ class Brain:
         # Create Tool object from function declarations
         self.tools = types.Tool(function_declarations=TOOL_DECLARATIONS)
         
-        # Track HUD sections generated from tool calls
-        self.hud_sections = []
+        # Generation configs are built once per tool selection and reused;
+        # when the static prefix (system instruction + tools) is in Gemini's
+        # context cache, requests reference the cache instead of resending it
+        self._configs: Dict[Optional[FrozenSet[str]], types.GenerateContentConfig] = {}
+        # Cache name -> the full config to fall back to if the cache is rejected
+        self._uncached_configs: Dict[str, types.GenerateContentConfig] = {}
+        self._config = self._full_config(None)
+        
+        # Local classifier that prunes the declarations sent per query
+        self.tool_router = None
+        if config.get('tool_routing.enabled', True):
+            self.tool_router = ToolRouter(
+                always=config.get('tool_routing.always', DEFAULT_ALWAYS_GROUPS),
+                fallback=config.get('tool_routing.fallback', DEFAULT_FALLBACK_GROUPS)
+            )
+        
+        # Fast model for simple and tool-only turns, capable model for
+        # open-ended and search-synthesis turns (model.tiers / model.routing)
+        self.model_router = None
+        if config.get('model.routing.enabled', True):
+            self.model_router = ModelRouter(
+                tiers={
+                    "fast": config.get('model.tiers.fast', config.get('model.name')),
+                    "capable": config.get('model.tiers.capable', config.get('model.name'))
+                },
+                capable_groups=config.get('model.routing.capable_groups', DEFAULT_CAPABLE_GROUPS),
+                capable_keywords=config.get('model.routing.capable_keywords', DEFAULT_CAPABLE_KEYWORDS),
+                long_query_words=config.get('model.routing.long_query_words', 25)
+            )
+        
+        # Start predicted read-only tool calls alongside the first model call
+        self.prefetch = config.get('prefetch.enabled', True)
+        
+        # Share of the request's latency budget (core/deadline.py) held back
+        # from tools so the model still has time to answer without them
+        self.round2_reserve = config.get('deadline.round2_reserve', 3.0)
+        # Tools see a deadline this much earlier than the point they are
+        # cancelled, so one that honours it can still return partial results
+        self.tool_grace = config.get('deadline.tool_grace', 0.5)
+        
+        # Retries, backoff and hedging around every Gemini request
+        self.model_calls = ModelCaller(
+            max_attempts=config.get('model_calls.max_attempts', 3),
+            base_delay=config.get('model_calls.base_delay', 0.5),
+            max_delay=config.get('model_calls.max_delay', 8.0),
+            deadline=config.get('model_calls.deadline', 30.0),
+            attempt_timeout=config.get('model_calls.attempt_timeout', 20.0),
+            hedge=config.get('model_calls.hedge.enabled', False),
+            hedge_min_delay=config.get('model_calls.hedge.min_delay', 0.5),
+            hedge_min_samples=config.get('model_calls.hedge.min_samples', 20),
+            stage="llm"
+        )
+        self.prompt_cache = PromptCache(
+            enabled=config.get('prompt_cache.enabled', True),
+            ttl_seconds=config.get('prompt_cache.ttl_seconds', 3600),
+            retry_after=config.get('prompt_cache.retry_after', 600)
+        )
+        
+        # Per-request state (conversation, HUD sections, timings) lives in a
+        # GenerationContext, so this instance holds no mutable request data
+        
+        # Tools answered from core/responses.py templates, skipping round 2
+        self.templated_tools = {
+            name for name in config.get('responses.templated_tools', DEFAULT_TEMPLATED_TOOLS)
+            if name in RESPONSE_TEMPLATES
+        }
+        
+        # Local matcher for deterministic commands that don't need the model
+        self.intents = None
+        if config.get('intents.enabled', True):
+            self.intents = IntentMatcher(min_confidence=config.get('intents.min_confidence', 0.9))
         
         logger.info(f"Loaded {len(TOOL_DECLARATIONS)} tool declarations")
         logger.debug(f"Using model: {config.get('model.name')}")
     
-    def _get_weather_icon_url(self, icon_code: str) -> str:
+    def _process_tool_call_for_hud(self, tool_name: str, tool_args: dict, tool_result) -> list:
         """
-        Map OpenWeatherMap icon codes to custom weather icon URLs.
+        Build the HUD sections for one finished tool call with its registered
+        renderer (see HUD_RENDERERS in core/tools).
         
         Args:
-            icon_code: OpenWeatherMap icon code (e.g., '01d', '10n')
+            tool_name: Name of the tool that was called
+            tool_args: Arguments passed to the tool
+            tool_result: Result returned by the tool (ToolResult, str or dict)
             
         Returns:
-            URL path to custom weather icon
-        """
-        # Icon code mapping to custom icon filenames
-        icon_mapping = {
-            '01d': 'clear-day.png',      # Clear sky (day)
-            '01n': 'clear-night.png',    # Clear sky (night)
-            '02d': 'partly-cloudy.png',  # Few clouds (day)
-            '02n': 'partly-cloudy.png',  # Few clouds (night)
-            '03d': 'cloudy.png',         # Scattered clouds
-            '03n': 'cloudy.png',         # Scattered clouds
-            '04d': 'overcast.png',       # Broken clouds
-            '04n': 'overcast.png',       # Broken clouds
-            '09d': 'rain.png',           # Shower rain
-            '09n': 'rain.png',           # Shower rain
-            '10d': 'rain.png',           # Rain (day)
-            '10n': 'rain.png',           # Rain (night)
-            '11d': 'thunderstorm.png',   # Thunderstorm
-            '11n': 'thunderstorm.png',   # Thunderstorm
-            '13d': 'snow.png',           # Snow
-            '13n': 'snow.png',           # Snow
-            '50d': 'fog.png',            # Mist/fog
-            '50n': 'fog.png',            # Mist/fog
-        }
+            list: HUD sections for this tool call (empty if none apply)
+        """
+        renderer = HUD_RENDERERS.get(tool_name)
+        if renderer is None:
+            return []
+        logger.info(f"Processing HUD data for tool: {tool_name}")
+        try:
+            return renderer(tool_args, tool_result)
+        except Exception as e:
+            logger.error(f"Error processing {tool_name} HUD data: {e}")
+            return []
+    
+    async def _build_hud(self, ctx: GenerationContext, records: list) -> list:
+        """
+        HUD sections for finished tool calls, in order, built in a worker thread.
         
-        # Get the custom icon filename, or use default
-        icon_filename = icon_mapping.get(icon_code, 'default.png')
+        Callers start this as a task next to the second model call, so HUD
+        assembly overlaps the model's reply instead of delaying it.
         
-        # Return the path to the custom icon
-        return f"images/weather/{icon_filename}"
+        Args:
+            ctx: Context of the current generation
+            records: ToolCallRecords from _run_tool_call() (None for unknown tools)
+        """
+        records = [record for record in records if record is not None and record.error is None]
+        if not records:
+            return []
+        with ctx.timed("hud_build"):
+            return await asyncio.to_thread(self._hud_sections, records)
+    
+    def _hud_sections(self, records: list) -> list:
+        sections = []
+        for record in records:
+            sections.extend(self._process_tool_call_for_hud(record.name, record.args, record.result))
+        return sections
     
-    def _process_tool_call_for_hud(self, tool_name: str, tool_args: dict, tool_result: str):
+    @staticmethod
+    async def _publish_hud(ctx: GenerationContext, renders: list, wait: bool = False):
         """
-        Process a tool call and generate HUD sections based on the tool used.
+        Yield the sections of finished HUD renders in call order, adding them to ctx.
         
-        Args:
-            tool_name: Name of the tool that was called
-            tool_args: Arguments passed to the tool
-            tool_result: Result returned by the tool
+        Stops at the first render still running unless `wait` is set.
         """
-        logger.info(f"Processing HUD data for tool: {tool_name}")
+        while renders and (wait or renders[0].done()):
+            for section in await renders.pop(0):
+                ctx.hud_sections.append(section)
+                yield section
+    
+    async def _execute_tool(self, func_name: str, func_args: dict):
+        """
+        Run a tool without blocking the event loop, within the tools stage limit.
         
-        # Weather tool - create weather HUD sections
-        if tool_name == "get_weather":
-            location = tool_args.get("location", "Unknown")
-            try:
-                # Import here to avoid circular dependency
-                from core.tools.weather_tool import get_weather_data
-                
-                weather_data = get_weather_data(location)
-                
-                if "error" not in weather_data:
-                    # Weather icon FIRST (will be displayed at top) - using custom icons
-                    icon_url = self._get_weather_icon_url(weather_data['icon'])
-                    self.hud_sections.append({
-                        "title": "Current Conditions",
-                        "type": "image",
-                        "data": {
-                            "url": icon_url,
-                            "alt": weather_data['description'],
-                            "caption": weather_data['description']
-                        }
-                    })
-                    
-                    # Main weather data
-                    self.hud_sections.append({
-                        "title": f"Weather - {weather_data['location']}, {weather_data['country']}",
-                        "type": "keyvalue",
-                        "data": {
-                            "items": [
-                                {"key": "Condition", "value": weather_data['description']},
-                                {"key": "Temperature", "value": f"{weather_data['temperature']}°C"},
-                                {"key": "Feels Like", "value": f"{weather_data['feels_like']}°C"},
-                                {"key": "Humidity", "value": f"{weather_data['humidity']}%"},
-                                {"key": "Wind Speed", "value": f"{weather_data['wind_speed']} m/s"}
-                            ]
-                        }
-                    })
-                    
-                    # Sun times
-                    self.hud_sections.append({
-                        "title": "Sun Times",
-                        "type": "keyvalue",
-                        "data": {
-                            "items": [
-                                {"key": "Sunrise", "value": weather_data['sunrise']},
-                                {"key": "Sunset", "value": weather_data['sunset']},
-                                {"key": "Pressure", "value": f"{weather_data['pressure']} hPa"},
-                                {"key": "Cloudiness", "value": f"{weather_data['clouds']}%"}
-                            ]
-                        }
-                    })
-            except Exception as e:
-                logger.error(f"Error processing weather HUD data: {e}")
+        Coroutine tools (smart lights) are awaited directly; blocking tools
+        (HTTP APIs, SQLite) run in the default thread pool executor. The
+        tool deadline (core/deadline.py) is published for the call, ahead of
+        the point _run_tool_call() cancels it.
         
-        # Calendar events tool - create calendar HUD section
-        elif tool_name == "get_calendar_events":
-            try:
-                # Import here to avoid circular dependency
-                from core.tools.calendar_tool import get_calendar_events_data
-                
-                calendar_data = get_calendar_events_data()
-                
-                if "error" not in calendar_data:
-                    # Create table data for calendar events
-                    table_rows = []
-                    for index, event in enumerate(calendar_data['events']):
-                        row_data = {
-                            "Date": event['date'],
-                            "Time": event['time'],
-                            "Event": event['event']
-                        }
-                        # Mark the first event (next/closest) as highlighted
-                        if index == 0:
-                            row_data["_highlight"] = True
-                        table_rows.append(row_data)
-                    
-                    self.hud_sections.append({
-                        "title": "Upcoming Events",
-                        "type": "table",
-                        "data": {
-                            "headers": ["Date", "Time", "Event"],
-                            "rows": table_rows
-                        }
-                    })
-            except Exception as e:
-                logger.error(f"Error processing calendar HUD data: {e}")
-                # Fallback to text display
-                if "No upcoming events" not in tool_result:
-                    self.hud_sections.append({
-                        "title": "Upcoming Events",
-                        "type": "text",
-                        "data": {
-                            "text": tool_result
-                        }
-                    })
+        A worker thread can't be stopped, so when a blocking call is
+        cancelled its tools slot stays held until the thread returns; the
+        stage limit then counts the threads actually running.
         
-        # Search tool - create search results HUD section
-        elif tool_name == "search_web":
+        Args:
+            func_name: Name of the tool in TOOL_FUNCTIONS
+            func_args: Keyword arguments from the model's function call
+            
+        Returns:
+            The tool's raw result (str or dict)
+        """
+        with deadline.tool_deadline(self.round2_reserve + self.tool_grace):
+            if func_name in ASYNC_TOOL_FUNCTIONS:
+                async with get_limiter("tools").slot():
+                    return await ASYNC_TOOL_FUNCTIONS[func_name](**func_args)
+            
+            started = asyncio.Event()
+            task = asyncio.create_task(self._run_tool_thread(func_name, func_args, started))
             try:
-                # Import here to avoid circular dependency
-                from core.tools.search_tool import get_search_results_data
-                
-                query = tool_args.get("query", "")
-                max_results = tool_args.get("max_results", 5)
-                search_data = get_search_results_data(query, max_results)
-                
-                if "error" not in search_data:
-                    # Create list data for search results
-                    search_items = []
-                    for result in search_data['results']:
-                        search_items.append({
-                            "label": result['title'],
-                            "value": result['snippet'],
-                            "url": result['url']
-                        })
-                    
-                    self.hud_sections.append({
-                        "title": f"Search: {query}",
-                        "type": "list",
-                        "data": {
-                            "items": search_items
-                        }
-                    })
-            except Exception as e:
-                logger.error(f"Error processing search HUD data: {e}")
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if started.is_set():
+                    # Outcome of an abandoned call is only logged
+                    task.add_done_callback(self._log_abandoned_tool)
+                else:
+                    task.cancel()
+                raise
+    
+    @staticmethod
+    async def _run_tool_thread(func_name: str, func_args: dict, started: asyncio.Event):
+        async with get_limiter("tools").slot():
+            started.set()
+            return await asyncio.to_thread(TOOL_FUNCTIONS[func_name], **func_args)
+    
+    @staticmethod
+    def _log_abandoned_tool(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Cancelled tool call failed after it was abandoned: {task.exception()}")
+    
+    async def _call_model(self, conversation: list, gen_config: types.GenerateContentConfig,
+                          choice: Optional[ModelChoice] = None):
+        """
+        Send one generate_content request, subject to the LLM stage limit.
+        
+        Transient errors are retried (and slow requests hedged) by
+        self.model_calls, which takes an LLM slot per upstream request. If
+        the request referenced a prompt cache the API no longer has (404:
+        deleted or expired early), the cache is dropped and the request is
+        retried once with the full prompt; other errors are raised unchanged.
+        
+        Args:
+            conversation: Contents to send
+            gen_config: Config from _generation_config() for the same model
+            choice: Model tier for this turn (the configured model if omitted)
+        """
+        choice = choice or default_choice(config.get('model.name'))
+        start = time.perf_counter()
+        try:
+            response = await self.model_calls.call(lambda: self.client.aio.models.generate_content(
+                model=choice.model,
+                contents=conversation,
+                config=gen_config
+            ))
+        except genai_errors.ClientError as e:
+            # Only a missing cache (404) is the cache's fault; a 400, 403 or
+            # quota error would recur without it and the cache is still good
+            if not gen_config.cached_content or e.code != 404:
+                raise
+            self._drop_prompt_cache(gen_config, e)
+            fallback_config = self._uncached_configs.get(gen_config.cached_content, self._config)
+            response = await self.model_calls.call(lambda: self.client.aio.models.generate_content(
+                model=choice.model,
+                contents=conversation,
+                config=fallback_config
+            ))
+        MODEL_TIER_SECONDS.observe(time.perf_counter() - start, tier=choice.tier)
+        self._record_usage(choice, response.usage_metadata)
+        return response
+    
+    async def _stream_parts(self, conversation: list, gen_config: types.GenerateContentConfig,
+                            choice: Optional[ModelChoice] = None):
+        """
+        Stream one model turn, yielding each Part as soon as its chunk arrives.
         
-        # To-Do App tools - create task list HUD section
-        elif tool_name in ["get_tasks", "search_tasks", "add_task", "update_task", "complete_task"]:
+        The LLM stage slot is held until the model has finished sending,
+        not until the caller has consumed every part. Thought
+        parts are passed through too (callers decide what to show), so the
+        turn can be replayed into the conversation unchanged.
+        """
+        choice = choice or default_choice(config.get('model.name'))
+        start = time.perf_counter()
+        stream = await self._open_stream(conversation, gen_config, choice.model)
+        usage = None
+        async for chunk in stream:
+            usage = chunk.usage_metadata or usage
+            if not chunk.candidates or not chunk.candidates[0].content:
+                continue
+            for part in chunk.candidates[0].content.parts or []:
+                yield part
+        MODEL_TIER_SECONDS.observe(time.perf_counter() - start, tier=choice.tier)
+        self._record_usage(choice, usage)
+    
+    def _record_usage(self, choice: ModelChoice, usage):
+        """Count a response's tokens for the prompt cache and its model tier."""
+        self.prompt_cache.record_usage(usage)
+        if usage is None:
+            return
+        MODEL_TIER_TOKENS.inc(usage.prompt_token_count or 0, tier=choice.tier, kind="prompt")
+        MODEL_TIER_TOKENS.inc(usage.candidates_token_count or 0, tier=choice.tier, kind="output")
+    
+    async def _open_stream(self, conversation: list, gen_config: types.GenerateContentConfig, model: str):
+        """
+        Start a generate_content_stream request, with the same cache fallback as _call_model.
+        
+        Opening the stream is retried on transient errors; once chunks have
+        been yielded a failure is not retried (and streams are never hedged).
+        """
+        try:
+            return await self.model_calls.stream(lambda: self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=conversation,
+                config=gen_config
+            ))
+        except genai_errors.ClientError as e:
+            if not gen_config.cached_content or e.code != 404:
+                raise
+            self._drop_prompt_cache(gen_config, e)
+            fallback_config = self._uncached_configs.get(gen_config.cached_content, self._config)
+            return await self.model_calls.stream(lambda: self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=conversation,
+                config=fallback_config
+            ))
+    
+    def _drop_prompt_cache(self, gen_config: types.GenerateContentConfig, error: Exception):
+        logger.warning(f"Prompt cache {gen_config.cached_content} rejected, retrying with full prompt: {error}")
+        self.prompt_cache.invalidate(gen_config.cached_content)
+        PROMPT_CACHE_EVENTS.inc(event="fallback")
+    
+    async def warm_up(self):
+        """
+        Open the connection to the Gemini API ahead of the first request.
+        
+        Fetching the model's metadata is a cheap call that pays for DNS,
+        TLS and the HTTP connection pool setup, which later
+        generate_content calls then reuse.
+        """
+        models = self.model_router.models if self.model_router is not None else {config.get('model.name')}
+        for model in models:
+            await self.client.aio.models.get(model=model)
+        # Upload the static prompt prefix so the first request can use it
+        # (with routing, the tool selection and model for small talk)
+        groups = self.tool_router.select("") if self.tool_router is not None else None
+        await self._generation_config(groups, self._choose_model("").model)
+    
+    def _full_config(self, groups: Optional[FrozenSet[str]]) -> types.GenerateContentConfig:
+        """
+        Return the full generation config declaring the given tool groups,
+        with a system instruction that describes only those tools.
+        
+        Args:
+            groups: Tool groups to declare, or None for every tool
+        """
+        if groups not in self._configs:
+            tools = self.tools
+            if groups is not None:
+                tools = types.Tool(function_declarations=ToolRouter.declarations(groups))
+            self._configs[groups] = types.GenerateContentConfig(
+                temperature=config.get('model.temperature', 0.7),
+                max_output_tokens=config.get('model.max_tokens', 2048),
+                system_instruction=system_instruction(groups),
+                tools=[tools]
+            )
+        return self._configs[groups]
+    
+    @staticmethod
+    def _previous_query(ctx: GenerationContext) -> str:
+        """The last user text in ctx.conversation (session history, before this query is added)."""
+        for content in reversed(ctx.conversation):
+            # The query is the last part; a memory summary may precede it
+            if content.role == "user" and content.parts and content.parts[-1].text:
+                return content.parts[-1].text
+        return ""
+    
+    def _select_tool_groups(self, ctx: GenerationContext) -> Optional[FrozenSet[str]]:
+        """
+        Pick the tool groups to declare for this request, or None for all.
+        
+        The previous user turn is classified along with the query.
+        """
+        if self.tool_router is None:
+            TOOL_DECLARATIONS_SENT.observe(len(TOOL_DECLARATIONS))
+            return None
+        groups = self.tool_router.select(ctx.query, self._previous_query(ctx))
+        for group in groups:
+            TOOL_GROUPS_SELECTED.inc(group=group)
+        TOOL_DECLARATIONS_SENT.observe(len(ToolRouter.declarations(groups)))
+        logger.debug(f"Declaring tool groups: {sorted(groups)}")
+        return groups
+    
+    def _choose_model(self, query: str, previous_query: str = "") -> ModelChoice:
+        """Pick the model tier for a turn and count the decision."""
+        if self.model_router is None:
+            choice = default_choice(config.get('model.name'))
+        else:
+            choice = self.model_router.choose(query, previous_query)
+        MODEL_TIER_TURNS.inc(tier=choice.tier, reason=choice.reason)
+        logger.debug(f"Routing turn to {choice.tier} model {choice.model} ({choice.reason})")
+        return choice
+    
+    async def _generation_config(self, groups: Optional[FrozenSet[str]] = None,
+                                 model: Optional[str] = None) -> types.GenerateContentConfig:
+        """
+        Return the generation config for one request.
+        
+        References the cached system instruction and tools when a prompt
+        cache is available (one cache per model and tool selection),
+        otherwise the full config.
+        
+        Args:
+            groups: Tool groups to declare, or None for every tool
+            model: Model the request goes to (the configured model if omitted)
+        """
+        full_config = self._full_config(groups)
+        cache_name = await self.prompt_cache.get(
+            self.client, model or config.get('model.name'), full_config.system_instruction, full_config.tools[0]
+        )
+        if cache_name is None:
+            return full_config
+        self._uncached_configs[cache_name] = full_config
+        return types.GenerateContentConfig(
+            temperature=full_config.temperature,
+            max_output_tokens=full_config.max_output_tokens,
+            cached_content=cache_name
+        )
+    
+    def _extract_function_calls(self, response) -> list:
+        """Return the function calls requested in a model response, if any."""
+        function_calls = []
+        if hasattr(response.candidates[0].content, 'parts'):
+            for part in response.candidates[0].content.parts:
+                if hasattr(part, 'function_call') and part.function_call:
+                    function_calls.append(part.function_call)
+        return function_calls
+    
+    async def _run_tool_call(self, ctx: GenerationContext, fc, prefetched: Optional[asyncio.Task] = None) -> tuple:
+        """
+        Execute one function call requested by the model.
+        
+        Records the call on the context; its HUD sections are built later
+        from the record (see _build_hud()).
+        
+        Args:
+            ctx: Context of the current generation
+            fc: FunctionCall from the model response
+            prefetched: Speculative execution of this exact call, whose
+                result is used instead of running the tool again
+            
+        Returns:
+            tuple: (function response Part, ToolCallRecord), both None for an unknown tool
+        """
+        func_name = fc.name
+        func_args = dict(fc.args) if fc.args else {}
+        
+        logger.info(f"Executing function: {func_name}({func_args})")
+        
+        if func_name not in TOOL_FUNCTIONS:
+            logger.warning(f"Function {func_name} not found in TOOL_FUNCTIONS")
+            return None, None
+        
+        record = ToolCallRecord(name=func_name, args=func_args)
+        ctx.tool_results.append(record)
+        TOOL_CALLS.inc(tool=func_name)
+        start = time.perf_counter()
+        # Cancels the call if it would eat into the time reserved for the reply
+        budget = asyncio.timeout(self._tool_budget())
+        try:
             try:
-                # Import here to avoid circular dependency
-                from core.tools import get_tasks_data
-                
-                # Get filter parameters from tool args
-                status = tool_args.get("status")
-                priority = tool_args.get("priority")
-                category = tool_args.get("category")
-                limit = tool_args.get("limit", 10)
-                
-                tasks_data = get_tasks_data(status, priority, category, limit)
-                
-                if tasks_data['count'] > 0:
-                    # Create table data for tasks
-                    table_rows = []
-                    for task in tasks_data['tasks']:
-                        # Format priority with emoji
-                        priority_display = {
-                            'high': '🔴 HIGH',
-                            'medium': '🟡 MEDIUM',
-                            'low': '🟢 LOW'
-                        }.get(task['priority'], task['priority'].upper())
-                        
-                        # Format status with emoji
-                        status_display = {
-                            'pending': '⏳ Pending',
-                            'in_progress': '🔄 In Progress',
-                            'completed': '✅ Completed'
-                        }.get(task['status'], task['status'])
-                        
-                        # Format due date
-                        due_display = "No deadline"
-                        if task['due_date']:
-                            from datetime import datetime
-                            due_date = datetime.fromisoformat(task['due_date'])
-                            now = datetime.now()
-                            diff = (due_date - now).days
-                            
-                            if diff < 0:
-                                due_display = f"⚠️ {abs(diff)} day{'s' if abs(diff) > 1 else ''} overdue"
-                            elif diff == 0:
-                                due_display = "📅 Today"
-                            elif diff == 1:
-                                due_display = "📅 Tomorrow"
-                            else:
-                                due_display = due_date.strftime("%b %d, %Y")
-                        
-                        row_data = {
-                            "Priority": priority_display,
-                            "Task": task['title'],
-                            "Due Date": due_display,
-                            "Status": status_display
-                        }
-                        
-                        # Highlight high priority pending tasks
-                        if task['priority'] == 'high' and task['status'] == 'pending':
-                            row_data["_highlight"] = True
-                        
-                        table_rows.append(row_data)
-                    
-                    # Add statistics as key-value section
-                    stats = tasks_data['statistics']
-                    stats_items = []
-                    
-                    if 'pending' in stats:
-                        stats_items.append({"key": "⏳ Pending", "value": str(stats['pending'])})
-                    if 'in_progress' in stats:
-                        stats_items.append({"key": "🔄 In Progress", "value": str(stats['in_progress'])})
-                    if 'completed' in stats:
-                        stats_items.append({"key": "✅ Completed", "value": str(stats['completed'])})
-                    if 'overdue' in stats and stats['overdue'] > 0:
-                        stats_items.append({"key": "⚠️ Overdue", "value": str(stats['overdue'])})
-                    
-                    if stats_items:
-                        self.hud_sections.append({
-                            "title": "Task Statistics",
-                            "type": "keyvalue",
-                            "data": {
-                                "items": stats_items
-                            }
-                        })
-                    
-                    # Add task table
-                    self.hud_sections.append({
-                        "title": "To-Do List",
-                        "type": "table",
-                        "data": {
-                            "headers": ["Priority", "Task", "Due Date", "Status"],
-                            "rows": table_rows
-                        }
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error processing to-do HUD data: {e}")
+                async with budget:
+                    if prefetched is not None:
+                        result = await self._prefetched_result(prefetched, func_name, func_args)
+                    else:
+                        result = await self._execute_tool(func_name, func_args)
+            finally:
+                elapsed = time.perf_counter() - start
+                record.duration_ms = elapsed * 1000
+                ctx.add_timing(f"tool_{func_name}", record.duration_ms)
+                TOOL_SECONDS.observe(elapsed, tool=func_name)
+            record.result = result
+            if isinstance(result, dict) and result.get("success") is False:
+                TOOL_ERRORS.inc(tool=func_name)
+            if isinstance(result, ToolResult) and result.partial:
+                TOOL_DEADLINE_EXCEEDED.inc(tool=func_name, outcome="partial")
+            # Convert result to string for logging (handles both dict and str results)
+            result_str = str(result) if not isinstance(result, str) else result
+            logger.debug(f"Function result: {result_str[:100]}...")
+            
+            # Create function response part; the model only needs the text
+            if isinstance(result, ToolResult):
+                result = result.text
+            return types.Part.from_function_response(
+                name=func_name,
+                response={"result": result}
+            ), record
+        except OverloadedError:
+            raise
+        except TimeoutError as e:
+            if not budget.expired():
+                # The tool's own timeout (e.g. its HTTP client's), not our budget
+                return self._tool_error(func_name, record, e)
+            logger.warning(f"{func_name} cancelled: request latency budget exhausted")
+            record.error = "Timed out"
+            TOOL_DEADLINE_EXCEEDED.inc(tool=func_name, outcome="cancelled")
+            # Tell the model what is missing so it can say so instead of guessing
+            return types.Part.from_function_response(
+                name=func_name,
+                response={"error": f"{func_name} did not finish within the response time budget, "
+                                   "so this data is missing. Tell the user it is unavailable right now."}
+            ), record
+        except Exception as e:
+            return self._tool_error(func_name, record, e)
+    
+    def _tool_error(self, func_name: str, record: ToolCallRecord, error: Exception) -> tuple:
+        """Record a failed tool call and build the error response for the model."""
+        message = str(error) or type(error).__name__
+        logger.error(f"Error executing {func_name}: {message}")
+        record.error = message
+        TOOL_ERRORS.inc(tool=func_name)
+        return types.Part.from_function_response(
+            name=func_name,
+            response={"error": message}
+        ), record
+    
+    def _tool_budget(self) -> Optional[float]:
+        """Seconds a tool call may still take, or None without a request deadline."""
+        left = deadline.remaining()
+        if left is None:
+            return None
+        return max(0.0, left - self.round2_reserve)
+    
+    async def _run_tool_call_after(self, ctx: GenerationContext, fc, previous: Optional[asyncio.Task],
+                                   prefetched: Optional[asyncio.Task] = None) -> tuple:
+        """Run a tool call once the previous call on the same resource has finished."""
+        if previous is not None:
+            # Wait for it whatever its outcome; its errors are reported by its own task
+            await asyncio.wait({previous})
+        return await self._run_tool_call(ctx, fc, prefetched)
+    
+    def _start_prefetch(self, query: str) -> dict:
+        """
+        Start the tool calls the model is predicted to request (see core/prefetch.py).
+        
+        Returns:
+            dict: call_key() -> (task, start time) for each speculative call
+        """
+        if not self.prefetch:
+            return {}
+        speculative = {}
+        for fc in predict_calls(query):
+            key = call_key(fc.name, fc.args)
+            if key is None:
+                continue
+            logger.info(f"Prefetching {fc.name}({fc.args})")
+            PREFETCH_CALLS.inc(tool=fc.name, outcome="started")
+            task = asyncio.create_task(self._prefetch_tool(fc.name, dict(fc.args)))
+            speculative[key] = (task, time.perf_counter())
+        return speculative
+    
+    async def _prefetch_tool(self, func_name: str, func_args: dict):
+        async with asyncio.timeout(self._tool_budget()):
+            return await self._execute_tool(func_name, func_args)
+    
+    async def _prefetched_result(self, prefetched: asyncio.Task, func_name: str, func_args: dict):
+        """Result of a speculative call, or of a fresh call if the speculative one failed."""
+        try:
+            result = await prefetched
+        except Exception as e:
+            logger.warning(f"Prefetched {func_name} failed, running it again: {e}")
+            PREFETCH_CALLS.inc(tool=func_name, outcome="failed")
+            return await self._execute_tool(func_name, func_args)
+        PREFETCH_CALLS.inc(tool=func_name, outcome="hit")
+        return result
+    
+    @staticmethod
+    def _discard_prefetch(speculative: dict):
+        """Cancel speculative calls the model didn't ask for, counting the time they wasted."""
+        for key, (task, start) in speculative.items():
+            tool = key[0]
+            task.cancel()
+            PREFETCH_CALLS.inc(tool=tool, outcome="wasted")
+            PREFETCH_WASTED_SECONDS.inc(time.perf_counter() - start, tool=tool)
+        speculative.clear()
+    
+    def _start_tool_calls(self, ctx: GenerationContext, function_calls: list,
+                          speculative: Optional[dict] = None) -> list:
+        """
+        Start all function calls of one model turn concurrently.
+        
+        Calls on the same resource (see TOOL_RESOURCES) are chained so they
+        still run in the requested order; independent calls overlap, so the
+        turn takes as long as its slowest tool rather than the sum of all.
         
-        # Time/Date tools - create time info section
-        elif tool_name in ["get_time", "get_date"]:
-            # Import here to avoid circular dependency
-            from core.tools.time_tool import get_time, get_date
+        Args:
+            ctx: Context of the current generation
+            function_calls: FunctionCalls from the model response
+            speculative: Prefetched calls from _start_prefetch(); matching
+                calls are taken out of it and reused
             
-            self.hud_sections.append({
-                "title": "Current Date & Time",
-                "type": "keyvalue",
-                "data": {
-                    "items": [
-                        {"key": "Date", "value": get_date()},
-                        {"key": "Time", "value": get_time()},
-                        {"key": "Timezone", "value": "WIB (UTC+7)"}
-                    ]
-                }
-            })
+        Returns:
+            list: One task per function call, in the same order, each
+                  resolving to _run_tool_call's (Part, sections) tuple
+        """
+        last_on_resource = {}
+        return [self._start_tool_call(ctx, fc, last_on_resource, speculative) for fc in function_calls]
     
-    def generate(self, contents: str) -> dict:
+    def _start_tool_call(self, ctx: GenerationContext, fc, last_on_resource: dict,
+                         speculative: Optional[dict] = None) -> asyncio.Task:
+        """
+        Start one function call, chained after the previous call on its resource.
+        
+        Args:
+            ctx: Context of the current generation
+            fc: FunctionCall from the model response
+            last_on_resource: Resource -> latest task on it, shared by all
+                calls of the same turn (updated in place)
+            speculative: Prefetched calls; a match is taken out and reused
+        """
+        prefetched = None
+        if speculative:
+            entry = speculative.pop(call_key(fc.name, fc.args), None)
+            prefetched = entry[0] if entry else None
+        resource = TOOL_RESOURCES.get(fc.name)
+        task = asyncio.create_task(
+            self._run_tool_call_after(ctx, fc, last_on_resource.get(resource), prefetched)
+        )
+        if resource is not None:
+            last_on_resource[resource] = task
+        return task
+    
+    @staticmethod
+    def _cancel_tool_calls(tasks: list):
+        """Cancel tool calls still running (e.g. after another call was rejected)."""
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    
+    def _match_intent(self, query: str) -> Optional[IntentMatch]:
+        """Return a high-confidence local intent for the query, or None to use the model."""
+        if self.intents is None:
+            return None
+        best = self.intents.score(query)
+        if best is None:
+            FAST_PATH_REQUESTS.inc(outcome="miss")
+            return None
+        if best.confidence < self.intents.min_confidence:
+            logger.debug(f"Intent '{best.intent}' below threshold ({best.confidence:.2f}), using model")
+            FAST_PATH_REQUESTS.inc(outcome="low_confidence")
+            return None
+        FAST_PATH_REQUESTS.inc(outcome="hit")
+        return best
+    
+    @staticmethod
+    def _mean_model_seconds() -> float:
+        """Mean latency of the two model round trips a tool-using query normally takes."""
+        total = 0.0
+        for stage in ("llm_round1", "llm_round2"):
+            seconds, count = STAGE_SECONDS.stats(stage=stage)
+            if count:
+                total += seconds / count
+        return total
+    
+    async def _run_fast_path(self, ctx: GenerationContext, match: IntentMatch) -> list:
+        """
+        Answer a matched intent without the model.
+        
+        Calls the intent's tool directly, then sets ctx.response from its
+        reply template.
+        
+        Args:
+            ctx: Context of the current generation
+            match: Intent returned by _match_intent()
+            
+        Returns:
+            list: HUD sections built for the tool call (not yet added to ctx)
+        """
+        logger.info(f"Fast path: {match.intent} -> {match.tool}({match.args})")
+        start = time.perf_counter()
+        with ctx.timed("fast_path"):
+            _, record = await self._run_tool_call(
+                ctx, types.FunctionCall(name=match.tool, args=match.args)
+            )
+            ctx.response = render_reply(match.tool, match.args, record.result, record.error)
+            sections = await self._build_hud(ctx, [record])
+        
+        elapsed = time.perf_counter() - start
+        MODEL_CALLS_SAVED.inc(2, reason="fast_path")
+        FAST_PATH_SECONDS.observe(elapsed, intent=match.intent)
+        FAST_PATH_SAVED_SECONDS.inc(max(0.0, self._mean_model_seconds() - elapsed))
+        return sections
+    
+    def _templated_reply(self, ctx: GenerationContext, call_count: int) -> Optional[str]:
+        """
+        Reply from templates when every tool call of the turn has one enabled.
+        
+        Args:
+            ctx: Context of the current generation (its tool_results are this turn's calls)
+            call_count: Number of function calls the model requested
+            
+        Returns:
+            The combined reply, or None if the second model round is needed
+        """
+        records = ctx.tool_results
+        # Unknown tools leave no record, and those need the model to explain
+        if not records or len(records) != call_count:
+            return None
+        if any(record.name not in self.templated_tools for record in records):
+            return None
+        
+        reply = " ".join(
+            render_reply(record.name, record.args, record.result, record.error) for record in records
+        )
+        MODEL_CALLS_SAVED.inc(reason="template")
+        logger.info(f"Answered from templates: {[record.name for record in records]}")
+        return reply
+    
+    async def generate(self, contents: str, ctx: Optional[GenerationContext] = None) -> dict:
         """
         Generate content using the Gemini model with function calling support.
         
@@ -322,8 +852,13 @@ class Brain:
         3. If function called, execute it and send result back
         4. Model generates final user-friendly response
         
+        All per-request state is kept in a GenerationContext, so concurrent
+        calls on the same Brain never share conversation or HUD data.
+        
         Args:
             contents: User's query/prompt as a string
+            ctx: Optional context to record into (a fresh one is created if omitted),
+                 useful when the caller wants timings or tool results afterwards
             
         Returns:
             dict: {
@@ -331,121 +866,47 @@ class Brain:
                 "hud_sections": list  # HUD sections to display (if any tools were called)
             }
         """
-        # Reset HUD sections for new generation
-        self.hud_sections = []
+        if ctx is None:
+            ctx = GenerationContext(query=contents)
         
         logger.debug(f"Generating content for query: {contents[:50]}...")
         
-        # System instruction for AI personality and behavior
-        system_instruction = """
-You are AURA, a helpful AI assistant with a female butler personality.
-
-Personality Traits:
-- Highly respectful and formal, yet witty and engaging
-- Always address the user as 'Sir'
-- Provide accurate, concise, and helpful responses
-- Use your available tools when needed to assist the user
-
-Available Tools:
-- get_calendar_events: Fetch upcoming events from user's Google Calendar
-- get_weather: Get current weather conditions for any location
-- get_time: Get current time in Indonesia (WIB)
-- get_date: Get today's date in Indonesia (WIB)
-- search_web: Search the web for information, news, facts, or any topic
-- turn_on_light: Turn on smart lights with brightness, color, scene, or temperature control
-- turn_off_light: Turn off smart lights
-- get_light_state: Check current status of smart lights (on/off, brightness, color)
-- set_brightness: Adjust light brightness (0-255)
-- set_color: Change light color using RGB values
-- set_scene: Activate predefined light scenes (Party, Focus, Relax, Bedtime, etc.)
-- discover_lights: Find all smart lights in the network
-- add_task: Add a new task to the to-do list with optional priority, due date, category
-- get_tasks: Get tasks from to-do list with optional filters (status, priority, category)
-- update_task: Update an existing task's details
-- delete_task: Remove a task from the to-do list
-- complete_task: Mark a task as completed
-- search_tasks: Search tasks by keywords in title or description
-
-Tool Usage Guidelines:
-- "next event" / "closest schedule" / "what's next" → use get_calendar_events(max_results=1)
-- "today's schedule" / "what do I have today" → use get_calendar_events(max_results=5)
-- "this week" / "all events" → use get_calendar_events(max_results=10)
-- "search for" / "look up" / "find information about" → use search_web(query="...", max_results=3, fetch_content=True)
-- For quick facts: search_web(max_results=3, fetch_content=False)
-- For analysis/summary/conclusion: search_web(max_results=3-5, fetch_content=True)
-- "turn on/off the light(s)" → use turn_on_light() or turn_off_light()
-- "set brightness to 50%" → use set_brightness(128) [0-255 scale]
-- "make it red/blue/green" → use set_color(r, g, b)
-- "party mode" / "focus mode" / "relax" → use set_scene(scene_id) [Party=4, Focus=15, Relax=16, Bedtime=10]
-- "warm white" → use turn_on_light(color_temp=2700)
-- "cool white" / "daylight" → use turn_on_light(color_temp=6500)
-- "add task" / "remember to" / "I need to" → use add_task(title="...", priority="medium", due_date="...")
-- "show my tasks" / "what's on my list" → use get_tasks() or get_tasks(status="pending")
-- "high priority tasks" → use get_tasks(priority="high")
-- "mark as done" / "I finished" → use complete_task(task_identifier="...")
-
-Response Guidelines:
-- Keep responses SHORT and conversational (1-2 sentences max)
-- For search results: ONE concise paragraph in natural speech (2-3 sentences max)
-- Speak like a butler reporting findings: "I've reviewed the latest AI news, Sir. The main developments include..."
-- Weave key points into flowing narrative, not bullet lists
-- Example: "I've analyzed the latest AI news, Sir. OpenAI is developing a new music generation tool, Amazon has deployed Blue Jay robotics for warehouse automation, and there are growing security concerns around AI browser agents."
-
-Special Cases:
-- When user asks for TUTORIALS/RESOURCES/COURSES: Give ONLY top recommendation + why
-- Example: "I'd recommend the Official Python Tutorial (docs.python.org), Sir. It's comprehensive and assumes basic programming knowledge. The HUD shows alternative options."
-- When user asks for PRODUCTS/TOOLS: Give ONLY 1-2 top picks + key reason
-- Example: "For AI coding, I'd suggest GitHub Copilot, Sir. It integrates directly with VS Code and understands context well."
-- DON'T explain what each resource covers - user can see full details in HUD
-- Focus on RECOMMENDATION, not comprehensive overview
-
-General:
-- Only use bullet points (•) when listing specific items user explicitly asks for (e.g., "list the features")
-- Focus on WHAT'S NEW and ACTIONABLE - skip redundant details
-- When showing SINGLE event: "Your next event is at 8:00 AM: Sesi Kerja, Sir."
-- When showing MULTIPLE events: use line breaks for readability
-- Format: "You have 5 events today, Sir:\n- at 8:00 AM: Event 1\n- at 12:00 PM: Event 2"
-- Use "\n" (newline) between each event for better readability
-- Group events by date and only mention the date ONCE
-- DO NOT repeat dates or full timestamps - the HUD shows complete details
-- After calling a tool, acknowledge briefly then LET THE HUD DO THE TALKING
-- For weather: "Clear skies in Jakarta, Sir. 28 degrees Celsius with light breeze." (HUD shows details)
-- For tasks: "I've added 'Buy groceries' to your list, Sir." or "You have 3 pending tasks." (HUD shows full list)
-- For numbers with units: Use full unit names for TTS clarity (e.g., "degrees Celsius" not "°C", "percent" not "%", "kilometers per hour" not "km/h")
-- If user speaks another language, understand but respond in English
-- Always maintain a professional yet friendly tone
-        """
+        # Deterministic commands are answered locally, skipping both model calls
+        match = self._match_intent(contents)
+        if match is not None:
+            ctx.hud_sections.extend(await self._run_fast_path(ctx, match))
+            return {
+                "response": ctx.response,
+                "hud_sections": ctx.hud_sections
+            }
+        
+        # Only declare the tools this query is likely to need, and pick the
+        # model tier for the whole turn
+        groups = self._select_tool_groups(ctx)
+        choice = self._choose_model(contents, self._previous_query(ctx))
         
         # Create conversation history (multi-turn support)
-        conversation = [
+        conversation = ctx.conversation
+        conversation.append(
             types.Content(
                 role="user",
                 parts=[types.Part.from_text(text=contents)]
             )
-        ]
-        
-        # Generation config with tools
-        gen_config = types.GenerateContentConfig(
-            temperature=config.get('model.temperature', 0.7),
-            max_output_tokens=config.get('model.max_tokens', 2048),
-            system_instruction=system_instruction,
-            tools=[self.tools]
         )
         
+        # Likely tool calls start now, overlapping the first model call
+        speculative = self._start_prefetch(contents)
+        
         try:
+            # Generation config with tools
+            gen_config = await self._generation_config(groups, choice.model)
+            
             # Initial request to model
-            response = self.client.models.generate_content(
-                model=config.get('model.name'),
-                contents=conversation,
-                config=gen_config
-            )
+            with ctx.timed("llm_round1"):
+                response = await self._call_model(conversation, gen_config, choice)
             
             # Check if model wants to call a function
-            function_calls = []
-            if hasattr(response.candidates[0].content, 'parts'):
-                for part in response.candidates[0].content.parts:
-                    if hasattr(part, 'function_call') and part.function_call:
-                        function_calls.append(part.function_call)
+            function_calls = self._extract_function_calls(response)
             
             # If function calls exist, execute them and continue conversation
             if function_calls:
@@ -454,71 +915,195 @@ General:
                 # Add model's function call to conversation
                 conversation.append(response.candidates[0].content)
                 
-                # Execute each function call and collect responses
-                function_responses = []
-                for fc in function_calls:
-                    func_name = fc.name
-                    func_args = dict(fc.args) if fc.args else {}
-                    
-                    logger.info(f"Executing function: {func_name}({func_args})")
-                    
-                    # Execute the actual function
-                    if func_name in TOOL_FUNCTIONS:
-                        try:
-                            result = TOOL_FUNCTIONS[func_name](**func_args)
-                            # Convert result to string for logging (handles both dict and str results)
-                            result_str = str(result) if not isinstance(result, str) else result
-                            logger.debug(f"Function result: {result_str[:100]}...")
-                            
-                            # Process this tool call for HUD data
-                            self._process_tool_call_for_hud(func_name, func_args, result)
-                            
-                            # Create function response part
-                            function_responses.append(
-                                types.Part.from_function_response(
-                                    name=func_name,
-                                    response={"result": result}
-                                )
-                            )
-                        except Exception as e:
-                            logger.error(f"Error executing {func_name}: {e}")
-                            function_responses.append(
-                                types.Part.from_function_response(
-                                    name=func_name,
-                                    response={"error": str(e)}
-                                )
-                            )
-                    else:
-                        logger.warning(f"Function {func_name} not found in TOOL_FUNCTIONS")
+                # Execute the function calls concurrently; gather keeps the
+                # responses in the order they were requested
+                tasks = self._start_tool_calls(ctx, function_calls, speculative)
+                self._discard_prefetch(speculative)
+                try:
+                    results = await asyncio.gather(*tasks)
+                finally:
+                    self._cancel_tool_calls(tasks)
                 
-                # Add function responses to conversation
-                conversation.append(
-                    types.Content(
-                        role="user",
-                        parts=function_responses
-                    )
-                )
+                function_responses = [part for part, _ in results if part is not None]
                 
-                # Send function results back to model for final response
-                final_response = self.client.models.generate_content(
-                    model=config.get('model.name'),
-                    contents=conversation,
-                    config=gen_config
-                )
+                # HUD sections are built from the fetched results while the
+                # model writes its reply
+                hud = asyncio.create_task(self._build_hud(ctx, [record for _, record in results]))
+                try:
+                    # Add function responses to conversation
+                    conversation.append(
+                        types.Content(
+                            role="user",
+                            parts=function_responses
+                        )
+                    )
+                    
+                    # Simple confirmations don't need the model to rephrase them
+                    templated = self._templated_reply(ctx, len(function_calls))
+                    if templated is not None:
+                        ctx.response = templated
+                        ctx.hud_sections.extend(await hud)
+                        return {
+                            "response": ctx.response,
+                            "hud_sections": ctx.hud_sections
+                        }
+                    
+                    # Send function results back to model for final response
+                    with ctx.timed("llm_round2"):
+                        final_response = await self._call_model(conversation, gen_config, choice)
+                    ctx.hud_sections.extend(await hud)
+                finally:
+                    self._cancel_tool_calls([hud])
                 
+                ctx.response = final_response.text
                 logger.info("Generated final response with function results")
                 return {
-                    "response": final_response.text,
-                    "hud_sections": self.hud_sections
+                    "response": ctx.response,
+                    "hud_sections": ctx.hud_sections
                 }
             
             # No function calls, return direct response
+            ctx.response = response.text
             logger.info("Generated direct response (no function calls)")
             return {
-                "response": response.text,
-                "hud_sections": []
+                "response": ctx.response,
+                "hud_sections": ctx.hud_sections
             }
             
         except Exception as e:
             logger.error(f"Error generating content: {e}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+        finally:
+            self._discard_prefetch(speculative)
+    
+    async def generate_stream(self, contents: str, ctx: Optional[GenerationContext] = None):
+        """
+        Streaming variant of generate() that reports progress as it happens.
+        
+        Both model turns use generate_content_stream. Each function call
+        starts executing as soon as its part arrives, before the first turn
+        has finished streaming.
+        
+        Yields (event, data) tuples in order:
+        - ("tool_started", {"name": str, "args": dict}) as each function call
+          arrives and its tool starts
+        - ("hud_section", dict) as soon as a tool's HUD section is built
+          (in call order; rendering overlaps the second turn)
+        - ("text_delta", {"text": str}) for each chunk of answer text, from
+          either turn
+        
+        The full response text is available on ctx.response once exhausted.
+        
+        Args:
+            contents: User's query/prompt as a string
+            ctx: Optional context to record into (a fresh one is created if omitted)
+        """
+        if ctx is None:
+            ctx = GenerationContext(query=contents)
+        
+        logger.debug(f"Streaming content for query: {contents[:50]}...")
+        
+        match = self._match_intent(contents)
+        if match is not None:
+            yield "tool_started", {"name": match.tool, "args": match.args}
+            for section in await self._run_fast_path(ctx, match):
+                ctx.hud_sections.append(section)
+                yield "hud_section", section
+            yield "text_delta", {"text": ctx.response}
+            return
+        
+        groups = self._select_tool_groups(ctx)
+        choice = self._choose_model(contents, self._previous_query(ctx))
+        conversation = ctx.conversation
+        conversation.append(
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=contents)]
+            )
+        )
+        speculative = self._start_prefetch(contents)
+        
+        text_parts = []
+        tasks = []
+        renders = []
+        try:
+            gen_config = await self._generation_config(groups, choice.model)
+            # Round 1: tools start as soon as their function-call part
+            # arrives, while the rest of the turn is still streaming
+            model_parts = []
+            last_on_resource = {}
+            with ctx.timed("llm_round1"):
+                async for part in self._stream_parts(conversation, gen_config, choice):
+                    model_parts.append(part)
+                    if part.function_call:
+                        fc = part.function_call
+                        yield "tool_started", {"name": fc.name, "args": dict(fc.args) if fc.args else {}}
+                        tasks.append(self._start_tool_call(ctx, fc, last_on_resource, speculative))
+                    elif part.text and not part.thought:
+                        text_parts.append(part.text)
+                        yield "text_delta", {"text": part.text}
+            
+            # Round 1 is complete: predictions the model didn't ask for are waste
+            self._discard_prefetch(speculative)
+            
+            if not tasks:
+                ctx.response = "".join(text_parts)
+                logger.info("Generated direct response (no function calls)")
+                return
+            
+            logger.info(f"Model requested {len(tasks)} function call(s)")
+            conversation.append(types.Content(role="model", parts=model_parts))
+            
+            # All calls run concurrently; each call's HUD render starts when it
+            # and every call before it are done, and sections are published
+            # in request order whenever they are ready, without holding up
+            # the second turn
+            function_responses = []
+            for task in tasks:
+                part, record = await task
+                if part is not None:
+                    function_responses.append(part)
+                renders.append(asyncio.create_task(self._build_hud(ctx, [record])))
+                async for section in self._publish_hud(ctx, renders):
+                    yield "hud_section", section
+            
+            conversation.append(
+                types.Content(
+                    role="user",
+                    parts=function_responses
+                )
+            )
+            
+            templated = self._templated_reply(ctx, len(tasks))
+            if templated is not None:
+                async for section in self._publish_hud(ctx, renders, wait=True):
+                    yield "hud_section", section
+                if text_parts:
+                    templated = " " + templated
+                text_parts.append(templated)
+                yield "text_delta", {"text": templated}
+                ctx.response = "".join(text_parts)
+                return
+            
+            # Round 2: stream the final answer as the model produces it
+            with ctx.timed("llm_round2"):
+                async for part in self._stream_parts(conversation, gen_config, choice):
+                    async for section in self._publish_hud(ctx, renders):
+                        yield "hud_section", section
+                    if part.text and not part.thought:
+                        text_parts.append(part.text)
+                        yield "text_delta", {"text": part.text}
+            async for section in self._publish_hud(ctx, renders, wait=True):
+                yield "hud_section", section
+            
+            ctx.response = "".join(text_parts)
+            logger.info("Streamed final response with function results")
+            
+        except Exception as e:
+            logger.error(f"Error streaming content: {e}", exc_info=True)
+            raise
+        finally:
+            # Client went away or a call was rejected: stop the remaining tools
+            self._cancel_tool_calls(tasks)
+            self._cancel_tool_calls(renders)
+            self._discard_prefetch(speculative)
@@ -0,0 +1,467 @@
+"""
+Record/replay cassettes for AURA.
+A cassette captures everything Brain.generate() talks to over the network
+(Gemini responses, tool HTTP exchanges through `requests`, and Google
+Calendar reads) in a JSON file, and replays it deterministically so the
+orchestration code can be tested and benchmarked offline. Replay can sleep
+for the recorded latencies, none at all, or a fixed injected delay.
+The bench calls Brain.generate() directly, so the API's response cache
+(main.py) is never consulted and every run is a full generation.
+
+    python -m core.cassette record cassettes/weather.json "What's the weather in Jakarta?"
+    python -m core.cassette bench cassettes/weather.json --runs 200 --concurrency 8
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+from google.genai import types
+from requests.structures import CaseInsensitiveDict
+
+from core.logger import get_logger
+from core.tools import calendar_tool
+
+logger = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Query parameters never written to a cassette (API keys, tokens)
+REDACTED_PARAMS = {"appid", "key", "api_key", "apikey", "token", "access_token"}
+
+# Response fields that only describe the transport
+_RESPONSE_EXCLUDE = {"sdk_http_response", "automatic_function_calling_history"}
+
+# Tool functions recorded by arguments and return value instead of over
+# HTTP: the Calendar client authenticates with OAuth through httplib2, so
+# replaying at this level needs no credentials
+RECORDED_FUNCTIONS = [(calendar_tool, "get_calendar_events_data")]
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay for a request the cassette has no recording of."""
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _part_key(part: types.Part) -> dict:
+    # Function responses are matched by name only, so tools whose output
+    # changes between runs (clock, local task list) still replay
+    if part.function_response:
+        return {"function_response": part.function_response.name}
+    if part.function_call:
+        return {"function_call": part.function_call.name, "args": part.function_call.args or {}}
+    if part.text is not None:
+        return {"text": part.text, "thought": bool(part.thought)}
+    return {}
+
+
+def model_request_key(method: str, model: str, contents: Any) -> str:
+    """Match key of a model request: its method, model and conversation."""
+    if isinstance(contents, types.Content):
+        contents = [contents]
+    if isinstance(contents, list):
+        contents = [
+            {"role": content.role, "parts": [_part_key(part) for part in content.parts or []]}
+            if isinstance(content, types.Content) else content
+            for content in contents
+        ]
+    return _digest([method, model, contents])
+
+
+def _redacted_url(url: str, params: Any) -> str:
+    """URL with `params` merged into its query string and secrets removed."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query)
+    if isinstance(params, dict):
+        query += [(key, str(value)) for key, value in params.items() if value is not None]
+    elif params:
+        query += [(key, str(value)) for key, value in params]
+    query = sorted((key, "REDACTED" if key.lower() in REDACTED_PARAMS else value) for key, value in query)
+    return urlunsplit(parts._replace(query="&".join(f"{key}={value}" for key, value in query)))
+
+
+def _dump_response(response: types.GenerateContentResponse) -> dict:
+    return json.loads(response.model_dump_json(exclude_none=True, exclude=_RESPONSE_EXCLUDE))
+
+
+def _load_response(data: dict) -> types.GenerateContentResponse:
+    return types.GenerateContentResponse.model_validate_json(json.dumps(data))
+
+
+def _describe(contents: Any) -> str:
+    """Last user text of a conversation, to make cassettes readable."""
+    if isinstance(contents, list):
+        for content in reversed(contents):
+            for part in getattr(content, "parts", None) or []:
+                if part.text:
+                    return part.text[:80]
+            if getattr(content, "parts", None) and content.parts[0].function_response:
+                return f"<function responses: {', '.join(part.function_response.name for part in content.parts)}>"
+    return str(contents)[:80]
+
+
+class Cassette:
+    """Recorded model responses, HTTP exchanges and tool calls, and the latency policy for replaying them."""
+
+    def __init__(self, latency: Union[str, float] = "recorded", scale: float = 1.0):
+        """
+        Args:
+            latency: "recorded" to sleep for the recorded durations, "none" to
+                answer immediately, or a number of seconds to inject for every
+                exchange (for a stream, before its first chunk)
+            scale: Multiplier on recorded durations
+        """
+        if latency not in ("recorded", "none") and not isinstance(latency, (int, float)):
+            raise ValueError(f"latency must be 'recorded', 'none' or seconds, got {latency!r}")
+        self.latency = latency
+        self.scale = scale
+        self.queries: List[str] = []
+        self.model: Dict[str, list] = {}
+        self.http: Dict[str, list] = {}
+        self.calls: Dict[str, list] = {}
+        # Requests replay could not answer, as (kind, description)
+        self.misses: List[tuple] = []
+        self._plays: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "Cassette":
+        """Read a cassette saved by save(); kwargs set the replay latency policy."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {data.get('version')} in {path}")
+        cassette = cls(**kwargs)
+        cassette.queries = data.get("queries", [])
+        cassette.model = data.get("model", {})
+        cassette.http = data.get("http", {})
+        cassette.calls = data.get("calls", {})
+        return cassette
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CASSETTE_VERSION,
+                "queries": self.queries,
+                "model": self.model,
+                "http": self.http,
+                "calls": self.calls
+            }, f, indent=1, ensure_ascii=False)
+        logger.info(f"Saved cassette to {path}: {len(self.model)} model, "
+                    f"{len(self.http)} HTTP and {len(self.calls)} tool recordings")
+
+    def delay(self, recorded: float) -> float:
+        """Seconds to wait before replaying an exchange that originally took `recorded` seconds."""
+        if self.latency == "recorded":
+            return max(0.0, recorded * self.scale)
+        if self.latency == "none":
+            return 0.0
+        return float(self.latency)
+
+    def _add(self, table: dict, key: str, entry: dict):
+        with self._lock:
+            table.setdefault(key, []).append(entry)
+
+    def _play(self, table: dict, kind: str, key: str, description: str) -> dict:
+        """
+        Next recording for a key. Repeated requests cycle through the
+        recordings in order, so a cassette can be replayed any number of times.
+        """
+        entries = table.get(key)
+        with self._lock:
+            if not entries:
+                self.misses.append((kind, description))
+                raise CassetteMissError(f"No {kind} recording for {description}")
+            count = self._plays.get(f"{kind}:{key}", 0)
+            self._plays[f"{kind}:{key}"] = count + 1
+        return entries[count % len(entries)]
+
+    # -- Patching ----------------------------------------------------------
+
+    @contextmanager
+    def recording(self, brain):
+        """Pass everything through to the real services while recording it."""
+        with self._patched(brain, _RecordingModels(self, brain.client.aio.models), brain.client.aio.caches,
+                           self._recording_request, self._recording_function):
+            yield self
+
+    @contextmanager
+    def replaying(self, brain):
+        """Serve everything from the cassette; nothing leaves the process."""
+        prompt_cache_enabled = brain.prompt_cache.enabled
+        # Context caches live on Gemini's side, so there is nothing to replay
+        brain.prompt_cache.enabled = False
+        try:
+            with self._patched(brain, _ReplayModels(self), None,
+                               self._replaying_request, self._replaying_function):
+                yield self
+        finally:
+            brain.prompt_cache.enabled = prompt_cache_enabled
+
+    @contextmanager
+    def _patched(self, brain, models, caches, request_wrapper, function_wrapper):
+        client = brain.client
+        original_request = requests.sessions.Session.request
+        originals = [(module, name, getattr(module, name)) for module, name in RECORDED_FUNCTIONS]
+        brain.client = _CassetteClient(models, caches)
+        requests.sessions.Session.request = request_wrapper(original_request)
+        for module, name, func in originals:
+            setattr(module, name, function_wrapper(name, func))
+        try:
+            yield
+        finally:
+            brain.client = client
+            requests.sessions.Session.request = original_request
+            for module, name, func in originals:
+                setattr(module, name, func)
+
+    def _recording_request(self, original):
+        cassette = self
+
+        def request(session, method, url, *args, **kwargs):
+            # Exchanges made inside a recorded tool function (e.g. OAuth
+            # token refreshes) are covered by its recording
+            if getattr(cassette._local, "in_function", False):
+                return original(session, method, url, *args, **kwargs)
+            start = time.perf_counter()
+            response = original(session, method, url, *args, **kwargs)
+            cassette._add(cassette.http, _digest([method.upper(), _redacted_url(url, kwargs.get("params"))]), {
+                "request": f"{method.upper()} {_redacted_url(url, kwargs.get('params'))}",
+                "seconds": time.perf_counter() - start,
+                "status": response.status_code,
+                "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+                "body": response.content.decode(response.encoding or "utf-8", errors="replace")
+            })
+            return response
+        return request
+
+    def _replaying_request(self, original):
+        cassette = self
+
+        def request(session, method, url, *args, **kwargs):
+            redacted = _redacted_url(url, kwargs.get("params"))
+            entry = cassette._play(cassette.http, "http", _digest([method.upper(), redacted]),
+                                   f"{method.upper()} {redacted}")
+            # Tools call requests from worker threads, so blocking is faithful
+            time.sleep(cassette.delay(entry["seconds"]))
+            response = requests.Response()
+            response.status_code = entry["status"]
+            response.headers = CaseInsensitiveDict(entry["headers"])
+            response._content = entry["body"].encode("utf-8")
+            response.encoding = "utf-8"
+            response.url = url
+            return response
+        return request
+
+    def _recording_function(self, name, func):
+        cassette = self
+
+        def recorded(*args, **kwargs):
+            start = time.perf_counter()
+            cassette._local.in_function = True
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                cassette._local.in_function = False
+            cassette._add(cassette.calls, _digest([name, args, kwargs]), {
+                "request": f"{name}({', '.join([repr(arg) for arg in args] + [f'{k}={v!r}' for k, v in kwargs.items()])})",
+                "seconds": time.perf_counter() - start,
+                "result": result
+            })
+            return copy.deepcopy(result)
+        return recorded
+
+    def _replaying_function(self, name, func):
+        cassette = self
+
+        def replayed(*args, **kwargs):
+            entry = cassette._play(cassette.calls, "call", _digest([name, args, kwargs]), f"{name}{args}{kwargs}")
+            time.sleep(cassette.delay(entry["seconds"]))
+            return copy.deepcopy(entry["result"])
+        return replayed
+
+
+class _CassetteAio:
+    def __init__(self, models, caches):
+        self.models = models
+        self.caches = caches
+
+
+class _CassetteClient:
+    """Stands in for genai.Client: only the async surface Brain uses."""
+
+    def __init__(self, models, caches):
+        self.aio = _CassetteAio(models, caches)
+
+
+class _RecordingModels:
+    """client.aio.models wrapper that records each response."""
+
+    def __init__(self, cassette: Cassette, models):
+        self.cassette = cassette
+        self.models = models
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        start = time.perf_counter()
+        response = await self.models.generate_content(model=model, contents=contents, config=config)
+        self.cassette._add(self.cassette.model, model_request_key("generate_content", model, contents), {
+            "request": f"{model}: {_describe(contents)}",
+            "seconds": time.perf_counter() - start,
+            "response": _dump_response(response)
+        })
+        return response
+
+    async def generate_content_stream(self, *, model: str, contents, config=None):
+        start = time.perf_counter()
+        stream = await self.models.generate_content_stream(model=model, contents=contents, config=config)
+        # Keyed now: Brain extends the conversation once the stream ends
+        key = model_request_key("generate_content_stream", model, contents)
+        return self._record_stream(key, f"{model}: {_describe(contents)}", stream, start)
+
+    async def _record_stream(self, key: str, description: str, stream, start: float):
+        chunks = []
+        async for chunk in stream:
+            chunks.append({"offset": time.perf_counter() - start, "response": _dump_response(chunk)})
+            yield chunk
+        self.cassette._add(self.cassette.model, key, {
+            "request": description,
+            "seconds": time.perf_counter() - start,
+            "stream": chunks
+        })
+
+    async def get(self, *, model: str):
+        return await self.models.get(model=model)
+
+
+class _ReplayModels:
+    """client.aio.models replacement serving recorded responses."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def _play(self, method: str, model: str, contents) -> dict:
+        return self.cassette._play(self.cassette.model, "model", model_request_key(method, model, contents),
+                                   f"{method} {model}: {_describe(contents)}")
+
+    async def generate_content(self, *, model: str, contents, config=None):
+        entry = self._play("generate_content", model, contents)
+        await asyncio.sleep(self.cassette.delay(entry["seconds"]))
+        return _load_response(entry["response"])
+
+    async def generate_content_stream(self, *, model: str, contents, config=None):
+        entry = self._play("generate_content_stream", model, contents)
+        return self._replay_stream(entry["stream"])
+
+    async def _replay_stream(self, chunks: list):
+        previous = 0.0
+        for index, chunk in enumerate(chunks):
+            gap = chunk["offset"] - previous
+            previous = chunk["offset"]
+            # An injected latency delays the first chunk only
+            if index == 0 or self.cassette.latency == "recorded":
+                await asyncio.sleep(self.cassette.delay(gap))
+            yield _load_response(chunk["response"])
+
+    async def get(self, *, model: str):
+        return None
+
+
+# -- Command line -----------------------------------------------------------
+
+async def _record(path: str, queries: List[str]):
+    from core.brain import Brain
+
+    brain = Brain()
+    cassette = Cassette()
+    with cassette.recording(brain):
+        for query in queries:
+            result = await brain.generate(query)
+            print(f"{query!r} -> {result['response']!r}")
+    cassette.queries = queries
+    cassette.save(path)
+
+
+async def _bench(path: str, runs: int, concurrency: int, latency: Union[str, float], scale: float) -> int:
+    from core.brain import Brain
+
+    cassette = Cassette.load(path, latency=latency, scale=scale)
+    if not cassette.queries:
+        print(f"{path} has no queries to replay")
+        return 1
+    brain = Brain()
+    # The API would answer repeated queries from its response cache; the bench measures full generations
+    print("Response cache: not used (runs call Brain.generate directly)")
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await brain.generate(cassette.queries[index % len(cassette.queries)])
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    with cassette.replaying(brain):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run(index) for index in range(runs)), return_exceptions=True)
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(f"{runs} runs, concurrency {concurrency}, latency {latency}: "
+          f"{runs / elapsed:.1f} req/s, p50 {percentile(0.5):.1f} ms, "
+          f"p95 {percentile(0.95):.1f} ms, p99 {percentile(0.99):.1f} ms")
+    if cassette.misses:
+        print(f"{len(cassette.misses)} request(s) missing from the cassette, e.g. {cassette.misses[0]}")
+    # Misses are reported above; anything else a run raised fails the bench too
+    errors = [result for result in results
+              if isinstance(result, Exception) and not isinstance(result, CassetteMissError)]
+    if errors:
+        print(f"{len(errors)} of {runs} run(s) raised, e.g. {type(errors[0]).__name__}: {errors[0]}")
+    return 1 if cassette.misses or errors else 0
+
+
+def _latency(value: str) -> Union[str, float]:
+    return value if value in ("recorded", "none") else float(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m core.cassette", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Run queries against the real services and record them")
+    record.add_argument("path")
+    record.add_argument("queries", nargs="+")
+    bench = commands.add_parser("bench", help="Replay a cassette's queries offline and report latency")
+    bench.add_argument("path")
+    bench.add_argument("--runs", type=int, default=100)
+    bench.add_argument("--concurrency", type=int, default=1)
+    bench.add_argument("--latency", type=_latency, default="recorded",
+                       help="'recorded', 'none' or seconds injected per exchange")
+    bench.add_argument("--scale", type=float, default=1.0, help="Multiplier on recorded latencies")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        asyncio.run(_record(args.path, args.queries))
+        return 0
+    return asyncio.run(_bench(args.path, args.runs, args.concurrency, args.latency, args.scale))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
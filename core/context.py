@@ -0,0 +1,65 @@
+"""
+Per-request generation context for AURA.
+Holds all state that a single Brain.generate() call mutates, so one Brain
+instance can safely serve many concurrent requests.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from google.genai import types
+
+from core.metrics import STAGE_SECONDS
+
+
+@dataclass
+class ToolCallRecord:
+    """Outcome of a single tool call made during a generation"""
+    name: str
+    args: Dict[str, Any]
+    result: Any = None
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+
+@dataclass
+class GenerationContext:
+    """State owned by one generate() call"""
+    query: str
+    conversation: List[types.Content] = field(default_factory=list)
+    hud_sections: List[dict] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    tool_results: List[ToolCallRecord] = field(default_factory=list)
+    response: Optional[str] = None
+    # Timings are also added from worker threads (TTS synthesis and encoding)
+    _timings_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_timing(self, stage: str, elapsed_ms: float):
+        """
+        Add a duration (ms) to timings[stage].
+
+        Repeated stages accumulate, so calling the same tool twice
+        reports the total time spent in it.
+        """
+        with self._timings_lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed_ms
+
+    def server_timing(self) -> str:
+        """Format timings as a Server-Timing header value (durations in ms)."""
+        with self._timings_lock:
+            timings = list(self.timings.items())
+        return ", ".join(f"{stage};dur={elapsed_ms:.1f}" for stage, elapsed_ms in timings)
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Time a pipeline stage into timings and the stage latency histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add_timing(stage, elapsed * 1000)
+            STAGE_SECONDS.observe(elapsed, stage=stage)
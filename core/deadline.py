@@ -0,0 +1,85 @@
+"""
+Per-request latency budget for AURA.
+main.py opens a deadline for each query; it travels with the request in a
+context variable, so it reaches Brain, every tool task and the worker
+threads blocking tools run in (asyncio copies the context into both).
+Brain runs each tool call under an earlier tool deadline, leaving time for
+the reply; tools size their HTTP timeouts and decide what to skip from
+it, and Brain cancels tool calls that still overrun.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Absolute time.monotonic() at which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("aura_request_deadline", default=None)
+# Absolute time.monotonic() by which the current tool call must return
+_tool_deadline: ContextVar[Optional[float]] = ContextVar("aura_tool_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]):
+    """
+    Run a block under a latency budget.
+
+    Args:
+        seconds: Budget for the block, or None/0 for no deadline
+    """
+    token = _deadline.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget (may be negative), or None if unbounded."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def tool_deadline(reserve: float):
+    """
+    Run a tool call under the request's deadline brought forward by `reserve`.
+
+    Args:
+        reserve: Seconds of the request's budget the tool may not use
+    """
+    request = _deadline.get()
+    token = _tool_deadline.set(None if request is None else request - reserve)
+    try:
+        yield
+    finally:
+        _tool_deadline.reset(token)
+
+
+def tool_remaining() -> Optional[float]:
+    """Seconds a tool may still spend (the request's remaining time outside a tool call), or None if unbounded."""
+    deadline = _tool_deadline.get()
+    if deadline is None:
+        return remaining()
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """Whether the current request's budget is used up."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def http_timeout(default: float, floor: float = 0.1) -> float:
+    """
+    Timeout for an outbound HTTP call: its usual timeout, cut to the time
+    the current tool call has left.
+
+    Args:
+        default: The call's normal timeout in seconds
+        floor: Smallest timeout returned, so an expired budget still fails fast
+    """
+    left = tool_remaining()
+    if left is None:
+        return default
+    return max(floor, min(default, left))
@@ -0,0 +1,111 @@
+"""
+Local intent matcher for AURA.
+Recognizes short, deterministic commands ("what time is it", "turn off the
+light", "set brightness to 50%", "show my tasks") so Brain can run the
+matching tool directly instead of making two Gemini round trips.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Politeness and wake words that carry no meaning for intent matching
+_LEADING_FILLER = re.compile(
+    r"^(?:(?:hey|hi|ok|okay|aura|please|can you|could you|would you|will you)\s+)+"
+)
+_TRAILING_FILLER = re.compile(r"(?:\s+(?:please|for me|now|aura|sir|thanks|thank you))+$")
+
+
+def normalize(query: str) -> str:
+    """Lowercase, expand "what's", drop punctuation (except %) and filler words."""
+    text = query.lower().replace("what's", "what is").replace("’", "'")
+    text = re.sub(r"[^\w\s%]", " ", text)
+    text = " ".join(text.split())
+    text = _LEADING_FILLER.sub("", text)
+    return _TRAILING_FILLER.sub("", text)
+
+
+def _percent_to_brightness(match: re.Match) -> Optional[dict]:
+    """Map "N%" to the lights' 0-255 brightness scale."""
+    percent = int(match.group("percent"))
+    if not 0 < percent <= 100:
+        return None
+    return {"brightness": round(percent * 255 / 100)}
+
+
+@dataclass
+class IntentMatch:
+    """A recognized intent and the tool call that fulfils it"""
+    intent: str
+    tool: str
+    args: Dict = field(default_factory=dict)
+    confidence: float = 1.0
+
+
+# (intent, tool name in TOOL_FUNCTIONS, pattern, args builder)
+INTENT_PATTERNS: List[Tuple[str, str, re.Pattern, Callable[[re.Match], Optional[dict]]]] = [
+    ("time", "get_time", re.compile(
+        r"what time is it|what is the time|(?:tell me )?the (?:current )?time|current time"
+    ), lambda m: {}),
+    ("light_off", "turn_off_light", re.compile(
+        r"(?:turn|switch) off (?:the |my )?lights?|(?:turn|switch) (?:the |my )?lights? off|lights? off"
+    ), lambda m: {}),
+    ("light_on", "turn_on_light", re.compile(
+        r"(?:turn|switch) on (?:the |my )?lights?|(?:turn|switch) (?:the |my )?lights? on|lights? on"
+    ), lambda m: {}),
+    ("brightness", "set_brightness", re.compile(
+        r"(?:(?:set|change|dim|turn) (?:the )?(?:lights? )?)?brightness (?:to )?(?P<percent>\d{1,3}) ?(?:%|percent)"
+    ), _percent_to_brightness),
+    ("brightness", "set_brightness", re.compile(
+        r"(?:set|dim|turn) (?:the )?lights? (?:to )?(?P<percent>\d{1,3}) ?(?:%|percent)"
+    ), _percent_to_brightness),
+    ("tasks", "get_tasks", re.compile(
+        r"(?:show|list|display|read|what are) (?:me )?(?:all )?(?:of )?(?:my )?(?:tasks|to ?dos|to ?do list)"
+        r"|what is on my to ?do list"
+    ), lambda m: {}),
+]
+
+
+class IntentMatcher:
+    """Matches queries against INTENT_PATTERNS with a coverage-based confidence."""
+
+    def __init__(self, min_confidence: float = 0.9):
+        """
+        Args:
+            min_confidence: Share of the (normalized) query a pattern must
+                cover to count as a match; anything less goes to the model
+        """
+        self.min_confidence = min_confidence
+
+    def score(self, query: str) -> Optional[IntentMatch]:
+        """
+        Return the best-covering intent for a query, whatever its confidence.
+
+        Confidence is the fraction of the normalized query explained by the
+        pattern, so "turn off the light" scores 1.0 while "turn off the
+        light in the kitchen" scores lower (the model should handle the
+        light's name).
+        """
+        text = normalize(query)
+        if not text:
+            return None
+
+        best = None
+        for intent, tool, pattern, build_args in INTENT_PATTERNS:
+            found = pattern.search(text)
+            if not found:
+                continue
+            args = build_args(found)
+            if args is None:
+                continue
+            confidence = (found.end() - found.start()) / len(text)
+            if best is None or confidence > best.confidence:
+                best = IntentMatch(intent=intent, tool=tool, args=args, confidence=confidence)
+        return best
+
+    def match(self, query: str) -> Optional[IntentMatch]:
+        """Return the intent only if it meets min_confidence."""
+        best = self.score(query)
+        if best is None or best.confidence < self.min_confidence:
+            return None
+        return best
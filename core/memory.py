@@ -0,0 +1,116 @@
+"""
+Token-budgeted conversation memory for AURA.
+Recent exchanges are kept verbatim so follow-ups ("mark that one done")
+resolve; older ones are compacted one by one into a short summary block,
+so the prompt stays within a fixed budget however long the session runs.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List
+
+from google.genai import types
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _first_sentence(text: str, max_chars: int) -> str:
+    """First sentence of text, shortened to max_chars."""
+    text = " ".join(text.split())
+    sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    if len(sentence) > max_chars:
+        sentence = sentence[:max_chars].rstrip() + "..."
+    return sentence
+
+
+@dataclass
+class Turn:
+    """One user/model exchange"""
+    query: str
+    response: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.query) + estimate_tokens(self.response)
+
+
+class ConversationMemory:
+    """Recent turns verbatim plus an incrementally compacted summary of older ones."""
+
+    def __init__(self, token_budget: int = 2000, summary_budget: int = 500, min_recent_turns: int = 2):
+        """
+        Args:
+            token_budget: Upper bound on history tokens sent with each request
+            summary_budget: Part of token_budget reserved for the summary block
+            min_recent_turns: Turns always kept verbatim, even if over budget
+        """
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.min_recent_turns = min_recent_turns
+        self.recent: Deque[Turn] = deque()
+        self.summary: Deque[str] = deque()
+        self.turn_count = 0
+        self.omitted_turns = 0
+        self._recent_tokens = 0
+        self._summary_tokens = 0
+
+    def record_turn(self, query: str, response: str):
+        """
+        Add a completed exchange and compact whatever no longer fits.
+
+        Only turns pushed out of the verbatim window are summarized, so
+        each call does a constant amount of work.
+        """
+        turn = Turn(query=query, response=response)
+        self.recent.append(turn)
+        self._recent_tokens += turn.tokens
+        self.turn_count += 1
+
+        recent_budget = self.token_budget - self.summary_budget
+        while self._recent_tokens > recent_budget and len(self.recent) > self.min_recent_turns:
+            self._compact(self.recent.popleft())
+
+    def _compact(self, turn: Turn):
+        """Fold one turn into the summary, dropping the oldest lines when over budget."""
+        self._recent_tokens -= turn.tokens
+        line = f"- Sir asked: {_first_sentence(turn.query, 120)} / AURA: {_first_sentence(turn.response, 160)}"
+        self.summary.append(line)
+        self._summary_tokens += estimate_tokens(line)
+        while self._summary_tokens > self.summary_budget and self.summary:
+            self._summary_tokens -= estimate_tokens(self.summary.popleft())
+            self.omitted_turns += 1
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of history sent with the next request."""
+        return self._recent_tokens + self._summary_tokens
+
+    def to_contents(self) -> List[types.Content]:
+        """
+        History as Gemini contents: recent turns verbatim, alternating user/model.
+
+        The summary block is prepended to the first user turn rather than
+        sent as a turn of its own, which would put two user turns in a row.
+        """
+        contents = []
+        for turn in self.recent:
+            contents.append(types.Content(role="user", parts=[types.Part.from_text(text=turn.query)]))
+            contents.append(types.Content(role="model", parts=[types.Part.from_text(text=turn.response)]))
+        if self.summary:
+            lines = ["Summary of our earlier conversation:"]
+            if self.omitted_turns:
+                lines.append(f"({self.omitted_turns} earlier exchanges omitted)")
+            lines.extend(self.summary)
+            summary = types.Part.from_text(text="\n".join(lines))
+            if contents:
+                contents[0].parts.insert(0, summary)
+            else:
+                contents = [
+                    types.Content(role="user", parts=[summary]),
+                    types.Content(role="model", parts=[types.Part.from_text(text="Noted, Sir.")])
+                ]
+        return contents
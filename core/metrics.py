@@ -0,0 +1,294 @@
+"""
+Metrics for AURA.
+Minimal Prometheus-style counters, gauges and histograms, rendered in the
+text exposition format by GET /metrics.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Shared label handling for all metric types."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration (seconds) of a block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def stats(self, **labels) -> Tuple[float, float]:
+        """Return (sum, count) for one label set."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+        return (state[-2], state[-1]) if state else (0.0, 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds all metrics and renders them for scraping."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Optional[Iterable[float]] = None) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and the metrics AURA exports
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "aura_http_requests_total", "HTTP requests handled, by route and status code", ["route", "status"]
+)
+REQUEST_SECONDS = registry.histogram(
+    "aura_http_request_duration_seconds", "HTTP request latency by route", ["route"]
+)
+STAGE_SECONDS = registry.histogram(
+    "aura_stage_duration_seconds",
+    "Latency of each pipeline stage (llm_round1, hud_build, llm_round2, tts_synthesis, encode)",
+    ["stage"]
+)
+TOOL_CALLS = registry.counter("aura_tool_calls_total", "Tool calls executed, by tool name", ["tool"])
+TOOL_ERRORS = registry.counter("aura_tool_errors_total", "Tool calls that raised or reported failure", ["tool"])
+TOOL_SECONDS = registry.histogram("aura_tool_duration_seconds", "Tool execution latency by tool name", ["tool"])
+QUEUE_DEPTH = registry.gauge("aura_stage_queue_depth", "Callers waiting for a stage slot", ["stage"])
+STAGE_ACTIVE = registry.gauge("aura_stage_active", "Stage slots currently in use", ["stage"])
+STAGE_REJECTED = registry.counter(
+    "aura_stage_rejected_total", "Work shed by admission control, by stage and status code", ["stage", "status"]
+)
+FAST_PATH_REQUESTS = registry.counter(
+    "aura_fast_path_requests_total",
+    "Queries checked by the local intent matcher, by outcome (hit, low_confidence, miss)",
+    ["outcome"]
+)
+FAST_PATH_SECONDS = registry.histogram(
+    "aura_fast_path_duration_seconds", "Latency of queries answered by the local intent fast path", ["intent"]
+)
+FAST_PATH_SAVED_SECONDS = registry.counter(
+    "aura_fast_path_saved_seconds_total",
+    "Estimated latency avoided by the fast path (mean llm_round1 + llm_round2 minus fast path time)"
+)
+LLM_PROMPT_TOKENS = registry.counter("aura_llm_prompt_tokens_total", "Input tokens sent to the model")
+LLM_CACHED_TOKENS = registry.counter(
+    "aura_llm_cached_tokens_total", "Input tokens served from the prompt cache instead of being resent"
+)
+PROMPT_CACHE_EVENTS = registry.counter(
+    "aura_prompt_cache_events_total",
+    "Prompt cache lifecycle events (created, refreshed, invalidated, unavailable, fallback)",
+    ["event"]
+)
+HISTORY_TOKENS = registry.histogram(
+    "aura_conversation_history_tokens",
+    "Estimated tokens of session history sent with each request",
+    buckets=(0, 250, 500, 1000, 2000, 4000, 8000, 16000)
+)
+MODEL_CALLS_SAVED = registry.counter(
+    "aura_model_calls_saved_total",
+    "Model calls avoided, by reason (fast_path: both rounds, template: the second round)",
+    ["reason"]
+)
+TOOL_GROUPS_SELECTED = registry.counter(
+    "aura_tool_groups_selected_total", "Tool groups sent to the model, by group", ["group"]
+)
+TOOL_DECLARATIONS_SENT = registry.histogram(
+    "aura_tool_declarations_sent", "Tool declarations sent with each model request",
+    buckets=(0, 2, 4, 6, 8, 10, 12, 14, 16, 18)
+)
+RESPONSE_CACHE_LOOKUPS = registry.counter(
+    "aura_response_cache_lookups_total",
+    "Response cache lookups, by outcome (hit, miss, skipped: query depends on the conversation)",
+    ["outcome"]
+)
+RESPONSE_CACHE_ENTRIES = registry.gauge("aura_response_cache_entries", "Replies currently in the response cache")
+MODEL_CALL_ATTEMPTS = registry.counter(
+    "aura_model_call_attempts_total",
+    "Model request attempts, by outcome (success, retryable_error, error)",
+    ["outcome"]
+)
+MODEL_RETRIES = registry.counter(
+    "aura_model_retries_total", "Model requests retried after a transient error, by reason", ["reason"]
+)
+MODEL_RETRIES_EXHAUSTED = registry.counter(
+    "aura_model_retries_exhausted_total",
+    "Model calls given up (out of attempts or deadline), by last error reason; served as 503",
+    ["reason"]
+)
+MODEL_HEDGES = registry.counter(
+    "aura_model_hedges_total",
+    "Hedged model requests (fired; won: the hedge finished first; lost: the original finished first)",
+    ["outcome"]
+)
+MODEL_HEDGE_DELAY = registry.gauge(
+    "aura_model_hedge_delay_seconds", "Current hedging delay (recent p95 model latency)"
+)
+MODEL_TIER_TURNS = registry.counter(
+    "aura_model_tier_turns_total", "Turns routed to each model tier, by deciding rule", ["tier", "reason"]
+)
+MODEL_TIER_SECONDS = registry.histogram(
+    "aura_model_tier_call_duration_seconds", "Latency of each model call, by model tier", ["tier"]
+)
+MODEL_TIER_TOKENS = registry.counter(
+    "aura_model_tier_tokens_total", "Tokens used per model tier, by kind (prompt, output)", ["tier", "kind"]
+)
+TOOL_DEADLINE_EXCEEDED = registry.counter(
+    "aura_tool_deadline_exceeded_total",
+    "Tool calls cut short by the request's latency budget (cancelled, or partial results)",
+    ["tool", "outcome"]
+)
+PREFETCH_CALLS = registry.counter(
+    "aura_prefetch_calls_total",
+    "Speculative tool calls, by outcome (started; hit: reused; wasted: the model asked for something else; "
+    "failed: reused but had to be re-run)",
+    ["tool", "outcome"]
+)
+PREFETCH_WASTED_SECONDS = registry.counter(
+    "aura_prefetch_wasted_seconds_total", "Time spent on speculative tool calls that were discarded", ["tool"]
+)
@@ -0,0 +1,271 @@
+"""
+Resilient model calls for AURA.
+Wraps each Gemini request with deadline-aware retries (exponential backoff
+with full jitter) for transient errors, and optional hedging: when a
+request is slower than the recent p95, a second identical request is sent
+and whichever finishes first wins. Exhausted retries surface as a 503.
+Each upstream request holds its own admission slot, so backoff between
+attempts doesn't occupy one.
+"""
+
+import asyncio
+import math
+import random
+from collections import deque
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from google.genai import errors as genai_errors
+
+from core.admission import OverloadedError, get_limiter
+from core.deadline import remaining
+from core.logger import get_logger
+from core.metrics import MODEL_CALL_ATTEMPTS, MODEL_HEDGE_DELAY, MODEL_HEDGES, MODEL_RETRIES, MODEL_RETRIES_EXHAUSTED
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, rate limits and server-side failures
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Marks the end of an upstream stream in ModelCaller.stream()'s buffer
+_END = object()
+
+
+class ModelUnavailableError(OverloadedError):
+    """Raised when a model call still fails after all retries (served as 503)."""
+
+    def __init__(self, attempts: int, retry_after: int, error: Exception):
+        super().__init__("llm", 503, retry_after, f"model unavailable after {attempts} attempt(s)")
+        self.attempts = attempts
+        self.error = error
+
+
+def retry_reason(error: Exception) -> Optional[str]:
+    """
+    Classify an error for retrying.
+
+    Returns:
+        The metric label for a transient error (status code, "timeout" or
+        "connection"), or None if retrying cannot help
+    """
+    if isinstance(error, genai_errors.APIError):
+        return str(error.code) if error.code in RETRYABLE_STATUS else None
+    if isinstance(error, (TimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    if isinstance(error, (ConnectionError, httpx.TransportError)):
+        return "connection"
+    return None
+
+
+class ModelCaller:
+    """Retry, backoff and hedging policy shared by all model requests."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 deadline: float = 30.0, attempt_timeout: float = 20.0, hedge: bool = False,
+                 hedge_min_delay: float = 0.5, hedge_min_samples: int = 20, window: int = 200,
+                 stage: Optional[str] = None):
+        """
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff before the first retry (doubles per retry, full jitter)
+            max_delay: Upper bound on a single backoff
+            deadline: Seconds a call may take across all attempts and backoffs
+                      (less if the request's own deadline is closer)
+            attempt_timeout: Seconds a single attempt may take
+            hedge: Send a second request when the first is slower than the recent p95
+            hedge_min_delay: Never hedge sooner than this many seconds
+            hedge_min_samples: Latency samples needed before hedging starts
+            window: Recent successful latencies kept for the p95 estimate
+            stage: Admission stage (core/admission.py) whose slot each
+                   upstream request holds; None for no limit
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=window)
+        self.stage = stage
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging: the recent p95 latency, or None if too few samples."""
+        if len(self._latencies) < self.hedge_min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        p95 = latencies[math.ceil(0.95 * len(latencies)) - 1]
+        delay = max(self.hedge_min_delay, p95)
+        MODEL_HEDGE_DELAY.set(delay)
+        return delay
+
+    async def _hold_slot(self, stack: AsyncExitStack):
+        """Enter this caller's admission slot on the given stack."""
+        if self.stage is not None:
+            await stack.enter_async_context(get_limiter(self.stage).slot())
+
+    async def _limited(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run one upstream request inside its own admission slot."""
+        async with AsyncExitStack() as stack:
+            await self._hold_slot(stack)
+            return await request()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt`."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def call(self, request: Callable[[], Awaitable[T]], hedge: bool = True) -> T:
+        """
+        Run a model request with retries and (optionally) hedging.
+
+        Args:
+            request: Function starting a fresh request each time it is called
+            hedge: Allow hedging for this call (only safe for idempotent,
+                   non-streaming requests)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            ModelUnavailableError: A transient error persisted past the last
+                attempt or the deadline
+            Exception: Any non-retryable error, unchanged
+        """
+        return await self._retry(lambda: self._limited(request), hedge)
+
+    async def _retry(self, request: Callable[[], Awaitable[T]], hedge: bool) -> T:
+        """Retry loop behind call() and stream(); `request` takes its own slot."""
+        loop = asyncio.get_running_loop()
+        budget = self.deadline
+        request_left = remaining()
+        if request_left is not None:
+            budget = min(budget, request_left)
+        deadline_at = loop.time() + budget
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with asyncio.timeout(min(self.attempt_timeout, max(0.0, deadline_at - loop.time()))):
+                    result = await self._attempt(request, hedge and self.hedge)
+                MODEL_CALL_ATTEMPTS.inc(outcome="success")
+                return result
+            except Exception as e:
+                reason = retry_reason(e)
+                if reason is None:
+                    MODEL_CALL_ATTEMPTS.inc(outcome="error")
+                    raise
+                MODEL_CALL_ATTEMPTS.inc(outcome="retryable_error")
+
+                delay = self._backoff(attempt)
+                if attempt >= self.max_attempts or loop.time() + delay >= deadline_at:
+                    logger.error(f"Model call failed after {attempt} attempt(s) ({reason}): {e}")
+                    MODEL_RETRIES_EXHAUSTED.inc(reason=reason)
+                    raise ModelUnavailableError(attempt, max(1, math.ceil(self.max_delay)), e) from e
+                logger.warning(f"Model call attempt {attempt} failed ({reason}), retrying in {delay:.2f}s: {e}")
+                MODEL_RETRIES.inc(reason=reason)
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, request: Callable[[], Awaitable[T]], hedge: bool) -> T:
+        """One attempt, hedged when enabled and enough latency history exists."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delay = self.hedge_delay() if hedge else None
+        if delay is None:
+            result = await request()
+        else:
+            result = await self._hedged(request, delay)
+        self._latencies.append(loop.time() - start)
+        return result
+
+    async def _hedged(self, request: Callable[[], Awaitable[T]], delay: float) -> T:
+        """
+        Start a request and, if it hasn't finished after `delay`, a backup.
+
+        The first to succeed wins and the other is cancelled. If both fail,
+        the last error is raised.
+        """
+        primary = asyncio.ensure_future(request())
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            logger.info(f"Model call slower than {delay:.2f}s, sending hedged request")
+            MODEL_HEDGES.inc(outcome="fired")
+            backup = asyncio.ensure_future(request())
+            pending.add(backup)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        MODEL_HEDGES.inc(outcome="won" if task is backup else "lost")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream(self, request: Callable[[], Awaitable[AsyncIterator[T]]]) -> AsyncIterator[T]:
+        """
+        Open a streaming request with retries (never hedged) and return its chunks.
+
+        The admission slot is taken per attempt and held while the upstream
+        stream is read, which happens in a background task into a buffer:
+        the slot is released as soon as the model has finished sending,
+        however slowly the caller consumes the chunks.
+
+        Args:
+            request: Function opening a fresh stream each time it is called
+
+        Returns:
+            Async iterator over the stream's chunks
+
+        Raises:
+            Same as call(), for errors while opening the stream
+        """
+        async def open_stream():
+            stack = AsyncExitStack()
+            try:
+                await self._hold_slot(stack)
+                return stack, await request()
+            except BaseException:
+                await stack.aclose()
+                raise
+
+        stack, upstream = await self._retry(open_stream, hedge=False)
+        buffer = asyncio.Queue()
+
+        async def read():
+            try:
+                async with stack:
+                    async for chunk in upstream:
+                        buffer.put_nowait(chunk)
+                buffer.put_nowait(_END)
+            except Exception as e:
+                buffer.put_nowait(e)
+
+        reader = asyncio.create_task(read())
+
+        async def chunks():
+            try:
+                while True:
+                    item = await buffer.get()
+                    if item is _END:
+                        return
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                # The consumer stopped early: stop reading and free the slot
+                # (a no-op when the reader already released it)
+                reader.cancel()
+                await stack.aclose()
+
+        return chunks()
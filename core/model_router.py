@@ -0,0 +1,87 @@
+"""
+Model tier routing for AURA.
+Sends simple and tool-only turns (lights, tasks, time, weather) to a fast,
+cheap Gemini model and escalates open-ended or search-synthesis turns to a
+more capable one. The tier is chosen once per turn, so both model rounds of
+a tool call run on the same model.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+from core.tool_router import ToolRouter
+
+DEFAULT_CAPABLE_GROUPS = ["search"]
+DEFAULT_CAPABLE_KEYWORDS = [
+    "why", "explain", "compare", "analyze", "analyse", "summarize", "summarise", "recommend",
+    "write", "plan", "pros and cons", "difference between", "how does", "how do"
+]
+
+
+@dataclass(frozen=True)
+class ModelChoice:
+    """Model picked for one turn"""
+    tier: str
+    model: str
+    reason: str
+
+
+class ModelRouter:
+    """Rule-based choice between the "fast" and "capable" model tiers."""
+
+    def __init__(self, tiers: Dict[str, str], capable_groups: Iterable[str] = DEFAULT_CAPABLE_GROUPS,
+                 capable_keywords: Iterable[str] = DEFAULT_CAPABLE_KEYWORDS, long_query_words: int = 25):
+        """
+        Args:
+            tiers: Model name per tier; must contain "fast" and "capable"
+            capable_groups: Tool groups (see TOOL_GROUPS) whose turns need the capable model
+            capable_keywords: Words or phrases marking an open-ended request
+            long_query_words: Queries with at least this many words are escalated
+        """
+        missing = {"fast", "capable"} - set(tiers)
+        if missing:
+            raise ValueError(f"Missing model tiers: {sorted(missing)}")
+        self.tiers = dict(tiers)
+        self.capable_groups = set(capable_groups)
+        self.long_query_words = long_query_words
+        self._capable_pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(keyword) for keyword in capable_keywords) + r")\b"
+        )
+
+    def choose(self, query: str, previous_query: str = "") -> ModelChoice:
+        """
+        Pick the model tier for a turn.
+
+        Args:
+            query: The user's query
+            previous_query: The user's previous turn, so follow-ups to a
+                search ("and the second one?") stay on the capable model
+
+        Returns:
+            ModelChoice with the tier, its model and the rule that decided
+        """
+        # Only groups the keywords matched escalate: the tool router's
+        # fallback declares search for small talk too, which stays fast
+        groups = ToolRouter.matched_groups(query) | ToolRouter.matched_groups(previous_query)
+        text = query.lower()
+        if self._capable_pattern.search(text):
+            return self._choice("capable", "open_ended")
+        if groups & self.capable_groups:
+            return self._choice("capable", "search")
+        if len(text.split()) >= self.long_query_words:
+            return self._choice("capable", "long_query")
+        return self._choice("fast", "simple")
+
+    def _choice(self, tier: str, reason: str) -> ModelChoice:
+        return ModelChoice(tier=tier, model=self.tiers[tier], reason=reason)
+
+    @property
+    def models(self) -> set:
+        """Distinct model names across tiers."""
+        return set(self.tiers.values())
+
+
+def default_choice(model: str) -> ModelChoice:
+    """Choice used when routing is off: the single configured model."""
+    return ModelChoice(tier="default", model=model, reason="routing_disabled")
@@ -1,11 +1,16 @@
+import asyncio
 import subprocess
 import wave
 import io
 from pathlib import Path
 import base64
 import re
+import threading
+from collections import OrderedDict
 
+from core.admission import get_limiter
 from core.logger import get_logger
+from core.metrics import STAGE_SECONDS
 
 logger = get_logger(__name__)
 
@@ -55,6 +60,34 @@ def sanitize_text(text: str) -> str:
             safe_text = re.sub(r' {2,}', ' ', safe_text)
             return safe_text.strip()
 
+class SentenceChunker:
+    """Incrementally split streamed text into complete sentences for TTS."""
+    
+    _boundary = re.compile(r'(?<=[.!?])\s+')
+    
+    def __init__(self):
+        self._buffer = ""
+    
+    def feed(self, text: str) -> list:
+        """
+        Add streamed text and return any sentences it completed.
+        
+        Args:
+            text: Next chunk of text from the model
+            
+        Returns:
+            list: Complete sentences (the unfinished tail stays buffered)
+        """
+        self._buffer += text
+        parts = self._boundary.split(self._buffer)
+        self._buffer = parts.pop()
+        return [part for part in parts if part.strip()]
+    
+    def flush(self) -> list:
+        """Return whatever text is still buffered as a final sentence."""
+        tail, self._buffer = self._buffer, ""
+        return [tail] if tail.strip() else []
+
 class Mouth:
     """Text-to-Speech using Piper for frontend playback"""
     
@@ -98,15 +131,22 @@ class Mouth:
         logger.debug(f"Using first available model: {model_files[0].name}")
         return model_files[0]
     
-    def speak(self, text):
+    def _timed(self, stage, ctx=None):
+        """Time a TTS stage into the metrics and, if given, the request's context."""
+        if ctx is not None:
+            return ctx.timed(stage)
+        return STAGE_SECONDS.time(stage=stage)
+    
+    def synthesize(self, text, ctx=None):
         """
-        Convert text to speech and return base64 encoded audio for frontend playback.
+        Convert text to speech and return the WAV file bytes.
         
         Args:
             text: The text to convert to speech
+            ctx: Optional GenerationContext to record tts_synthesis/encode timings on
             
         Returns:
-            Base64 encoded WAV audio string, or None if error
+            WAV audio bytes, or None if error
         """
         if not text or text.strip() == "":
             logger.warning("Empty text provided to speak()")
@@ -128,19 +168,20 @@ class Mouth:
         try:
             # Run Piper to generate speech
             logger.debug("Starting Piper subprocess")
-            process = subprocess.Popen(
-                [
-                    "piper",
-                    "--model", str(self.model_path),
-                    "--output-raw"
-                ],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Send sanitized text to Piper
-            stdout, stderr = process.communicate(input=text.encode('utf-8'))
+            with self._timed("tts_synthesis", ctx):
+                process = subprocess.Popen(
+                    [
+                        "piper",
+                        "--model", str(self.model_path),
+                        "--output-raw"
+                    ],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+                
+                # Send sanitized text to Piper
+                stdout, stderr = process.communicate(input=text.encode('utf-8'))
             
             if process.returncode != 0:
                 error_msg = stderr.decode('utf-8')
@@ -149,18 +190,64 @@ class Mouth:
             
             logger.debug("Audio generated successfully")
             # Convert raw audio to WAV format
-            audio_data = self._raw_to_wav(stdout)
-            
-            # Encode to base64 for frontend
-            b64_audio = base64.b64encode(audio_data).decode('utf-8')
-            logger.debug(f"Base64 audio generated (size: {len(b64_audio)})")
+            with self._timed("encode", ctx):
+                audio_data = self._raw_to_wav(stdout)
+            logger.debug(f"WAV audio generated (size: {len(audio_data)})")
             
-            return b64_audio
+            return audio_data
         
         except Exception as e:
             logger.error(f"Error in TTS: {e}", exc_info=True)
             return None
     
+    def speak(self, text):
+        """
+        Convert text to speech and return base64 encoded audio for frontend playback.
+        
+        Args:
+            text: The text to convert to speech
+            
+        Returns:
+            Base64 encoded WAV audio string, or None if error
+        """
+        audio_data = self.synthesize(text)
+        if audio_data is None:
+            return None
+        with STAGE_SECONDS.time(stage="base64_encode"):
+            return base64.b64encode(audio_data).decode('utf-8')
+    
+    def warm_up(self):
+        """
+        Synthesize a short phrase so the Piper binary and voice model are
+        loaded from disk (and kept in the page cache) before the first request.
+        
+        Raises:
+            RuntimeError: If Piper could not produce audio
+        """
+        if self.synthesize("Ready.") is None:
+            raise RuntimeError(f"Piper failed to synthesize with {self.model_path}")
+    
+    async def synthesize_async(self, text, ctx=None):
+        """
+        Async variant of synthesize() for use inside request handlers.
+        
+        Piper runs as a blocking subprocess, so synthesis is handed to the
+        default executor to keep the event loop free for other requests.
+        The TTS stage limit caps how many Piper processes run at once.
+        
+        Args:
+            text: The text to convert to speech
+            ctx: Optional GenerationContext to record stage timings on
+            
+        Returns:
+            WAV audio bytes, or None if error
+            
+        Raises:
+            OverloadedError: If the TTS stage queue is full or timed out
+        """
+        async with get_limiter("tts").slot():
+            return await asyncio.to_thread(self.synthesize, text, ctx)
+    
     def _raw_to_wav(self, raw_data):
         """Convert raw PCM data to WAV format."""
         with io.BytesIO() as wav_io:
@@ -169,4 +256,75 @@ class Mouth:
                 wf.setsampwidth(2)  # 16 bits
                 wf.setframerate(22050)  # 22.05 kHz
                 wf.writeframes(raw_data)
-            return wav_io.getvalue()
\ No newline at end of file
+            return wav_io.getvalue()
+
+
+def installed_voices(data_dir="data/models/piper") -> set:
+    """
+    List the Piper voices available on disk.
+    
+    Piper models are named "<locale>-<voice>-<quality>.onnx", e.g.
+    "en_US-cori-high.onnx", so the voice name is the middle part.
+    
+    Args:
+        data_dir: Directory containing Piper models
+        
+    Returns:
+        set: Voice names that can be passed to Mouth(model_name=...)
+    """
+    voices = set()
+    for model_file in Path(data_dir).glob("*.onnx"):
+        parts = model_file.stem.split("-")
+        voices.add(parts[1] if len(parts) >= 3 else model_file.stem)
+    return voices
+
+class VoicePool:
+    """Loaded Mouths keyed by voice, limited to installed voices and a fixed count."""
+    
+    def __init__(self, default: Mouth, max_voices=4):
+        """
+        Initialize the pool.
+        
+        Args:
+            default: Mouth for the default voice; it is never evicted
+            max_voices: Upper bound on loaded voices; least recently used go first
+        """
+        self.default = default
+        self.max_voices = max_voices
+        self._mouths = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, voice) -> Mouth:
+        """
+        Return the Mouth for a voice, loading it on first use.
+        
+        Args:
+            voice: Piper voice name (e.g. "cori", "alba")
+            
+        Returns:
+            Mouth: The loaded voice
+            
+        Raises:
+            FileNotFoundError: If no installed Piper model has that voice name
+        """
+        if voice == self.default.model_name:
+            return self.default
+        with self._lock:
+            if voice in self._mouths:
+                self._mouths.move_to_end(voice)
+                return self._mouths[voice]
+        if voice not in installed_voices(self.default.data_dir):
+            raise FileNotFoundError(f"No voice named '{voice}' in {self.default.data_dir}")
+        loaded = Mouth(model_name=voice, data_dir=self.default.data_dir)
+        with self._lock:
+            mouth = self._mouths.setdefault(voice, loaded)
+            self._mouths.move_to_end(voice)
+            # The default voice lives outside the dict, so it takes one place
+            while len(self._mouths) > max(self.max_voices - 1, 0):
+                evicted, _ = self._mouths.popitem(last=False)
+                logger.info(f"Unloaded voice {evicted}")
+        return mouth
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._mouths) + 1
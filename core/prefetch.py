@@ -0,0 +1,107 @@
+"""
+Speculative tool prefetch for AURA.
+For queries that clearly need weather, calendar events or the task list,
+predicts the tool call the model is about to request, so Brain can start
+it alongside the first model call. A prediction is only reused when the
+model asks for the same tool with the same arguments (after defaults).
+Only read-only tools are ever predicted.
+"""
+
+import inspect
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from core.tool_router import ToolRouter
+from core.tools import TOOL_FUNCTIONS
+
+# "weather in Bandung", "forecast for New York today?"
+_LOCATION = re.compile(
+    r"\b(?:in|for|at)\s+(?P<location>[a-z][a-z .'-]*?)"
+    r"(?:\s+(?:today|tomorrow|tonight|now|right now|this (?:morning|afternoon|evening|week)))?\s*[?.!]*$",
+    re.IGNORECASE
+)
+# Task queries that change tasks or filter them are left to the model
+_TASK_ACTION = re.compile(
+    r"\b(?:add|remind|remember|create|complete|completed|finish|finished|done|mark|delete|remove|update|"
+    r"change|high|medium|low|priority|pending|category|search|find)\b",
+    re.IGNORECASE
+)
+
+
+def _predict_weather(query: str) -> Optional[dict]:
+    match = _LOCATION.search(query)
+    if match is None:
+        return None
+    return {"location": match.group("location").strip()}
+
+
+def _predict_calendar(query: str) -> Optional[dict]:
+    # Mirrors the max_results guidance in Brain's system instruction
+    if re.search(r"\b(?:next|closest)\b", query, re.IGNORECASE):
+        return {"max_results": 1}
+    if re.search(r"\b(?:week|all)\b", query, re.IGNORECASE):
+        return {"max_results": 10}
+    return {"max_results": 5}
+
+
+def _predict_tasks(query: str) -> Optional[dict]:
+    if _TASK_ACTION.search(query):
+        return None
+    return {}
+
+
+# Tool group -> (read-only tool, predictor of its arguments from the query)
+PREFETCH_RULES: Dict[str, Tuple[str, Callable[[str], Optional[dict]]]] = {
+    "weather": ("get_weather", _predict_weather),
+    "calendar": ("get_calendar_events", _predict_calendar),
+    "todo": ("get_tasks", _predict_tasks),
+}
+
+
+def call_key(name: str, args: Optional[dict]) -> Optional[tuple]:
+    """
+    Comparable form of a tool call: its name and arguments with defaults
+    filled in and strings lowercased, or None if the arguments don't fit.
+    """
+    func = TOOL_FUNCTIONS.get(name)
+    if func is None:
+        return None
+    try:
+        bound = inspect.signature(func).bind(**(args or {}))
+    except TypeError:
+        return None
+    bound.apply_defaults()
+    normalized = {}
+    for key, value in bound.arguments.items():
+        if isinstance(value, str):
+            value = value.strip().lower()
+        elif isinstance(value, float) and value.is_integer():
+            # Model arguments arrive as JSON numbers (1.0 for 1)
+            value = int(value)
+        normalized[key] = value
+    key = name, tuple(sorted(normalized.items()))
+    try:
+        hash(key)
+    except TypeError:
+        # List or object arguments; never predicted, so never a match
+        return None
+    return key
+
+
+def predict_calls(query: str) -> List[types.FunctionCall]:
+    """
+    Tool calls the model will very likely make for this query.
+
+    Only queries matching exactly one prefetchable tool group are
+    predicted; anything ambiguous is left to the model.
+    """
+    groups = ToolRouter.matched_groups(query) & set(PREFETCH_RULES)
+    if len(groups) != 1:
+        return []
+    name, predict = PREFETCH_RULES[groups.pop()]
+    args = predict(query)
+    if args is None:
+        return []
+    return [types.FunctionCall(name=name, args=args)]
@@ -0,0 +1,124 @@
+"""
+Gemini context caching for AURA's static prompt prefix.
+The system instruction and tool declarations are identical on every call,
+so they are uploaded once as cached content and referenced by name,
+instead of being resent (and billed in full) twice per request.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from google.genai import types
+
+from core.logger import get_logger
+from core.metrics import LLM_CACHED_TOKENS, LLM_PROMPT_TOKENS, PROMPT_CACHE_EVENTS
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    name: str
+    refresh_at: float
+
+
+class PromptCache:
+    """Creates, refreshes and hands out cached-content names per prompt prefix."""
+
+    def __init__(self, enabled: bool = True, ttl_seconds: int = 3600, retry_after: float = 600.0):
+        """
+        Args:
+            enabled: If False, get() always returns None (full prompt is sent)
+            ttl_seconds: Lifetime of each cache on the Gemini side
+            retry_after: Seconds to wait before retrying after caching failed
+                (e.g. prefix below the model's minimum cacheable size)
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.retry_after = retry_after
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._unavailable_until: Dict[str, float] = {}
+        # One lock per prefix: a slow create only holds up requests for the
+        # same model and tool selection
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def key(model: str, system_instruction: str, tool: types.Tool) -> str:
+        """Fingerprint of a prefix; any change to the prompt or declarations gives a new key."""
+        digest = hashlib.sha256()
+        for part in (model, system_instruction, tool.model_dump_json(exclude_none=True)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, client, model: str, system_instruction: str, tool: types.Tool) -> Optional[str]:
+        """
+        Return the cached-content name for this prefix, creating it if needed.
+
+        A cache is recreated shortly before its TTL runs out; the old one is
+        left to expire so in-flight requests can finish with it.
+
+        Args:
+            client: genai.Client used to create the cache
+            model: Model the cache is created for
+            system_instruction: Static system prompt
+            tool: Tool holding the function declarations
+
+        Returns:
+            The cache name, or None if caching is disabled or unavailable
+        """
+        if not self.enabled:
+            return None
+        key = self.key(model, system_instruction, tool)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry.refresh_at:
+            return entry.name
+        if time.monotonic() < self._unavailable_until.get(key, 0.0):
+            return None
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            # Another request may have created it while we waited
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and now < entry.refresh_at:
+                return entry.name
+            try:
+                cached = await client.aio.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"aura-prefix-{key[:12]}",
+                        system_instruction=system_instruction,
+                        tools=[tool],
+                        ttl=f"{self.ttl_seconds}s"
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Prompt caching unavailable, sending full prompt for {self.retry_after:.0f}s: {e}")
+                PROMPT_CACHE_EVENTS.inc(event="unavailable")
+                self._unavailable_until[key] = now + self.retry_after
+                return None
+
+            margin = min(60.0, self.ttl_seconds / 10)
+            self._entries[key] = _CacheEntry(name=cached.name, refresh_at=now + self.ttl_seconds - margin)
+            PROMPT_CACHE_EVENTS.inc(event="refreshed" if entry is not None else "created")
+            tokens = cached.usage_metadata.total_token_count if cached.usage_metadata else None
+            logger.info(f"Created prompt cache {cached.name} ({tokens} tokens)")
+            return cached.name
+
+    def invalidate(self, name: str):
+        """Forget a cache the API rejected (deleted or expired early)."""
+        for key, entry in list(self._entries.items()):
+            if entry.name == name:
+                del self._entries[key]
+        PROMPT_CACHE_EVENTS.inc(event="invalidated")
+
+    @staticmethod
+    def record_usage(usage: Optional[types.GenerateContentResponseUsageMetadata]):
+        """Count prompt tokens and how many of them were served from the cache."""
+        if usage is None:
+            return
+        LLM_PROMPT_TOKENS.inc(usage.prompt_token_count or 0)
+        LLM_CACHED_TOKENS.inc(usage.cached_content_token_count or 0)
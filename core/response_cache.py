@@ -0,0 +1,254 @@
+"""
+Local response cache for AURA.
+Recognizes repeated and near-identical questions ("what is the capital of
+France" / "what's the capital of France, Aura?") with MinHash over hashed
+word n-grams, and returns the earlier reply's text, HUD and audio without
+calling Gemini or Piper again. Numbers and names must match exactly, so
+"the president of France" never answers "the president of Germany".
+Replies that used time-sensitive or state-changing tools are never stored,
+and search replies expire quickly (see TOOL_FRESHNESS). Within a
+conversation only standalone questions are cached: a follow-up such as
+"and what about tomorrow?" means something else after every turn.
+"""
+
+import copy
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core.context import ToolCallRecord
+from core.intents import normalize
+from core.logger import get_logger
+from core.tools import TOOL_FRESHNESS, ToolResult
+
+logger = get_logger(__name__)
+
+# Freshness class of a reply that used no tools (small talk, general knowledge)
+NO_TOOL_FRESHNESS = "stable"
+
+# Mersenne prime for the MinHash permutations (hashes are 64-bit)
+_PRIME = (1 << 61) - 1
+
+# Capitalised words that are not entities (wake word, address, pronoun)
+_NOT_ENTITIES = {"aura", "sir", "i"}
+
+# Words that refer back to earlier turns ("turn it off", "another one",
+# "what about there?"); a query containing one depends on the conversation
+_REFERENCES = {
+    "it", "its", "that", "this", "these", "those", "there", "then", "they", "them", "their",
+    "he", "him", "his", "she", "her", "one", "ones", "another", "again", "also", "too",
+    "else", "more", "same", "previous", "last", "earlier", "above", "instead", "about"
+}
+# Openings of a follow-up ("and in Bandung?", "but tomorrow?", "so?")
+_FOLLOW_UP_OPENINGS = {"and", "but", "or", "so"}
+
+
+def _shingles(query: str) -> FrozenSet[int]:
+    """Hashed word unigrams and bigrams of the normalized query."""
+    words = normalize(query).split()
+    grams = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    return frozenset(
+        int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "big") % _PRIME
+        for gram in grams
+    )
+
+
+def _key_terms(query: str) -> FrozenSet[str]:
+    """
+    Numbers and capitalised names in the query (lowercased). Sentence-initial
+    words don't count, since they are capitalised anyway.
+    """
+    terms = set()
+    sentence_start = True
+    for token in re.findall(r"[\w'’.,-]+|[.!?]", query):
+        if token in ".!?":
+            sentence_start = True
+            continue
+        word = token.strip("'’.,-")
+        if any(char.isdigit() for char in word):
+            terms.add(word.replace(",", ""))
+        elif word[:1].isupper() and not sentence_start and word.lower() not in _NOT_ENTITIES:
+            terms.add(word.lower())
+        sentence_start = token.endswith((".", "!", "?"))
+    return frozenset(terms)
+
+
+def standalone(query: str) -> bool:
+    """
+    Whether a query means the same whatever was said before it, so a
+    cached reply can answer it in the middle of a conversation.
+    """
+    words = normalize(query).split()
+    return bool(words) and words[0] not in _FOLLOW_UP_OPENINGS and not _REFERENCES.intersection(words)
+
+
+def _failed(record: ToolCallRecord) -> bool:
+    """Whether a tool call failed or was cut short (its reply is not a complete answer)."""
+    result = record.result
+    if record.error:
+        return True
+    if isinstance(result, ToolResult):
+        return result.data is None or result.partial
+    return isinstance(result, dict) and result.get("success") is False
+
+
+def _jaccard(first: FrozenSet[int], second: FrozenSet[int]) -> float:
+    return len(first & second) / len(first | second)
+
+
+@dataclass
+class CachedResponse:
+    """A reply stored in the response cache"""
+    query: str
+    response: str
+    hud_sections: List[dict]
+    audio: Optional[bytes]
+    expires_at: float
+    shingles: FrozenSet[int] = frozenset()
+    signature: Tuple[int, ...] = ()
+    key_terms: FrozenSet[str] = frozenset()
+
+
+class ResponseCache:
+    """LRU cache of replies, looked up by query similarity."""
+
+    def __init__(self, max_entries: int = 256, similarity: float = 0.9, ttls: Optional[Dict[str, float]] = None,
+                 num_perm: int = 64, bands: int = 16):
+        """
+        Args:
+            max_entries: Upper bound on stored replies; least recently used are dropped first
+            similarity: Minimum word n-gram Jaccard similarity for a hit (numbers
+                and names must also match exactly)
+            ttls: Seconds a reply stays valid per freshness class; classes
+                  with 0 (or missing) are never stored
+            num_perm: MinHash signature length
+            bands: LSH bands the signature is split into (num_perm must be divisible by it)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.ttls = ttls if ttls is not None else {"stable": 3600, "recent": 300, "live": 0, "action": 0}
+        self.bands = bands
+        self._rows = num_perm // bands
+        rng = random.Random(1)
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._entries: "OrderedDict[int, CachedResponse]" = OrderedDict()
+        # (band index, band of the signature) -> ids of entries sharing it
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], set] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _signature(self, shingles: FrozenSet[int]) -> Tuple[int, ...]:
+        return tuple(min((a * value + b) % _PRIME for value in shingles) for a, b in self._permutations)
+
+    def _bands(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self._rows:(band + 1) * self._rows]
+
+    def freshness_ttl(self, tool_names: Iterable[str]) -> float:
+        """
+        Seconds a reply that used these tools may be reused (0 = never).
+
+        The strictest class wins; unknown tools count as "live".
+        """
+        classes = {TOOL_FRESHNESS.get(name, "live") for name in tool_names} or {NO_TOOL_FRESHNESS}
+        return min(self.ttls.get(freshness, 0) for freshness in classes)
+
+    def get(self, query: str) -> Optional[CachedResponse]:
+        """
+        Return a copy of the closest reply to a near-identical query, or None.
+
+        Candidates come from the LSH buckets of the query's MinHash
+        signature, and are confirmed with the exact n-gram similarity.
+        """
+        shingles = _shingles(query)
+        if not shingles:
+            return None
+        signature = self._signature(shingles)
+        key_terms = _key_terms(query)
+        with self._lock:
+            self._evict(time.monotonic())
+            candidates = set()
+            for key in self._bands(signature):
+                candidates |= self._buckets.get(key, set())
+            best_id, best_score = None, self.similarity
+            for entry_id in candidates:
+                if self._entries[entry_id].key_terms != key_terms:
+                    continue
+                score = _jaccard(shingles, self._entries[entry_id].shingles)
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                return None
+            self._entries.move_to_end(best_id)
+            entry = self._entries[best_id]
+        logger.debug(f"Response cache hit for '{query[:50]}' (matched '{entry.query[:50]}', {best_score:.2f})")
+        return copy.deepcopy(entry)
+
+    def put(self, query: str, response: str, hud_sections: List[dict], tool_results: List[ToolCallRecord],
+            audio: Optional[bytes] = None) -> bool:
+        """
+        Store a reply, unless the tools it used make it too time-sensitive.
+
+        Args:
+            query: The user's query
+            response: Reply text
+            hud_sections: HUD sections shown with the reply
+            tool_results: Tool calls made to produce the reply (ctx.tool_results)
+            audio: Synthesized WAV of the reply, if any
+
+        Returns:
+            bool: True if the reply was stored
+        """
+        if not response or any(_failed(record) for record in tool_results):
+            return False
+        ttl = self.freshness_ttl(record.name for record in tool_results)
+        shingles = _shingles(query)
+        if ttl <= 0 or not shingles:
+            return False
+        signature = self._signature(shingles)
+        now = time.monotonic()
+        entry = CachedResponse(
+            query=query,
+            response=response,
+            hud_sections=copy.deepcopy(hud_sections),
+            audio=audio,
+            expires_at=now + ttl,
+            shingles=shingles,
+            signature=signature,
+            key_terms=_key_terms(query)
+        )
+        with self._lock:
+            self._evict(now)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            for key in self._bands(signature):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        for key in self._bands(entry.signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _evict(self, now: float):
+        """Drop expired replies."""
+        for entry_id in [entry_id for entry_id, entry in self._entries.items() if entry.expires_at <= now]:
+            self._remove(entry_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
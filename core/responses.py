@@ -0,0 +1,118 @@
+"""
+Templated butler-style replies for AURA.
+Used when a tool's outcome can be reported without asking Gemini to
+phrase it: by the local intent fast path, and by Brain to skip the second
+model round for tools listed in responses.templated_tools.
+"""
+
+import re
+from typing import Any, Callable, Dict, Optional
+
+from core.tools import ToolResult
+
+
+def _failure(action: str, result: Any, error: Optional[str]) -> str:
+    """Reply for a tool call that raised or reported success=False."""
+    detail = error or (result.get("message") if isinstance(result, dict) else None)
+    reply = f"I'm afraid I couldn't {action}, Sir."
+    return f"{reply} {detail}" if detail else reply
+
+
+def _failed(result: Any, error: Optional[str]) -> bool:
+    return error is not None or (isinstance(result, dict) and result.get("success") is False)
+
+
+def _get_time(args: dict, result: Any, error: Optional[str]) -> str:
+    if error is not None:
+        return _failure("check the time", result, error)
+    return f"It is {result}, Sir."
+
+
+def _turn_on_light(args: dict, result: Any, error: Optional[str]) -> str:
+    if _failed(result, error):
+        return _failure("turn on the light", result, error)
+    return "The light is on, Sir."
+
+
+def _turn_off_light(args: dict, result: Any, error: Optional[str]) -> str:
+    if _failed(result, error):
+        return _failure("turn off the light", result, error)
+    return "The light is off, Sir."
+
+
+def _set_brightness(args: dict, result: Any, error: Optional[str]) -> str:
+    if _failed(result, error):
+        return _failure("adjust the brightness", result, error)
+    brightness = result.get("brightness", args.get("brightness", 0))
+    return f"Brightness set to {round(brightness * 100 / 255)} percent, Sir."
+
+
+def _set_scene(args: dict, result: Any, error: Optional[str]) -> str:
+    if _failed(result, error):
+        return _failure("set that scene", result, error)
+    return f"The light is set to {result.get('scene_name', 'the requested scene')}, Sir."
+
+
+def _add_task(args: dict, result: Any, error: Optional[str]) -> str:
+    text = str(result or "")
+    # "Task added: 'Title' with high priority, due tomorrow."
+    added = re.match(r"Task added: ('.*?')(.*)\.$", text)
+    if error is not None or not added:
+        return _failure("add that task", None, error or text)
+    title, details = added.groups()
+    return f"I've added {title} to your list{details}, Sir."
+
+
+def _complete_task(args: dict, result: Any, error: Optional[str]) -> str:
+    text = str(result or "")
+    completed = re.match(r"Task completed: '(.*)'\.", text)
+    if completed:
+        return f"I've marked '{completed.group(1)}' as complete. Well done, Sir."
+    if error is None and text.endswith("not found."):
+        return f"I couldn't find a task called '{args.get('task_identifier', '')}', Sir."
+    return _failure("complete that task", None, error or text)
+
+
+def _get_tasks(args: dict, result: Any, error: Optional[str]) -> str:
+    text = str(result or "")
+    if error is not None or text.startswith("Failed"):
+        return _failure("retrieve your tasks", None, error)
+    found = re.match(r"You have (\d+) task", text)
+    if not found:
+        return "Your to-do list is empty, Sir."
+    count = int(found.group(1))
+    return f"You have {count} task{'s' if count != 1 else ''}, Sir. The full list is on your display."
+
+
+# Tool name -> reply builder(args, result, error)
+RESPONSE_TEMPLATES: Dict[str, Callable[[dict, Any, Optional[str]], str]] = {
+    "get_time": _get_time,
+    "turn_on_light": _turn_on_light,
+    "turn_off_light": _turn_off_light,
+    "set_brightness": _set_brightness,
+    "set_scene": _set_scene,
+    "get_tasks": _get_tasks,
+    "add_task": _add_task,
+    "complete_task": _complete_task,
+}
+
+
+def render_reply(tool_name: str, args: dict, result: Any, error: Optional[str] = None) -> Optional[str]:
+    """
+    Render the templated reply for a finished tool call.
+
+    Args:
+        tool_name: Name of the tool that ran
+        args: Arguments it was called with
+        result: What it returned (None if it raised)
+        error: Exception message if it raised
+
+    Returns:
+        The reply text, or None if the tool has no template
+    """
+    template = RESPONSE_TEMPLATES.get(tool_name)
+    if template is None:
+        return None
+    if isinstance(result, ToolResult):
+        result = result.text
+    return template(args, result, error)
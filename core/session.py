@@ -0,0 +1,124 @@
+"""
+Conversation sessions for AURA.
+A session carries the user's identity, voice settings and conversation
+memory across turns, over a WebSocket or repeated HTTP requests.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from google.genai import types
+
+from core.logger import get_logger
+from core.memory import ConversationMemory
+from settings.config_loader import config
+
+logger = get_logger(__name__)
+
+
+def _new_memory() -> ConversationMemory:
+    """Conversation memory sized from the 'memory' config section."""
+    return ConversationMemory(
+        token_budget=config.get('memory.token_budget', 2000),
+        summary_budget=config.get('memory.summary_budget', 500),
+        min_recent_turns=config.get('memory.min_recent_turns', 2)
+    )
+
+
+@dataclass
+class Session:
+    """State kept for one conversation"""
+    session_id: str = field(default_factory=lambda: secrets.token_urlsafe(12))
+    user: Optional[str] = None
+    voice: str = "cori"
+    memory: ConversationMemory = field(default_factory=_new_memory)
+
+    @property
+    def history(self) -> List[types.Content]:
+        """Conversation so far, within the memory's token budget."""
+        return self.memory.to_contents()
+
+    def record_turn(self, query: str, response: Optional[str]):
+        """
+        Add a completed user/model exchange to the conversation memory.
+
+        Only the visible text is kept (not tool calls); older turns are
+        compacted into a summary as the token budget fills up. A turn the
+        model ended without any text (response None) is not recorded.
+        """
+        if response is None:
+            logger.debug(f"Session {self.session_id}: reply had no text, turn not recorded")
+            return
+        self.memory.record_turn(query, response)
+
+    def to_dict(self) -> dict:
+        """Public session settings, as sent to the client."""
+        return {
+            "session_id": self.session_id,
+            "user": self.user,
+            "voice": self.voice,
+            "turns": self.memory.turn_count
+        }
+
+
+class SessionStore:
+    """Sessions addressable by ID, dropped after a period of inactivity."""
+
+    def __init__(self, ttl_seconds: float = 3600, max_sessions: int = 1000):
+        """
+        Args:
+            ttl_seconds: Idle time after which a session is forgotten
+            max_sessions: Upper bound on stored sessions; least recently used go first
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, **settings) -> Session:
+        """Start a new session (settings are passed to Session)."""
+        session = Session(**settings)
+        with self._lock:
+            self._store(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Return a live session and refresh its idle timer, or None."""
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._store(entry[1])
+            return entry[1]
+
+    def get_or_create(self, session_id: Optional[str], **settings) -> Session:
+        """Resume session_id if it is still live, otherwise start a new session."""
+        session = self.get(session_id) if session_id else None
+        if session is None:
+            session = self.create(**settings)
+            logger.debug(f"Started session {session.session_id}")
+        return session
+
+    def _store(self, session: Session):
+        """(Re)insert as most recently used; caller holds the lock."""
+        self._sessions.pop(session.session_id, None)
+        self._sessions[session.session_id] = (time.monotonic() + self.ttl_seconds, session)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _evict(self, now: float):
+        """Drop idle sessions (insertion order equals expiry order)."""
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[session_id]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
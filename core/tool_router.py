@@ -0,0 +1,108 @@
+"""
+Query-aware tool selection for AURA.
+Picks the tool groups a query is likely to need (see TOOL_GROUPS) from
+keywords and two-word phrases, so each model request carries only those
+declarations instead of all of them. Runs locally, with no network call.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+from core.tools import TOOL_GROUPS
+
+# Words and two-word phrases that point at each tool group
+GROUP_KEYWORDS: Dict[str, Set[str]] = {
+    "weather": {
+        "weather", "forecast", "temperature", "rain", "raining", "rainy", "umbrella", "sunny", "cloudy",
+        "cloud", "clouds", "storm", "stormy", "thunder", "snow", "snowing", "wind", "windy", "humid",
+        "humidity", "hot", "cold", "warm outside", "degrees", "celsius", "fahrenheit", "sunrise", "sunset",
+        "how warm", "how cold", "how hot"
+    },
+    "calendar": {
+        "calendar", "schedule", "scheduled", "meeting", "meetings", "event", "events", "appointment",
+        "appointments", "agenda", "busy", "plans", "what is next", "next up", "do i have"
+    },
+    "search": {
+        "search", "google", "look up", "lookup", "find out", "news", "latest", "who is", "who was",
+        "tell me about", "information", "info", "article", "articles", "tutorial", "tutorials", "course",
+        "courses", "recommend", "recommendation", "best", "compare", "research", "learn", "explain"
+    },
+    "lights": {
+        "light", "lights", "lamp", "lamps", "bulb", "brightness", "bright", "brighter", "dim", "dimmer",
+        "dark", "darker", "color", "colour", "scene", "party mode", "focus mode", "relax", "bedtime",
+        "warm white", "cool white", "daylight", "red", "blue", "green", "purple"
+    },
+    "todo": {
+        "task", "tasks", "todo", "to do", "list", "remind", "reminder", "remember to", "i need to",
+        "don't forget", "dont forget", "priority", "pending", "done", "finished", "complete", "completed",
+        "mark", "delete", "remove", "due"
+    },
+    "time": {
+        "time", "date", "day", "today", "clock", "o clock", "what day", "month", "year"
+    }
+}
+
+DEFAULT_ALWAYS_GROUPS = ["time"]
+DEFAULT_FALLBACK_GROUPS = ["search"]
+
+
+def _terms(text: str) -> Set[str]:
+    """Lowercased words and adjacent word pairs of a text."""
+    words = re.sub(r"[^\w\s]", " ", text.lower().replace("what's", "what is")).split()
+    return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+class ToolRouter:
+    """Keyword classifier that maps a query to the tool groups it needs."""
+
+    def __init__(self, always: Iterable[str] = DEFAULT_ALWAYS_GROUPS,
+                 fallback: Iterable[str] = DEFAULT_FALLBACK_GROUPS):
+        """
+        Args:
+            always: Groups sent with every request (cheap, commonly needed)
+            fallback: Groups added when no keyword matched, so open-ended
+                questions can still reach a tool
+        """
+        unknown = (set(always) | set(fallback)) - set(TOOL_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown tool groups: {sorted(unknown)}")
+        self.always = frozenset(always)
+        self.fallback = frozenset(fallback)
+
+    @staticmethod
+    def matched_groups(text: str) -> Set[str]:
+        """Groups whose keywords appear in the text."""
+        terms = _terms(text)
+        return {group for group, keywords in GROUP_KEYWORDS.items() if terms & keywords}
+
+    def select(self, query: str, previous_query: str = "") -> FrozenSet[str]:
+        """
+        Pick the tool groups for a query.
+
+        The previous user turn is classified too, so follow-ups such as
+        "and in Bandung?" keep the tools of the question they refer to. A
+        follow-up that matches nothing and whose previous turn matched
+        nothing either ("turn it off" after "I can't see a thing")
+        gets every group, since what it refers to can't be told.
+
+        Args:
+            query: The user's query
+            previous_query: The user's previous turn in the session, if any
+
+        Returns:
+            frozenset: Selected group names (always includes the always set)
+        """
+        groups = self.matched_groups(query) | self.matched_groups(previous_query)
+        if not groups:
+            groups = set(TOOL_GROUPS) if previous_query else set(self.fallback)
+        return frozenset(groups | self.always)
+
+    @staticmethod
+    def declarations(groups: Iterable[str]) -> List[dict]:
+        """Function declarations of the given groups, in TOOL_GROUPS order."""
+        selected = set(groups)
+        return [
+            declaration
+            for group, declarations in TOOL_GROUPS.items() if group in selected
+            for declaration in declarations
+        ]
@@ -3,10 +3,11 @@ Tools package for AURA AI Assistant.
 Each tool module contains function declarations and implementations.
 """
 
-from .calendar_tool import get_calendar_events, calendar_declaration
-from .weather_tool import get_weather, get_weather_data, weather_declaration
-from .time_tool import get_time, get_date, time_declaration, date_declaration
-from .search_tool import search_web, get_search_results_data, search_declaration
+from .tool_result import ToolResult
+from .calendar_tool import get_calendar_events, get_calendar_events_result, calendar_declaration, calendar_hud
+from .weather_tool import get_weather, get_weather_result, get_weather_data, weather_declaration, weather_hud
+from .time_tool import get_time, get_date, time_declaration, date_declaration, time_hud
+from .search_tool import search_web, search_web_result, get_search_results_data, search_declaration, search_hud
 
 # Import Smart Light tools
 from .light_tool import (
@@ -18,6 +19,13 @@ from .light_tool import (
     set_color,
     set_scene,
     discover_lights,
+    turn_on_light_async,
+    turn_off_light_async,
+    get_light_state_async,
+    set_brightness_async,
+    set_color_async,
+    set_scene_async,
+    discover_lights_async,
     light_controller
 )
 
@@ -30,7 +38,8 @@ from core.apps.todo import (
     delete_task,
     complete_task,
     search_tasks,
-    get_tasks_data
+    get_tasks_data,
+    tasks_hud
 )
 
 # Export all tool declarations for easy import
@@ -44,14 +53,16 @@ TOOL_DECLARATIONS = [
     *todo_declarations  # Unpack all 6 to-do tool declarations
 ]
 
-# Export all callable functions
+# Export all callable functions. Tools backed by external services return a
+# ToolResult, so the Brain can build the HUD from the data the tool already
+# fetched instead of calling the service again.
 TOOL_FUNCTIONS = {
-    "get_calendar_events": get_calendar_events,
-    "get_weather": get_weather,
+    "get_calendar_events": get_calendar_events_result,
+    "get_weather": get_weather_result,
     "get_weather_data": get_weather_data,
     "get_time": get_time,
     "get_date": get_date,
-    "search_web": search_web,
+    "search_web": search_web_result,
     # Smart Light functions
     "turn_on_light": turn_on_light,
     "turn_off_light": turn_off_light,
@@ -69,13 +80,103 @@ TOOL_FUNCTIONS = {
     "search_tasks": search_tasks
 }
 
+# HUD renderers: tool name -> function(args, result) returning HUD sections.
+# They build from the result the tool already returned and run in a worker
+# thread while the model writes its reply; tools without one show no HUD.
+# A new tool registers its renderer here alongside its declaration.
+HUD_RENDERERS = {
+    "get_weather": weather_hud,
+    "get_calendar_events": calendar_hud,
+    "search_web": search_hud,
+    "get_time": time_hud,
+    "get_date": time_hud,
+    "get_tasks": tasks_hud,
+    "search_tasks": tasks_hud,
+    "add_task": tasks_hud,
+    "update_task": tasks_hud,
+    "complete_task": tasks_hud
+}
+
+# Native coroutine implementations, awaited directly by the async Brain
+# instead of going through the blocking _run_async wrappers
+ASYNC_TOOL_FUNCTIONS = {
+    "turn_on_light": turn_on_light_async,
+    "turn_off_light": turn_off_light_async,
+    "get_light_state": get_light_state_async,
+    "set_brightness": set_brightness_async,
+    "set_color": set_color_async,
+    "set_scene": set_scene_async,
+    "discover_lights": discover_lights_async
+}
+
+# Tools that act on shared state. Calls on the same resource within one
+# model turn run in the order the model requested them (e.g. add_task then
+# complete_task); all other calls run concurrently.
+TOOL_RESOURCES = {
+    "turn_on_light": "lights",
+    "turn_off_light": "lights",
+    "get_light_state": "lights",
+    "set_brightness": "lights",
+    "set_color": "lights",
+    "set_scene": "lights",
+    "discover_lights": "lights",
+    "add_task": "todo",
+    "get_tasks": "todo",
+    "update_task": "todo",
+    "delete_task": "todo",
+    "complete_task": "todo",
+    "search_tasks": "todo"
+}
+
+# How long a reply that used each tool stays valid in the response cache
+# (see core/response_cache.py): "stable" results may be reused, "recent"
+# results (web search, whose news goes stale) only for a few minutes, "live"
+# results (clock, weather, calendar, task list, light state) must be fetched
+# every time, and "action" tools change something and must always run.
+# Tools missing from this map are treated as "live".
+TOOL_FRESHNESS = {
+    "get_calendar_events": "live",
+    "get_weather": "live",
+    "get_time": "live",
+    "get_date": "live",
+    "search_web": "recent",
+    "turn_on_light": "action",
+    "turn_off_light": "action",
+    "get_light_state": "live",
+    "set_brightness": "action",
+    "set_color": "action",
+    "set_scene": "action",
+    "discover_lights": "live",
+    "add_task": "action",
+    "get_tasks": "live",
+    "update_task": "action",
+    "delete_task": "action",
+    "complete_task": "action",
+    "search_tasks": "live"
+}
+
+# Declarations grouped by capability. The Brain sends only the groups a
+# query needs (see core/tool_router.py) instead of all 18 declarations.
+TOOL_GROUPS = {
+    "weather": [weather_declaration],
+    "calendar": [calendar_declaration],
+    "search": [search_declaration],
+    "lights": list(light_declarations),
+    "todo": list(todo_declarations),
+    "time": [time_declaration, date_declaration]
+}
+
 __all__ = [
+    "ToolResult",
     "get_calendar_events",
+    "get_calendar_events_result",
     "get_weather",
+    "get_weather_result",
     "get_weather_data",
     "get_time",
     "get_date",
     "search_web",
+    "search_web_result",
     "get_search_results_data",
     # Smart Light exports
     "turn_on_light",
@@ -95,5 +196,10 @@ __all__ = [
     "search_tasks",
     "get_tasks_data",
     "TOOL_DECLARATIONS",
-    "TOOL_FUNCTIONS"
+    "TOOL_FUNCTIONS",
+    "HUD_RENDERERS",
+    "ASYNC_TOOL_FUNCTIONS",
+    "TOOL_RESOURCES",
+    "TOOL_FRESHNESS",
+    "TOOL_GROUPS"
 ]
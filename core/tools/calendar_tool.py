@@ -7,10 +7,19 @@ import os
 import pytz
 from datetime import datetime
 
+from core.deadline import http_timeout
+from core.logger import get_logger
+
+from .tool_result import ToolResult
+
+logger = get_logger(__name__)
+
 # Google Calendar API configuration
 CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 TOKEN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "settings", "token.json")
 CREDENTIALS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "settings", "credentials.json")
+# Socket timeout for Calendar API calls (cut to the request's remaining budget)
+CALENDAR_TIMEOUT = 10
 
 # Function declaration for Gemini API (following Google's schema)
 calendar_declaration = {
@@ -27,6 +36,9 @@ calendar_declaration = {
         "required": []
     }
 }
+# Credentials are loaded (and refreshed) once and reused until they expire,
+# instead of re-reading token.json and refreshing on every call
+_credentials = None
 
 def _get_calendar_service():
     """Create and return service object for interacting with Google Calendar API.
@@ -34,14 +46,17 @@ def _get_calendar_service():
     Note: Imports are kept inside the function to avoid exposing complex library 
     functions to Gemini's function introspection, which can cause parsing errors.
     """
+    global _credentials
     try:
+        import httplib2
         from google.auth.transport.requests import Request
         from google.oauth2.credentials import Credentials
+        from google_auth_httplib2 import AuthorizedHttp
         from google_auth_oauthlib.flow import InstalledAppFlow
         from googleapiclient.discovery import build
         
-        creds = None
-        if os.path.exists(TOKEN_PATH):
+        creds = _credentials
+        if creds is None and os.path.exists(TOKEN_PATH):
             creds = Credentials.from_authorized_user_file(TOKEN_PATH, CALENDAR_SCOPES)
         
         # If there are no valid credentials, let the user log in
@@ -57,10 +72,28 @@ def _get_calendar_service():
             with open(TOKEN_PATH, "w") as token:
                 token.write(creds.to_json())
         
-        return build("calendar", "v3", credentials=creds)
+        _credentials = creds
+        # httplib2 has no timeout by default, so a stalled API call would
+        # hang the request; bound it by the request's latency budget
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=http_timeout(CALENDAR_TIMEOUT)))
+        return build("calendar", "v3", http=http)
     except Exception as e:
         raise Exception(f"Failed to initialize calendar service: {str(e)}")
 
+def warm_up_calendar_service() -> bool:
+    """Load the client library, credentials and discovery document ahead of the first request.
+    
+    Skipped when no token.json exists, since authorizing would open a
+    browser login flow during startup.
+    
+    Returns:
+        True if the service was built, False if warm-up was skipped
+    """
+    if not os.path.exists(TOKEN_PATH):
+        return False
+    _get_calendar_service()
+    return True
+
 def get_calendar_events(max_results: int = 5) -> str:
     """Get upcoming events from Google Calendar in Indonesia timezone.
     
@@ -70,58 +103,86 @@ def get_calendar_events(max_results: int = 5) -> str:
     Returns:
         A formatted string containing upcoming calendar events in Indonesia time (WIB)
     """
-    try:
-        service = _get_calendar_service()
-        
-        # Use Indonesia timezone (WIB - Western Indonesia Time)
-        wib = pytz.timezone('Asia/Jakarta')
-        now = datetime.now(wib).isoformat()
+    return get_calendar_events_result(max_results).text
+
+def get_calendar_events_result(max_results: int = 5) -> ToolResult:
+    """Fetch upcoming events once and return them both as text and as HUD data.
+    
+    Args:
+        max_results: Maximum number of events to retrieve (default: 5)
         
-        events_result = (
-            service.events()
-            .list(
-                calendarId="primary",
-                timeMin=now,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
-        )
-        events = events_result.get("items", [])
+    Returns:
+        ToolResult with the formatted event list and the get_calendar_events_data() dict
+    """
+    data = get_calendar_events_data(max_results)
+    if "error" in data:
+        return ToolResult(text=data["message"])
+    
+    # Format output for easy reading
+    output = "Upcoming Events:\n"
+    for event in data["events"]:
+        # Remove emoji and special characters from event title
+        event_title = ''.join(char for char in event["event"] if ord(char) < 0x10000 and not (0xD800 <= ord(char) <= 0xDFFF))
+        event_title = event_title.encode('ascii', errors='ignore').decode('ascii').strip()
         
-        if not events:
-            return "No upcoming events found in your calendar."
+        if event["is_all_day"]:
+            start_str = f"{event['date']} (All day)"
+        else:
+            start_str = f"{event['date']} at {event['time']}"
         
-        # Format output for easy reading
-        output = "Upcoming Events:\n"
-        for event in events:
-            start = event["start"].get("dateTime", event["start"].get("date"))
-            event_title = event.get('summary', 'Untitled Event')
-            
-            # Remove emoji and special characters from event title
-            event_title = ''.join(char for char in event_title if ord(char) < 0x10000 and not (0xD800 <= ord(char) <= 0xDFFF))
-            event_title = event_title.encode('ascii', errors='ignore').decode('ascii').strip()
-            
-            # Format datetime for display in Indonesia timezone
-            if "T" in start:  # dateTime format
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                # Convert to Indonesia timezone
-                start_wib = start_dt.astimezone(wib)
-                start_str = start_wib.strftime("%A, %B %d, %Y at %I:%M %p WIB")
-            else:  # date format (all-day event)
-                start_dt = datetime.fromisoformat(start)
-                start_str = start_dt.strftime("%A, %B %d, %Y (All day)")
-            
-            output += f"{start_str}, {event_title}\n"
+        output += f"{start_str}, {event_title}\n"
+    
+    return ToolResult(text=output, data=data)
+
+def calendar_hud(args: dict, result) -> list:
+    """HUD renderer for get_calendar_events: a table of events, the next one highlighted.
+    
+    Falls back to the tool's text when the event data can't be tabulated.
+    
+    Args:
+        args: Arguments the tool was called with
+        result: The tool's ToolResult (no sections if the call failed)
         
-        return output
-    except FileNotFoundError:
-        return "Google Calendar credentials not found. Please set up credentials.json in the settings folder."
-    except ImportError as e:
-        return f"Missing required library: {str(e)}. Please run: pip install -r requirements.txt"
-    except Exception as e:
-        return f"Error accessing Google Calendar: {str(e)}"
+    Returns:
+        list: HUD sections
+    """
+    calendar_data = result.data if isinstance(result, ToolResult) else None
+    if calendar_data is None:
+        return []
+    
+    try:
+        table_rows = []
+        for index, event in enumerate(calendar_data['events']):
+            row_data = {
+                "Date": event['date'],
+                "Time": event['time'],
+                "Event": event['event']
+            }
+            # Mark the first event (next/closest) as highlighted
+            if index == 0:
+                row_data["_highlight"] = True
+            table_rows.append(row_data)
+    except (KeyError, TypeError) as e:
+        logger.error(f"Error processing calendar HUD data: {e}")
+        # Fallback to text display
+        if "No upcoming events" in str(result):
+            return []
+        return [{
+            "title": "Upcoming Events",
+            "type": "text",
+            "data": {
+                "text": str(result)
+            }
+        }]
+    
+    return [{
+        "title": "Upcoming Events",
+        "type": "table",
+        "data": {
+            "headers": ["Date", "Time", "Event"],
+            "rows": table_rows
+        }
+    }]
 
 def get_calendar_events_data(max_results: int = 5) -> dict:
     """Get structured calendar events data for HUD display.
@@ -4,7 +4,7 @@ Controls WiZ smart lights using pywizlight library
 """
 
 import asyncio
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from pywizlight import wizlight, PilotBuilder, discovery, SCENES
 import sys
 
@@ -80,16 +80,31 @@ async def discover_lights_async(broadcast: str = "192.168.0.255") -> List[Dict[s
         return []
 
 
+def _parse_rgb(rgb: str) -> Optional[Tuple[int, int, int]]:
+    """Parse an "r,g,b" string into an RGB tuple, or None if malformed"""
+    try:
+        parts = rgb.split(',')
+        return (int(parts[0]), int(parts[1]), int(parts[2]))
+    except:
+        return None
+
+
 async def turn_on_light_async(
     light_name: Optional[str] = None,
     brightness: Optional[int] = None,
-    rgb: Optional[Tuple[int, int, int]] = None,
+    rgb: Optional[Union[str, Tuple[int, int, int]]] = None,
     color_temp: Optional[int] = None,
     scene: Optional[int] = None,
     warm_white: Optional[int] = None,
     cold_white: Optional[int] = None
 ) -> Dict[str, Any]:
     """Turn on a light with optional parameters"""
+    # Accept the "r,g,b" string form used by the AI tool declaration
+    if isinstance(rgb, str):
+        rgb = _parse_rgb(rgb)
+        if rgb is None:
+            return {"success": False, "message": "Invalid RGB format. Use 'r,g,b' (e.g., '255,0,0')"}
+    
     try:
         light = light_controller.get_light(light_name)
         
@@ -308,10 +323,8 @@ def turn_on_light(
     # Parse RGB if provided
     rgb_tuple = None
     if rgb:
-        try:
-            parts = rgb.split(',')
-            rgb_tuple = (int(parts[0]), int(parts[1]), int(parts[2]))
-        except:
+        rgb_tuple = _parse_rgb(rgb)
+        if rgb_tuple is None:
             return {"success": False, "message": "Invalid RGB format. Use 'r,g,b' (e.g., '255,0,0')"}
     
     return _run_async(turn_on_light_async(light_name, brightness, rgb_tuple, color_temp, scene))
@@ -556,6 +569,13 @@ __all__ = [
     'set_color',
     'set_scene',
     'discover_lights',
+    'turn_on_light_async',
+    'turn_off_light_async',
+    'get_light_state_async',
+    'set_brightness_async',
+    'set_color_async',
+    'set_scene_async',
+    'discover_lights_async',
     'light_declarations',
     'light_controller'
 ]
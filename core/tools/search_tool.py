@@ -5,10 +5,17 @@ Provides web search capabilities using SearXNG API with article content fetching
 
 import requests
 from bs4 import BeautifulSoup
+from core.deadline import http_timeout, tool_remaining
 from core.logger import get_logger
 
+from .tool_result import ToolResult
+
 logger = get_logger(__name__)
 
+# Articles are only fetched while the tool call has at least this much of
+# its time budget left; the rest are reported as unread
+ARTICLE_MIN_SECONDS = 1.0
+
 def _fetch_article_content(url: str, max_length: int = 2000) -> str:
     """Fetch and extract main content from a URL.
     
@@ -23,7 +30,7 @@ def _fetch_article_content(url: str, max_length: int = 2000) -> str:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=5)
+        response = requests.get(url, headers=headers, timeout=http_timeout(5))
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -91,76 +98,74 @@ def search_web(query: str, max_results: int = 3, fetch_content: bool = True) ->
     Returns:
         A formatted string containing search results with titles, URLs, snippets, and optionally full content
     """
-    try:
-        logger.info(f"Searching web for: {query} (fetch_content={fetch_content})")
-        
-        # SearXNG API endpoint
-        searxng_url = "http://localhost:8888/search"
+    return search_web_result(query, max_results, fetch_content).text
+
+def search_web_result(query: str, max_results: int = 3, fetch_content: bool = True) -> ToolResult:
+    """Run one search and return the results both as text and as HUD data.
+    
+    Args:
+        query: The search query string
+        max_results: Maximum number of results to return (default: 3)
+        fetch_content: Whether to fetch full article content (default: True)
         
-        # Request parameters
-        params = {
-            'q': query,
-            'format': 'json',
-            'language': 'en',
-            'safesearch': 1,  # Moderate safe search
-        }
+    Returns:
+        ToolResult with the formatted results and the get_search_results_data() dict
+    """
+    data = get_search_results_data(query, max_results, fetch_content)
+    if "error" in data:
+        return ToolResult(text=data["message"])
+    
+    # Format output
+    output = f"Search Results for '{query}':\n\n"
+    
+    for i, result in enumerate(data["results"], 1):
+        snippet = result["snippet"]
+        if len(snippet) > 150:
+            snippet = snippet[:150] + '...'
         
-        response = requests.get(searxng_url, params=params, timeout=10)
+        output += f"{i}. {result['title']}\n"
+        output += f"   Summary: {snippet}\n"
+        output += f"   URL: {result['url']}\n"
+        if "content" in result:
+            output += f"   Content: {result['content']}\n"
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            
-            if not results:
-                return f"No search results found for '{query}'."
-            
-            # Limit results
-            results = results[:max_results]
-            
-            # Format output
-            output = f"Search Results for '{query}':\n\n"
-            
-            for i, result in enumerate(results, 1):
-                title = result.get('title', 'No title')
-                url = result.get('url', '')
-                snippet = result.get('content', result.get('snippet', 'No description available'))
-                
-                # Clean up snippet
-                snippet = ' '.join(snippet.split())
-                if len(snippet) > 150:
-                    snippet = snippet[:150] + '...'
-                
-                output += f"{i}. {title}\n"
-                output += f"   Summary: {snippet}\n"
-                output += f"   URL: {url}\n"
-                
-                # Fetch full article content if requested
-                if fetch_content:
-                    logger.info(f"Fetching content from: {url}")
-                    article_content = _fetch_article_content(url, max_length=2000)
-                    output += f"   Content: {article_content}\n"
-                
-                output += "\n"
-            
-            logger.info(f"Found {len(results)} search results (fetch_content={fetch_content})")
-            return output.strip()
+        output += "\n"
+    
+    if data["unread"]:
+        output += (
+            f"Note: these articles could not be read within the response time budget, "
+            f"so only their summaries are available: {', '.join(data['unread'])}\n"
+        )
+    
+    return ToolResult(text=output.strip(), data=data, partial=bool(data["unread"]))
+
+def search_hud(args: dict, result) -> list:
+    """HUD renderer for search_web: the results as a list of links.
+    
+    Args:
+        args: Arguments the tool was called with
+        result: The tool's ToolResult (no sections if the call failed)
         
-        elif response.status_code == 404:
-            return "SearXNG service not found. Please ensure SearXNG is running at http://localhost:8888"
-        else:
-            return f"Search service returned error code: {response.status_code}"
-            
-    except requests.exceptions.ConnectionError:
-        logger.error("Cannot connect to SearXNG service")
-        return "Cannot connect to search service. Please ensure SearXNG is running at http://localhost:8888"
-    except requests.exceptions.Timeout:
-        logger.error("SearXNG search timed out")
-        return "Search request timed out. Please try again."
-    except Exception as e:
-        logger.error(f"Error during web search: {e}", exc_info=True)
-        return f"Error performing web search: {str(e)}"
+    Returns:
+        list: HUD sections
+    """
+    search_data = result.data if isinstance(result, ToolResult) else None
+    if search_data is None:
+        return []
+    
+    search_items = [
+        {"label": item['title'], "value": item['snippet'], "url": item['url']}
+        for item in search_data['results']
+    ]
+    return [{
+        "title": f"Search: {args.get('query', '')}",
+        "type": "list",
+        "data": {
+            "items": search_items
+        }
+    }]
 
-def get_search_results_data(query: str, max_results: int = 5) -> dict:
+def get_search_results_data(query: str, max_results: int = 5, fetch_content: bool = False) -> dict:
     """Get structured search results data for HUD display.
     
     This is an internal function used by the backend for HUD display.
@@ -169,12 +174,13 @@ def get_search_results_data(query: str, max_results: int = 5) -> dict:
     Args:
         query: The search query string
         max_results: Maximum number of results to return (default: 5)
+        fetch_content: Whether to also fetch each article's text into result["content"]
         
     Returns:
         A dictionary containing structured search results data
     """
     try:
-        logger.info(f"Getting structured search data for: {query}")
+        logger.info(f"Searching web for: {query} (fetch_content={fetch_content})")
         
         # SearXNG API endpoint
         searxng_url = "http://localhost:8888/search"
@@ -184,10 +190,10 @@ def get_search_results_data(query: str, max_results: int = 5) -> dict:
             'q': query,
             'format': 'json',
             'language': 'en',
-            'safesearch': 1,
+            'safesearch': 1,  # Moderate safe search
         }
         
-        response = requests.get(searxng_url, params=params, timeout=10)
+        response = requests.get(searxng_url, params=params, timeout=http_timeout(10))
         
         if response.status_code == 200:
             data = response.json()
@@ -204,26 +210,46 @@ def get_search_results_data(query: str, max_results: int = 5) -> dict:
             
             # Format results for HUD
             results_list = []
+            unread = []
             for result in results:
                 title = result.get('title', 'No title')
                 url = result.get('url', '')
-                snippet = result.get('content', result.get('snippet', 'No description'))
+                snippet = result.get('content', result.get('snippet', 'No description available'))
                 
                 # Clean up snippet
                 snippet = ' '.join(snippet.split())
                 if len(snippet) > 200:
                     snippet = snippet[:200] + '...'
                 
-                results_list.append({
+                item = {
                     "title": title,
                     "url": url,
                     "snippet": snippet
-                })
+                }
+                
+                # Fetch full article content if requested and there is time
+                if fetch_content:
+                    left = tool_remaining()
+                    if left is not None and left < ARTICLE_MIN_SECONDS:
+                        logger.info(f"Out of time, not fetching: {url}")
+                        unread.append(title)
+                    else:
+                        logger.info(f"Fetching content from: {url}")
+                        item["content"] = _fetch_article_content(url, max_length=2000)
+                
+                results_list.append(item)
             
+            logger.info(f"Found {len(results_list)} search results (fetch_content={fetch_content})")
             return {
                 "query": query,
                 "results": results_list,
-                "count": len(results_list)
+                "count": len(results_list),
+                "unread": unread
+            }
+        elif response.status_code == 404:
+            return {
+                "error": "Search service not found",
+                "message": "SearXNG service not found. Please ensure SearXNG is running at http://localhost:8888"
             }
         else:
             return {
@@ -231,8 +257,20 @@ def get_search_results_data(query: str, max_results: int = 5) -> dict:
                 "message": f"Search service returned error code: {response.status_code}"
             }
             
+    except requests.exceptions.ConnectionError:
+        logger.error("Cannot connect to SearXNG service")
+        return {
+            "error": "Connection error",
+            "message": "Cannot connect to search service. Please ensure SearXNG is running at http://localhost:8888"
+        }
+    except requests.exceptions.Timeout:
+        logger.error("SearXNG search timed out")
+        return {
+            "error": "Timeout",
+            "message": "Search request timed out. Please try again."
+        }
     except Exception as e:
-        logger.error(f"Error getting search data: {e}", exc_info=True)
+        logger.error(f"Error during web search: {e}", exc_info=True)
         return {
             "error": "Error",
             "message": f"Error performing web search: {str(e)}"
@@ -56,3 +56,21 @@ def get_date() -> str:
         # Fallback to system time if timezone fails
         today = datetime.now()
         return today.strftime("%A, %B %d, %Y")
+
+def time_hud(args: dict, result) -> list:
+    """HUD renderer for get_time and get_date: the current date, time and timezone.
+
+    Returns:
+        list: HUD sections
+    """
+    return [{
+        "title": "Current Date & Time",
+        "type": "keyvalue",
+        "data": {
+            "items": [
+                {"key": "Date", "value": get_date()},
+                {"key": "Time", "value": get_time()},
+                {"key": "Timezone", "value": "WIB (UTC+7)"}
+            ]
+        }
+    }]
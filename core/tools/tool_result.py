@@ -0,0 +1,26 @@
+"""
+Structured tool results for AURA AI Assistant.
+Lets a tool fetch its data once and hand the same result to both the
+model (as text) and the HUD (as structured data).
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ToolResult:
+    """Outcome of one tool call.
+    
+    Attributes:
+        text: What the model sees, formatted for a spoken reply
+        data: Structured data for HUD display, or None if the call failed
+        partial: True if the request's time budget ran out before all data
+            was fetched (text says what is missing)
+    """
+    text: str
+    data: Optional[dict] = None
+    partial: bool = False
+    
+    def __str__(self) -> str:
+        return self.text
@@ -7,6 +7,10 @@ import pytz
 import requests
 from datetime import datetime
 
+from core.deadline import http_timeout
+
+from .tool_result import ToolResult
+
 # Function declaration for Gemini API (following Google's schema)
 weather_declaration = {
     "name": "get_weather",
@@ -38,60 +42,119 @@ def get_weather(location: str, temperature: str = "C") -> str:
     Returns:
         A string describing the weather conditions
     """
-    try:
-        from settings.config_loader import config
-        
-        api_key = config.get('api_keys.openweather')
-        if not api_key or 'YOUR_' in api_key:
-            return "Weather API not configured. Please add your OpenWeatherMap API key to config.yaml"
-        
-        # OpenWeatherMap API endpoint
-        base_url = "http://api.openweathermap.org/data/2.5/weather"
+    return get_weather_result(location, temperature).text
+
+def get_weather_result(location: str, temperature: str = "C") -> ToolResult:
+    """Fetch the weather once and return it both as text and as HUD data.
+    
+    Args:
+        location: The city or location to get weather for
+        temperature: The temperature unit (default: "C" for Celsius)
         
-        # Set units based on temperature preference
-        units = "metric" if temperature.upper() == "C" else "imperial"
+    Returns:
+        ToolResult with the spoken description and the get_weather_data() dict
+    """
+    units = "metric" if temperature.upper() == "C" else "imperial"
+    data = get_weather_data(location, units)
+    if "error" in data:
+        return ToolResult(text=data["message"])
+    
+    # Use full unit names for better TTS pronunciation
+    temp_unit = "degrees Celsius" if units == "metric" else "degrees Fahrenheit"
+    wind_unit = "meters per second" if units == "metric" else "miles per hour"
+    
+    weather_info = (
+        f"The weather in {location} is {data['description'].lower()}. "
+        f"Temperature: {data['temperature']} {temp_unit} (feels like {data['feels_like']} {temp_unit}). "
+        f"Humidity: {data['humidity']} percent. Wind speed: {data['wind_speed']} {wind_unit}."
+    )
+    return ToolResult(text=weather_info, data=data)
+
+# OpenWeatherMap icon code -> custom weather icon filename
+WEATHER_ICONS = {
+    '01d': 'clear-day.png',      # Clear sky (day)
+    '01n': 'clear-night.png',    # Clear sky (night)
+    '02d': 'partly-cloudy.png',  # Few clouds (day)
+    '02n': 'partly-cloudy.png',  # Few clouds (night)
+    '03d': 'cloudy.png',         # Scattered clouds
+    '03n': 'cloudy.png',         # Scattered clouds
+    '04d': 'overcast.png',       # Broken clouds
+    '04n': 'overcast.png',       # Broken clouds
+    '09d': 'rain.png',           # Shower rain
+    '09n': 'rain.png',           # Shower rain
+    '10d': 'rain.png',           # Rain (day)
+    '10n': 'rain.png',           # Rain (night)
+    '11d': 'thunderstorm.png',   # Thunderstorm
+    '11n': 'thunderstorm.png',   # Thunderstorm
+    '13d': 'snow.png',           # Snow
+    '13n': 'snow.png',           # Snow
+    '50d': 'fog.png',            # Mist/fog
+    '50n': 'fog.png',            # Mist/fog
+}
+
+def weather_icon_url(icon_code: str) -> str:
+    """Map an OpenWeatherMap icon code (e.g. '01d', '10n') to a custom weather icon URL path."""
+    return f"images/weather/{WEATHER_ICONS.get(icon_code, 'default.png')}"
+
+def weather_hud(args: dict, result) -> list:
+    """HUD renderer for get_weather: conditions, temperatures and sun times.
+    
+    Args:
+        args: Arguments the tool was called with
+        result: The tool's ToolResult (no sections if the call failed)
         
-        params = {
-            'q': location,
-            'appid': api_key,
-            'units': units
+    Returns:
+        list: HUD sections
+    """
+    weather_data = result.data if isinstance(result, ToolResult) else None
+    if weather_data is None:
+        return []
+    
+    imperial = weather_data.get('units') == "imperial"
+    temp_unit = "°F" if imperial else "°C"
+    wind_unit = "mph" if imperial else "m/s"
+    
+    return [
+        # Weather icon FIRST (will be displayed at top) - using custom icons
+        {
+            "title": "Current Conditions",
+            "type": "image",
+            "data": {
+                "url": weather_icon_url(weather_data['icon']),
+                "alt": weather_data['description'],
+                "caption": weather_data['description']
+            }
+        },
+        # Main weather data
+        {
+            "title": f"Weather - {weather_data['location']}, {weather_data['country']}",
+            "type": "keyvalue",
+            "data": {
+                "items": [
+                    {"key": "Condition", "value": weather_data['description']},
+                    {"key": "Temperature", "value": f"{weather_data['temperature']}{temp_unit}"},
+                    {"key": "Feels Like", "value": f"{weather_data['feels_like']}{temp_unit}"},
+                    {"key": "Humidity", "value": f"{weather_data['humidity']}%"},
+                    {"key": "Wind Speed", "value": f"{weather_data['wind_speed']} {wind_unit}"}
+                ]
+            }
+        },
+        # Sun times
+        {
+            "title": "Sun Times",
+            "type": "keyvalue",
+            "data": {
+                "items": [
+                    {"key": "Sunrise", "value": weather_data['sunrise']},
+                    {"key": "Sunset", "value": weather_data['sunset']},
+                    {"key": "Pressure", "value": f"{weather_data['pressure']} hPa"},
+                    {"key": "Cloudiness", "value": f"{weather_data['clouds']}%"}
+                ]
+            }
         }
-        
-        response = requests.get(base_url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            temp = data['main']['temp']
-            feels_like = data['main']['feels_like']
-            humidity = data['main']['humidity']
-            description = data['weather'][0]['description']
-            wind_speed = data['wind']['speed']
-            
-            # Use full unit names for better TTS pronunciation
-            temp_unit = "degrees Celsius" if units == "metric" else "degrees Fahrenheit"
-            wind_unit = "meters per second" if units == "metric" else "miles per hour"
-            
-            weather_info = (
-                f"The weather in {location} is {description}. "
-                f"Temperature: {temp} {temp_unit} (feels like {feels_like} {temp_unit}). "
-                f"Humidity: {humidity} percent. Wind speed: {wind_speed} {wind_unit}."
-            )
-            
-            return weather_info
-        elif response.status_code == 404:
-            return f"Location '{location}' not found. Please check the city name."
-        else:
-            return f"Unable to fetch weather data. Error code: {response.status_code}"
-            
-    except requests.exceptions.Timeout:
-        return "Weather service timed out. Please try again."
-    except requests.exceptions.RequestException as e:
-        return f"Error connecting to weather service: {str(e)}"
-    except Exception as e:
-        return f"Error getting weather: {str(e)}"
+    ]
 
-def get_weather_data(location: str = "Jakarta") -> dict:
+def get_weather_data(location: str = "Jakarta", units: str = "metric") -> dict:
     """Get detailed weather data for HUD display using OpenWeatherMap API.
     
     This is an internal function used by the backend for HUD display.
@@ -99,6 +162,7 @@ def get_weather_data(location: str = "Jakarta") -> dict:
     
     Args:
         location: The city or location to get weather for
+        units: "metric" (Celsius, m/s) or "imperial" (Fahrenheit, mph)
         
     Returns:
         A dictionary containing detailed weather data for HUD display
@@ -110,7 +174,7 @@ def get_weather_data(location: str = "Jakarta") -> dict:
         if not api_key or 'YOUR_' in api_key:
             return {
                 "error": "Weather API not configured",
-                "message": "Please add your OpenWeatherMap API key to config.yaml"
+                "message": "Weather API not configured. Please add your OpenWeatherMap API key to config.yaml"
             }
         
         # OpenWeatherMap API endpoint
@@ -119,15 +183,16 @@ def get_weather_data(location: str = "Jakarta") -> dict:
         params = {
             'q': location,
             'appid': api_key,
-            'units': 'metric'  # Use Celsius
+            'units': units
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = requests.get(base_url, params=params, timeout=http_timeout(10))
         
         if response.status_code == 200:
             data = response.json()
             
             return {
+                "units": units,
                 "location": data['name'],
                 "country": data['sys']['country'],
                 "temperature": round(data['main']['temp'], 1),
@@ -0,0 +1,61 @@
+"""
+Startup warm-up for AURA.
+Pays the one-time costs of the request path (TLS to Gemini, loading the
+Piper voice, the Calendar client and discovery document, the task
+database) before the instance reports itself ready to take traffic.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict
+
+from core.logger import get_logger
+from core.metrics import STAGE_SECONDS
+
+logger = get_logger(__name__)
+
+
+class WarmUp:
+    """Runs named warm-up steps concurrently and tracks readiness."""
+
+    def __init__(self, steps: Dict[str, Callable[[], Awaitable]], timeout: float = 30.0):
+        """
+        Args:
+            steps: Step name -> coroutine function. A step may return False
+                to report that it was skipped (e.g. not configured)
+            timeout: Seconds each step may take before it is abandoned
+        """
+        self.steps = steps
+        self.timeout = timeout
+        self.results: Dict[str, dict] = {}
+        self.ready = False
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable]):
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                outcome = await step()
+            status, error = ("skipped" if outcome is False else "ok"), None
+        except Exception as e:
+            status, error = "failed", str(e) or type(e).__name__
+            logger.warning(f"Warm-up step '{name}' failed: {error}")
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=f"warmup_{name}")
+
+        self.results[name] = {"status": status, "duration_ms": round(elapsed * 1000, 1)}
+        if error:
+            self.results[name]["error"] = error
+        logger.info(f"Warm-up step '{name}' {status} in {elapsed * 1000:.0f}ms")
+
+    async def run(self):
+        """
+        Run every step, then mark the instance ready.
+
+        A failed step does not block readiness: the instance can still
+        serve requests, just without the head start for that dependency.
+        Failures are reported by /readyz.
+        """
+        logger.info(f"Warming up: {', '.join(self.steps)}")
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self.steps.items()))
+        self.ready = True
+        logger.info("Warm-up complete, instance is ready")
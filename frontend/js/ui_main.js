@@ -4,6 +4,7 @@ const API_URL = 'http://localhost:8000';
 
 let currentAudioSource = null;
 let isPlaying = false;
+let sessionId = null;  // Conversation session, so follow-up questions have context
 
 // Get the audio context from THREE.js AudioListener
 function getAudioContext() {
@@ -45,7 +46,7 @@ async function sendQuery(query) {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ query: query })
+            body: JSON.stringify({ query: query, session_id: sessionId })
         });
 
         if (!response.ok) {
@@ -54,6 +55,7 @@ async function sendQuery(query) {
 
         const data = await response.json();
         console.log("Received response:", data.response);
+        sessionId = data.session_id || sessionId;
         
         // Update HUD if sections are available - creates a new window automatically
         if (data.hud_sections && data.hud_sections.length > 0) {
@@ -64,8 +66,8 @@ async function sendQuery(query) {
         }
         
         // Play the audio with synced text animation
-        if (data.base64_audio) {
-            await playBase64Audio(data.base64_audio, data.response);
+        if (data.audio_url) {
+            await playAudioUrl(`${API_URL}${data.audio_url}`, data.response);
         }
         
         return data;
@@ -102,8 +104,35 @@ function animateText(element, text, duration) {
     });
 }
 
+// Function to fetch raw WAV audio by URL and play it through the visualizer
+async function playAudioUrl(audioUrl, responseText = '') {
+    const response = await fetch(audioUrl);
+    if (!response.ok) {
+        throw new Error(`Audio fetch failed! status: ${response.status}`);
+    }
+    
+    const arrayBuffer = await response.arrayBuffer();
+    console.log("Fetched audio bytes:", arrayBuffer.byteLength);
+    
+    await playAudioBuffer(arrayBuffer, responseText);
+}
+
 // Function to decode and play base64 audio through the visualizer
 async function playBase64Audio(base64Audio, responseText = '') {
+    // Decode base64 to binary
+    const binaryString = atob(base64Audio);
+    const bytes = new Uint8Array(binaryString.length);
+    for (let i = 0; i < binaryString.length; i++) {
+        bytes[i] = binaryString.charCodeAt(i);
+    }
+    
+    console.log("Decoded audio bytes:", bytes.length);
+    
+    await playAudioBuffer(bytes.buffer, responseText);
+}
+
+// Function to decode WAV bytes and play them through the visualizer
+async function playAudioBuffer(arrayBuffer, responseText = '') {
     try {
         // Get the THREE.js audio context
         const ctx = getAudioContext();
@@ -121,17 +150,8 @@ async function playBase64Audio(base64Audio, responseText = '') {
             currentAudioSource = null;
         }
         
-        // Decode base64 to binary
-        const binaryString = atob(base64Audio);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-            bytes[i] = binaryString.charCodeAt(i);
-        }
-        
-        console.log("Decoded audio bytes:", bytes.length);
-        
         // Decode audio data
-        const audioBuffer = await ctx.decodeAudioData(bytes.buffer);
+        const audioBuffer = await ctx.decodeAudioData(arrayBuffer);
         console.log("Audio decoded successfully. Duration:", audioBuffer.duration, "seconds");
         
         // Create audio source
@@ -234,7 +254,7 @@ function setupUI() {
             }
             
             await sendQuery(query);
-            // Response text will be animated by playBase64Audio
+            // Response text will be animated by playAudioBuffer
             
             // Clear input
             queryInput.value = '';
@@ -268,6 +288,7 @@ if (document.readyState === 'loading') {
 // Expose functions globally for testing
 window.auraAPI = {
     sendQuery,
+    playAudioUrl,
     playBase64Audio,
     getAudioContext,
     getStatus: () => ({
@@ -1,11 +1,30 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+from core.admission import OverloadedError
+from core.audio_store import AudioStore, parse_range
+from core.metrics import (
+    HISTORY_TOKENS, REQUESTS, REQUEST_SECONDS, RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_LOOKUPS, registry
+)
 from core.brain import Brain
-from core.mouth import Mouth
+from core.context import GenerationContext
+from core.deadline import request_deadline
+from core.mouth import Mouth, SentenceChunker, VoicePool
+from core.response_cache import CachedResponse, ResponseCache, standalone
+from core.session import Session, SessionStore
+from core.warmup import WarmUp
+from core.apps.todo import warm_up_todo_storage
+from core.tools.calendar_tool import warm_up_calendar_service
 from core.logger import AURALogger, get_logger
 from core.tools.weather_tool import get_weather, get_weather_data
 from settings.config_loader import config
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from typing import List, Optional
 import uvicorn
 
 log_level = config.get('system.log_level', 'INFO')
@@ -15,10 +34,23 @@ logger = get_logger(__name__)
 
 logger.info("Starting AURA application")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up in the background so /healthz answers while /readyz waits."""
+    warm_up_task = asyncio.create_task(warm_up.run()) if config.get('warmup.enabled', True) else None
+    if warm_up_task is None:
+        warm_up.ready = True
+    yield
+    # Stop advertising readiness so the load balancer drains this instance
+    warm_up.ready = False
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+
 app = FastAPI(
     title="Backend AURA API",
     description="API for AURA backend services",
-    version="0.0.1"
+    version="0.0.1",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -30,29 +62,476 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and observe latency per route template (not raw path)."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+    REQUEST_SECONDS.observe(time.perf_counter() - start, route=route_path)
+    REQUESTS.inc(route=route_path, status=str(response.status_code))
+    return response
+
 brain = Brain()
 mouth = Mouth()
+voices = VoicePool(mouth, max_voices=config.get('audio.max_voices', 4))
+audio_store = AudioStore(
+    ttl_seconds=config.get('audio.ttl_seconds', 300),
+    max_entries=config.get('audio.max_entries', 256)
+)
+sessions = SessionStore(
+    ttl_seconds=config.get('sessions.ttl_seconds', 3600),
+    max_sessions=config.get('sessions.max_sessions', 1000)
+)
+response_cache = None
+if config.get('response_cache.enabled', True):
+    response_cache = ResponseCache(
+        max_entries=config.get('response_cache.max_entries', 256),
+        similarity=config.get('response_cache.similarity', 0.9),
+        ttls={
+            "stable": config.get('response_cache.ttl_seconds', 3600),
+            "recent": config.get('response_cache.recent_ttl_seconds', 300),
+            "live": 0,
+            "action": 0
+        }
+    )
+warm_up = WarmUp(
+    steps={
+        "gemini": brain.warm_up,
+        "piper": lambda: asyncio.to_thread(mouth.warm_up),
+        "calendar": lambda: asyncio.to_thread(warm_up_calendar_service),
+        "todo_db": lambda: asyncio.to_thread(warm_up_todo_storage),
+    },
+    timeout=config.get('warmup.timeout', 30)
+)
+
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request, exc: OverloadedError):
+    """Shed load fast: 429/503 with a Retry-After hint instead of queueing forever."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": f"Server busy ({exc.stage}: {exc.reason})", "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# Latency budget for producing a reply (model rounds and tools); tools that
+# would overrun it are cancelled and the model answers without their data
+REQUEST_BUDGET = config.get('deadline.request_seconds', 12)
+# Sentences of one streamed reply handed to Piper at once
+STREAM_SYNTHESIS = max(1, config.get('audio.stream_synthesis', 2))
+
+def _overloaded_payload(exc: OverloadedError) -> dict:
+    """Error payload for streaming clients, mirroring the HTTP 429/503 response."""
+    return {
+        "detail": f"Server busy ({exc.stage}: {exc.reason})",
+        "status": exc.status_code,
+        "retry_after": exc.retry_after
+    }
 
 class QueryRequest(BaseModel):
     query: str
+    # Continue the conversation of a previous reply's session_id; an unknown
+    # or expired ID starts a new session. Without one, no session is kept.
+    session_id: Optional[str] = None
+    include_timings: bool = False  # Add a per-stage "timings" breakdown (ms) to the reply
+
+class BatchRequest(BaseModel):
+    queries: List[str]
+    tts: bool = False                       # Synthesize audio for every item
+    max_concurrency: Optional[int] = None   # Capped at batch.max_concurrency
+    include_timings: bool = False
+
+def _request_session(session_id: Optional[str]) -> Optional[Session]:
+    """Session for an HTTP request; one-off requests without a session_id get none."""
+    if not session_id:
+        return None
+    return sessions.get_or_create(session_id, voice=mouth.model_name)
+
+def _session_context(session: Optional[Session], query: str) -> GenerationContext:
+    """Start a generation that sees the session's (token-budgeted) conversation so far."""
+    if session is None:
+        return GenerationContext(query=query)
+    HISTORY_TOKENS.observe(session.memory.tokens)
+    return GenerationContext(query=query, conversation=session.history)
+
+def _cacheable(ctx: GenerationContext) -> bool:
+    """Whether the reply can't depend on earlier turns: no history, or a standalone question."""
+    return not ctx.conversation or standalone(ctx.query)
+
+def _cached_reply(ctx: GenerationContext) -> Optional[CachedResponse]:
+    """Look up an earlier reply to the same question, unless it builds on previous turns."""
+    if response_cache is None:
+        return None
+    if not _cacheable(ctx):
+        RESPONSE_CACHE_LOOKUPS.inc(outcome="skipped")
+        return None
+    with ctx.timed("response_cache"):
+        cached = response_cache.get(ctx.query)
+    RESPONSE_CACHE_LOOKUPS.inc(outcome="hit" if cached is not None else "miss")
+    if cached is not None:
+        ctx.response = cached.response
+        ctx.hud_sections = cached.hud_sections
+    return cached
+
+def _cache_reply(ctx: GenerationContext, audio_id: Optional[str] = None):
+    """Offer a fresh reply to the response cache (it refuses time-sensitive ones)."""
+    if response_cache is None:
+        return
+    audio_data = audio_store.get(audio_id) if audio_id else None
+    if response_cache.put(ctx.query, ctx.response, ctx.hud_sections, ctx.tool_results, audio_data):
+        RESPONSE_CACHE_ENTRIES.set(len(response_cache))
+
+async def _synthesize_to_store(text: str, ctx: Optional[GenerationContext] = None) -> Optional[str]:
+    """Render text with Piper and return the ID of the stored WAV, or None."""
+    audio_data = await mouth.synthesize_async(text, ctx)
+    if audio_data is None:
+        return None
+    return audio_store.put(audio_data)
+
+async def _no_audio(text: str) -> None:
+    """Stand-in synthesizer for sessions that asked for text only."""
+    return None
 
 @app.post("/generate")
-def generate(request: QueryRequest):
+async def generate(request: QueryRequest, response: Response):
     try:
-        # Brain now returns both response and HUD sections
-        result = brain.generate(request.query)
+        session = _request_session(request.session_id)
+        ctx = _session_context(session, request.query)
+        # Checked before generating: the conversation grows during generate()
+        cacheable = _cacheable(ctx)
+        
+        # Repeated questions are answered from the response cache, text,
+        # HUD and audio alike; otherwise Brain returns response and HUD sections
+        cached = _cached_reply(ctx)
+        if cached is not None:
+            result = {"response": cached.response, "hud_sections": cached.hud_sections}
+        else:
+            with request_deadline(REQUEST_BUDGET):
+                result = await brain.generate(request.query, ctx)
+        if session is not None:
+            session.record_turn(request.query, result["response"])
+        
+        if cached is not None and cached.audio is not None:
+            audio_id = audio_store.put(cached.audio)
+        else:
+            # Generate audio from text response (Piper runs in an executor)
+            audio_id = await _synthesize_to_store(result["response"], ctx)
+            if cacheable and cached is None:
+                _cache_reply(ctx, audio_id)
         
-        # Generate audio from text response
-        base64_audio = mouth.speak(result["response"])
+        # Per-stage breakdown, visible in the browser's dev tools (the
+        # frontend is served from another origin, hence Timing-Allow-Origin)
+        response.headers["Server-Timing"] = ctx.server_timing()
+        response.headers["Timing-Allow-Origin"] = "*"
         
-        return {
+        body = {
+            "session_id": session.session_id if session else None,
             "response": result["response"],
-            "base64_audio": base64_audio,
-            "hud_sections": result.get("hud_sections", [])
+            "audio_id": audio_id,
+            "audio_url": f"/audio/{audio_id}" if audio_id else None,
+            "hud_sections": result.get("hud_sections", []),
+            "cached": cached is not None
         }
+        if request.include_timings:
+            body["timings"] = ctx.timings
+        return body
+    except OverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in /generate: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@app.post("/generate/batch")
+async def generate_batch(request: BatchRequest):
+    """
+    Run many independent queries concurrently.
+    
+    Up to max_concurrency queries are in flight at once (bounded by the
+    batch.max_concurrency setting); results come back in input order, each
+    with its own response, HUD sections, optional audio and error.
+    """
+    max_queries = config.get('batch.max_queries', 100)
+    if len(request.queries) > max_queries:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {max_queries} queries")
+    
+    max_concurrency = config.get('batch.max_concurrency', 8)
+    parallelism = max(1, min(request.max_concurrency or max_concurrency, max_concurrency))
+    semaphore = asyncio.Semaphore(parallelism)
+    
+    async def run_one(index: int, query: str) -> dict:
+        item = {"index": index, "query": query}
+        async with semaphore:
+            ctx = GenerationContext(query=query)
+            try:
+                cached = _cached_reply(ctx)
+                if cached is not None:
+                    result = {"response": cached.response, "hud_sections": cached.hud_sections}
+                else:
+                    with request_deadline(REQUEST_BUDGET):
+                        result = await brain.generate(query, ctx)
+                item["response"] = result["response"]
+                item["hud_sections"] = result.get("hud_sections", [])
+                item["cached"] = cached is not None
+                audio_id = None
+                if request.tts:
+                    if cached is not None and cached.audio is not None:
+                        audio_id = audio_store.put(cached.audio)
+                    else:
+                        audio_id = await _synthesize_to_store(result["response"], ctx)
+                    item["audio_id"] = audio_id
+                    item["audio_url"] = f"/audio/{audio_id}" if audio_id else None
+                if cached is None:
+                    _cache_reply(ctx, audio_id)
+            except OverloadedError as e:
+                item["error"] = _overloaded_payload(e)
+            except Exception as e:
+                logger.error(f"Error in /generate/batch item {index}: {e}")
+                item["error"] = {"detail": "Internal Server Error", "status": 500}
+            if request.include_timings:
+                item["timings"] = ctx.timings
+        return item
+    
+    logger.info(f"Running batch of {len(request.queries)} queries with parallelism {parallelism}")
+    results = await asyncio.gather(*(run_one(index, query) for index, query in enumerate(request.queries)))
+    return {"results": results}
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _stream_reply(query: str, ctx: GenerationContext, synthesize):
+    """
+    Drive brain.generate_stream and interleave sentence-level TTS.
+    
+    Yields the brain's (event, data) tuples unchanged, then one
+    ("audio", {"index", "text", "audio"}) per synthesized sentence, where
+    "audio" is whatever synthesize() returned. Sentences are handed to
+    synthesize() as soon as the model finishes them, so Piper overlaps the
+    remaining text stream, but at most audio.stream_synthesis of them at
+    once so one long reply can't fill the TTS queue. A sentence the TTS
+    stage turns away (OverloadedError) is sent with audio None rather than
+    ending a stream whose text has already gone out.
+    
+    Args:
+        query: User's query
+        ctx: Context for this generation (may carry prior conversation)
+        synthesize: Coroutine function taking a sentence, returning audio or None
+    """
+    chunker = SentenceChunker()
+    audio_tasks = []
+    in_flight = asyncio.Semaphore(STREAM_SYNTHESIS)
+    
+    async def synthesize_in_turn(sentence: str):
+        async with in_flight:
+            return await synthesize(sentence)
+    
+    try:
+        async for event, data in brain.generate_stream(query, ctx):
+            yield event, data
+            if event == "text_delta":
+                for sentence in chunker.feed(data["text"]):
+                    audio_tasks.append((sentence, asyncio.create_task(synthesize_in_turn(sentence))))
+        for sentence in chunker.flush():
+            audio_tasks.append((sentence, asyncio.create_task(synthesize_in_turn(sentence))))
+        
+        for index, (sentence, task) in enumerate(audio_tasks):
+            try:
+                audio = await task
+            except OverloadedError as e:
+                logger.warning(f"TTS busy, sending sentence {index} without audio ({e.reason})")
+                yield "audio", {"index": index, "text": sentence, "audio": None}
+                continue
+            if audio:
+                yield "audio", {"index": index, "text": sentence, "audio": audio}
+    finally:
+        # Client may have disconnected mid-stream; don't leave Piper running
+        for _, task in audio_tasks:
+            task.cancel()
+
+@app.post("/generate/stream")
+async def generate_stream(request: QueryRequest):
+    """
+    Stream a reply as Server-Sent Events.
+    
+    Events arrive in order: tool_started, hud_section, text_delta, then one
+    audio event per sentence (an ID to fetch from /audio/{id}, null if TTS
+    was too busy for that sentence) and a final
+    done event. Headers are gone by the time timings are known, so the
+    stage breakdown is only available via include_timings on done.
+    """
+    async def event_stream():
+        session = _request_session(request.session_id)
+        ctx = _session_context(session, request.query)
+        try:
+            synthesize = lambda sentence: _synthesize_to_store(sentence, ctx)
+            with request_deadline(REQUEST_BUDGET):
+                async for event, data in _stream_reply(request.query, ctx, synthesize):
+                    if event == "audio":
+                        audio_id = data.pop("audio")
+                        data.update({"audio_id": audio_id, "audio_url": f"/audio/{audio_id}" if audio_id else None})
+                    yield _sse(event, data)
+            
+            if session is not None:
+                session.record_turn(request.query, ctx.response)
+            done = {"session_id": session.session_id if session else None, "response": ctx.response, "hud_sections": ctx.hud_sections}
+            if request.include_timings:
+                done["timings"] = ctx.timings
+            yield _sse("done", done)
+        except OverloadedError as e:
+            yield _sse("error", _overloaded_payload(e))
+        except Exception as e:
+            logger.error(f"Error in /generate/stream: {e}")
+            yield _sse("error", {"detail": "Internal Server Error"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.api_route("/audio/{audio_id}", methods=["GET", "HEAD"])
+async def get_audio(audio_id: str, range_header: Optional[str] = Header(None, alias="range")):
+    """Serve a stored reply as raw audio/wav, honouring single byte ranges."""
+    audio_data = audio_store.get(audio_id)
+    if audio_data is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+    
+    size = len(audio_data)
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": "private, max-age=300"}
+    
+    if range_header:
+        try:
+            start, end = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return Response(
+            content=audio_data[start:end + 1],
+            status_code=206,
+            media_type="audio/wav",
+            headers=headers
+        )
+    
+    return Response(content=audio_data, media_type="audio/wav", headers=headers)
+
+
+def _mouth_for_voice(voice: str) -> Mouth:
+    """Return a Mouth for the given installed Piper voice, loading it on first use."""
+    return voices.get(voice)
+
+@app.websocket("/ws")
+async def websocket_session(websocket: WebSocket):
+    """
+    Persistent session over a single WebSocket.
+    
+    The connection starts a new session (user, voice, conversation memory),
+    kept in the session store so it can also be resumed later. Client
+    messages are JSON text frames:
+    - {"type": "session", "session_id": str} resumes an earlier session
+    - {"type": "session", "user": str, "voice": str} updates settings
+    - {"type": "query", "query": str, "audio": bool} asks AURA something
+    
+    Server messages are JSON text frames of the form {"type": event, ...}
+    (session, tool_started, hud_section, text_delta, done, error). Each
+    "audio" message announces one sentence and is immediately followed by
+    a binary frame holding its WAV bytes (none if "bytes" is 0, when TTS
+    was too busy for that sentence).
+    """
+    await websocket.accept()
+    session = sessions.create(voice=mouth.model_name)
+    # Resolved whenever the session's voice changes, off the per-query path
+    voice_mouth = mouth
+    logger.info(f"WebSocket session {session.session_id} opened")
+    await websocket.send_json({"type": "session", **session.to_dict()})
+    
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON"})
+                continue
+            message_type = message.get("type")
+            
+            if message_type == "session":
+                if message.get("session_id") and message["session_id"] != session.session_id:
+                    resumed = sessions.get(message["session_id"])
+                    if resumed is None:
+                        await websocket.send_json({"type": "error", "detail": "Unknown or expired session"})
+                        continue
+                    session = resumed
+                    if session.voice != voice_mouth.model_name:
+                        # A resumed session keeps the voice it was using
+                        voice_mouth = await asyncio.to_thread(_mouth_for_voice, session.voice)
+                if "voice" in message and message["voice"] != session.voice:
+                    try:
+                        voice_mouth = await asyncio.to_thread(_mouth_for_voice, message["voice"])
+                    except FileNotFoundError:
+                        await websocket.send_json({
+                            "type": "error",
+                            "detail": f"Unknown voice: {message['voice']}",
+                            "status": 400
+                        })
+                        continue
+                    session.voice = message["voice"]
+                if "user" in message:
+                    session.user = message["user"]
+                await websocket.send_json({"type": "session", **session.to_dict()})
+            
+            elif message_type == "query" and message.get("query"):
+                query = message["query"]
+                ctx = _session_context(session, query)
+                synthesize = voice_mouth.synthesize_async if message.get("audio", True) else _no_audio
+                try:
+                    with request_deadline(REQUEST_BUDGET):
+                        async for event, data in _stream_reply(query, ctx, synthesize):
+                            if event == "audio":
+                                audio_data = data.pop("audio")
+                                # No binary frame follows when TTS was too busy for this sentence
+                                await websocket.send_json({"type": "audio", **data, "bytes": len(audio_data or b"")})
+                                if audio_data:
+                                    await websocket.send_bytes(audio_data)
+                            else:
+                                await websocket.send_json({"type": event, "data": data})
+                    
+                    session.record_turn(query, ctx.response)
+                    await websocket.send_json({
+                        "type": "done",
+                        "response": ctx.response,
+                        "hud_sections": ctx.hud_sections
+                    })
+                except WebSocketDisconnect:
+                    raise
+                except OverloadedError as e:
+                    await websocket.send_json({"type": "error", **_overloaded_payload(e)})
+                except Exception as e:
+                    logger.error(f"Error in /ws session {session.session_id}: {e}")
+                    await websocket.send_json({"type": "error", "detail": "Internal Server Error"})
+            
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unsupported message: {message_type}"})
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket session {session.session_id} closed")
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 only once warm-up has finished, 503 before that."""
+    if not warm_up.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": warm_up.results})
+    return {"status": "ready", "warmup": warm_up.results}
+
+@app.get("/metrics")
+async def metrics():
+    """Expose metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
     
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
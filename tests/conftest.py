@@ -0,0 +1,52 @@
+"""
+Shared test fixtures: a Brain wired to a fake Gemini client, and the API app.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.brain import Brain
+from core.mouth import Mouth
+
+
+@pytest.fixture
+def fake_client():
+    """Factory for a stand-in genai.Client exposing client.aio.models and client.aio.caches."""
+    def make(models=None, caches=None):
+        aio = type("Aio", (), {"models": models, "caches": caches})()
+        return type("Client", (), {"aio": aio})()
+    return make
+
+
+@pytest.fixture
+def make_brain(fake_client):
+    """
+    Factory for a Brain that talks to the given fake models (and caches).
+
+    The local intent fast path and the prompt cache are off unless asked
+    for, so every query reaches the fake models with the full prompt.
+    """
+    def make(models=None, caches=None, intents=False, prompt_cache=False):
+        brain = Brain()
+        brain.client = fake_client(models, caches)
+        if not intents:
+            brain.intents = None
+        brain.prompt_cache.enabled = prompt_cache
+        return brain
+    return make
+
+
+@pytest.fixture(scope="session")
+def main():
+    """The API module (main.py), imported without Piper voices installed."""
+    # Nothing under test synthesizes speech, so any voice name resolves
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(Mouth, "_find_model", lambda self, model_name: Path(f"{model_name}.onnx"))
+        import main
+    return main
@@ -0,0 +1,72 @@
+"""
+Tests for stage admission control (core/admission.py).
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.admission import OverloadedError, StageLimiter
+
+
+def test_full_queue_is_rejected_with_429_and_timeout_with_503():
+    """One slot, one queue place: a third caller is shed, the queued one times out."""
+    async def scenario():
+        limiter = StageLimiter("test", concurrency=1, queue_size=1, queue_timeout=0.1)
+
+        async def hold(seconds):
+            async with limiter.slot():
+                await asyncio.sleep(seconds)
+
+        holder = asyncio.create_task(hold(0.3))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(hold(0))
+        await asyncio.sleep(0.01)
+
+        try:
+            async with limiter.slot():
+                pass
+            raise AssertionError("third caller should have been rejected")
+        except OverloadedError as e:
+            assert e.status_code == 429
+            assert e.retry_after >= 1
+
+        try:
+            await queued
+            raise AssertionError("queued caller should have timed out")
+        except OverloadedError as e:
+            assert e.status_code == 503
+
+        await holder
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.active == 0
+    assert limiter.waiting == 0
+
+
+def test_slots_are_reused_after_release():
+    """Work within the concurrency limit is never rejected."""
+    async def scenario():
+        limiter = StageLimiter("test", concurrency=2, queue_size=0, queue_timeout=1)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.active)
+                await asyncio.sleep(0.01)
+
+        for _ in range(5):
+            await asyncio.gather(work(), work())
+        return peak
+
+    assert asyncio.run(scenario()) == 2
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
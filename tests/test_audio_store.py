@@ -0,0 +1,76 @@
+"""
+Tests for the reply audio store and Range parsing (core/audio_store.py).
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.audio_store
+from core.audio_store import AudioStore, parse_range
+
+
+def test_closed_ranges_are_inclusive():
+    assert parse_range("bytes=0-1023", 4096) == (0, 1023)
+    assert parse_range("bytes=100-100", 4096) == (100, 100)
+
+
+def test_open_ended_range_runs_to_the_end():
+    assert parse_range("bytes=500-", 4096) == (500, 4095)
+
+
+def test_suffix_range_is_the_last_bytes():
+    assert parse_range("bytes=-500", 4096) == (3596, 4095)
+    # A suffix longer than the clip is the whole clip
+    assert parse_range("bytes=-9000", 4096) == (0, 4095)
+
+
+def test_end_past_the_clip_is_clamped():
+    assert parse_range("bytes=4000-9999", 4096) == (4000, 4095)
+
+
+@pytest.mark.parametrize("header", ["bytes=4096-", "bytes=5000-6000", "bytes=-0", "bytes=10-5"])
+def test_unsatisfiable_ranges_are_rejected(header):
+    # main.py answers these with 416 and "Content-Range: bytes */size"
+    with pytest.raises(ValueError):
+        parse_range(header, 4096)
+
+
+@pytest.mark.parametrize("header", ["items=0-10", "bytes=0-10,20-30", "bytes=abc-", "bytes=-", "bytes=1-x", ""])
+def test_malformed_headers_are_rejected(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 4096)
+
+
+def test_clips_are_retrievable_until_they_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(core.audio_store.time, "monotonic", lambda: now[0])
+    store = AudioStore(ttl_seconds=300, max_entries=10)
+
+    audio_id = store.put(b"RIFF")
+    now[0] += 299
+    assert store.get(audio_id) == b"RIFF"
+    now[0] += 2
+    assert store.get(audio_id) is None
+    assert store.get("unknown") is None
+    assert len(store) == 0
+
+
+def test_oldest_clips_are_evicted_beyond_max_entries():
+    store = AudioStore(ttl_seconds=300, max_entries=2)
+
+    first = store.put(b"one")
+    second = store.put(b"two")
+    third = store.put(b"three")
+
+    assert store.get(first) is None
+    assert store.get(second) == b"two" and store.get(third) == b"three"
+    assert len(store) == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
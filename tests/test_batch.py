@@ -0,0 +1,54 @@
+"""
+Tests for POST /generate/batch (main.py): bounded parallelism, input order
+and per-item errors.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+
+def test_batch_runs_in_parallel_up_to_the_limit_and_keeps_order(main, monkeypatch):
+    in_flight, peak = [0], [0]
+
+    async def generate(query, ctx):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        if query == "fail":
+            raise RuntimeError("model exploded")
+        return {"response": f"Answer to {query}", "hud_sections": []}
+
+    monkeypatch.setattr(main.brain, "generate", generate)
+    monkeypatch.setattr(main, "response_cache", None)
+    queries = ["one", "two", "fail", "four", "five", "six"]
+
+    response = TestClient(main.app).post("/generate/batch", json={"queries": queries, "max_concurrency": 2})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert peak[0] == 2
+    assert [item["query"] for item in results] == queries
+    assert results[0]["response"] == "Answer to one"
+    assert results[2]["error"]["status"] == 500 and "response" not in results[2]
+    assert results[5]["response"] == "Answer to six"
+
+
+def test_oversized_batches_are_rejected(main):
+    max_queries = main.config.get('batch.max_queries', 100)
+
+    response = TestClient(main.app).post("/generate/batch", json={"queries": ["hi"] * (max_queries + 1)})
+
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,182 @@
+"""
+Concurrency test for Brain.generate.
+Verifies that one Brain instance serving many parallel requests keeps
+each request's HUD sections isolated, and that the function calls of a
+single turn run concurrently without losing their order.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+import core.brain
+from core.brain import Brain
+from core.context import GenerationContext
+from core.tools import ToolResult
+
+CITIES = [f"City{i}" for i in range(50)]
+
+
+def _model_response(parts):
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=parts))]
+    )
+
+
+class _FakeModels:
+    """Scripted stand-in for client.aio.models: asks for weather, then answers."""
+
+    async def generate_content(self, model, contents, config):
+        await asyncio.sleep(random.uniform(0, 0.01))
+        query = contents[0].parts[0].text
+        if len(contents) == 1:
+            return _model_response([
+                types.Part.from_function_call(name="get_weather", args={"location": query})
+            ])
+        return _model_response([types.Part.from_text(text=f"Weather for {query}, Sir.")])
+
+
+class _FakeClient:
+    def __init__(self):
+        self.aio = type("Aio", (), {"models": _FakeModels()})()
+
+
+def _fake_get_weather(location: str, temperature: str = "C") -> ToolResult:
+    time.sleep(random.uniform(0, 0.01))
+    return ToolResult(text=f"The weather in {location} is clear.", data={
+        "units": "metric", "location": location, "country": "XX", "temperature": 30.0, "feels_like": 31.0,
+        "humidity": 70, "pressure": 1010, "description": "Clear Sky", "icon": "01d",
+        "wind_speed": 2.0, "clouds": 0, "visibility": 10, "sunrise": "06:00 AM", "sunset": "06:00 PM"
+    })
+
+
+def test_hud_isolation_under_parallel_load(monkeypatch):
+    """Parallel generate() calls on one Brain must not mix HUD sections."""
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_weather", _fake_get_weather)
+
+    brain = Brain()
+    brain.client = _FakeClient()
+
+    async def run_all():
+        contexts = [GenerationContext(query=city) for city in CITIES]
+        results = await asyncio.gather(*(brain.generate(city, ctx) for city, ctx in zip(CITIES, contexts)))
+        return contexts, results
+
+    contexts, results = asyncio.run(run_all())
+
+    for city, ctx, result in zip(CITIES, contexts, results):
+        assert result["response"] == f"Weather for {city}, Sir."
+        assert result["hud_sections"] is ctx.hud_sections
+        titles = [section["title"] for section in result["hud_sections"]]
+        assert f"Weather - {city}, XX" in titles
+        # Exactly one request's worth of sections: icon, weather, sun times
+        assert len(titles) == 3
+        assert [record.name for record in ctx.tool_results] == ["get_weather"]
+        assert "llm_round1" in ctx.timings and "llm_round2" in ctx.timings
+
+
+
+class _BriefingModels:
+    """Asks for several tools in one turn, then records what it was sent back."""
+
+    def __init__(self, calls):
+        self.calls = calls
+        self.function_responses = None
+
+    async def generate_content(self, model, contents, config):
+        if len(contents) == 1:
+            return _model_response([types.Part.from_function_call(name=name, args={}) for name in self.calls])
+        self.function_responses = [part.function_response.name for part in contents[-1].parts]
+        return _model_response([types.Part.from_text(text="Your briefing, Sir.")])
+
+
+def test_tools_run_without_blocking_the_event_loop(monkeypatch):
+    """Blocking tools go to a worker thread; coroutine tools are awaited on the loop."""
+    ran_on = {}
+    release = threading.Event()
+
+    def blocking_tool(location, temperature="C"):
+        ran_on["blocking"] = threading.get_ident()
+        # Released by a loop callback, which can only run while the loop is free
+        return "released" if release.wait(timeout=5) else "stuck"
+
+    async def async_tool(light_name=None):
+        ran_on["async"] = threading.get_ident()
+        return {"success": True}
+
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_weather", blocking_tool)
+    monkeypatch.setitem(core.brain.ASYNC_TOOL_FUNCTIONS, "turn_off_light", async_tool)
+    brain = Brain()
+
+    async def run():
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        blocking = await brain._execute_tool("get_weather", {"location": "Paris"})
+        lights = await brain._execute_tool("turn_off_light", {})
+        return blocking, lights
+
+    assert asyncio.run(run()) == ("released", {"success": True})
+    assert ran_on["blocking"] != threading.get_ident()
+    assert ran_on["async"] == threading.get_ident()
+
+
+def test_timings_from_worker_threads_all_count():
+    ctx = GenerationContext(query="Hello")
+
+    def synthesize():
+        for _ in range(2000):
+            ctx.add_timing("tts_synthesis", 1.0)
+
+    threads = [threading.Thread(target=synthesize) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ctx.timings["tts_synthesis"] == 16000.0
+
+
+def test_function_calls_in_one_turn_run_concurrently(monkeypatch):
+    """Independent tools overlap; tools on the same resource keep their order."""
+    log = []
+    # Only passable once weather, calendar and add_task are all running at once
+    independent = threading.Barrier(3, timeout=5)
+
+    def tool_for(name):
+        def tool(**kwargs):
+            log.append(f"start {name}")
+            if name != "complete_task":
+                independent.wait()
+            log.append(f"end {name}")
+            return f"{name} done"
+        return tool
+
+    calls = ["get_weather", "get_calendar_events", "add_task", "complete_task"]
+    for name in calls:
+        monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, name, tool_for(name))
+
+    brain = Brain()
+    brain.client = _FakeClient()
+    brain.client.aio.models = _BriefingModels(calls)
+    monkeypatch.setattr(brain, "_process_tool_call_for_hud", lambda name, args, result: [{"title": name}])
+
+    result = asyncio.run(brain.generate("Morning briefing"))
+
+    # weather, calendar and add_task overlap; complete_task waits for add_task
+    assert not independent.broken
+    assert sorted(entry for entry in log if entry.startswith("end")) == sorted(f"end {name}" for name in calls)
+    assert log.index("end add_task") < log.index("start complete_task")
+    assert brain.client.aio.models.function_responses == calls
+    assert [section["title"] for section in result["hud_sections"]] == calls
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
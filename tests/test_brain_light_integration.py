@@ -47,19 +47,20 @@ def test_light_result_handling():
     ]
     
     print("\n✓ Testing dict result handling...")
+    hud_sections = []
     for test in test_results:
         try:
             # Test the HUD processing
-            brain._process_tool_call_for_hud(test["name"], test["args"], test["result"])
+            hud_sections.extend(brain._process_tool_call_for_hud(test["name"], test["args"], test["result"]))
             print(f"  ✓ {test['name']}: SUCCESS")
         except Exception as e:
             print(f"  ✗ {test['name']}: FAILED - {e}")
             return False
     
     # Check HUD sections were created
-    if len(brain.hud_sections) > 0:
-        print(f"\n✓ HUD sections created: {len(brain.hud_sections)}")
-        for section in brain.hud_sections:
+    if len(hud_sections) > 0:
+        print(f"\n✓ HUD sections created: {len(hud_sections)}")
+        for section in hud_sections:
             print(f"  - {section['title']}")
     else:
         print("\n⚠ No HUD sections created (this is OK)")
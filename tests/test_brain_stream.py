@@ -0,0 +1,85 @@
+"""
+Tests for Brain.generate_stream: both turns streamed, tools started as
+soon as their function-call part arrives.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+import core.brain
+from core.context import GenerationContext
+
+
+def _chunk(part):
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[part]))]
+    )
+
+
+class _StreamingModels:
+    """Round 1 streams two function calls 0.2s apart; round 2 streams the answer."""
+
+    def __init__(self):
+        self.round1_finished_at = None
+        self.round2_contents = None
+
+    async def generate_content_stream(self, model, contents, config):
+        async def round1():
+            yield _chunk(types.Part.from_function_call(name="get_time", args={}))
+            await asyncio.sleep(0.2)
+            yield _chunk(types.Part.from_function_call(name="get_date", args={}))
+            self.round1_finished_at = time.perf_counter()
+
+        async def round2():
+            self.round2_contents = contents
+            for text in ["It is noon, ", "Sir."]:
+                yield _chunk(types.Part.from_text(text=text))
+
+        return round1() if len(contents) == 1 else round2()
+
+
+def test_tools_start_before_the_first_turn_finishes(monkeypatch, make_brain):
+    started = {}
+
+    def tool(name, result):
+        def run():
+            started[name] = time.perf_counter()
+            return result
+        return run
+
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_time", tool("get_time", "12:00 PM WIB"))
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_date", tool("get_date", "Saturday"))
+
+    models = _StreamingModels()
+    brain = make_brain(models)
+    monkeypatch.setattr(brain, "_process_tool_call_for_hud", lambda name, args, result: [{"title": name}])
+
+    async def collect():
+        ctx = GenerationContext(query="What time and day is it?")
+        events = [event async for event in brain.generate_stream("What time and day is it?", ctx)]
+        return ctx, events
+
+    ctx, events = asyncio.run(collect())
+
+    assert started["get_time"] < models.round1_finished_at
+    assert [event for event, _ in events[:2]] == ["tool_started", "tool_started"]
+    # HUD rendering overlaps the second turn, so sections may arrive between text chunks
+    assert sorted(event for event, _ in events[2:]) == ["hud_section", "hud_section", "text_delta", "text_delta"]
+    assert [data["title"] for event, data in events if event == "hud_section"] == ["get_time", "get_date"]
+    assert ctx.response == "It is noon, Sir."
+    # The model turn is replayed with both calls, followed by both responses
+    model_turn, responses = models.round2_contents[1], models.round2_contents[2]
+    assert [part.function_call.name for part in model_turn.parts] == ["get_time", "get_date"]
+    assert [part.function_response.name for part in responses.parts] == ["get_time", "get_date"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
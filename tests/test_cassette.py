@@ -0,0 +1,145 @@
+"""
+Tests for record/replay cassettes (core/cassette.py): a turn recorded
+against fake services replays offline with the same reply and HUD.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import requests
+from google.genai import types
+
+import core.brain
+from core.cassette import Cassette, CassetteMissError
+from core.cassette import main as cassette_cli
+from core.context import GenerationContext
+from settings.config_loader import config
+
+QUERY = "What's the weather in Jakarta?"
+
+WEATHER = {
+    "name": "Jakarta", "sys": {"country": "ID", "sunrise": 1760000000, "sunset": 1760040000},
+    "main": {"temp": 31.26, "feels_like": 35.0, "humidity": 66, "pressure": 1009},
+    "weather": [{"description": "scattered clouds", "icon": "03d"}],
+    "wind": {"speed": 3.1}, "clouds": {"all": 40}, "visibility": 10000
+}
+
+
+class _WeatherModels:
+    """Asks for the weather, then answers."""
+
+    async def generate_content(self, model, contents, config):
+        if len(contents) == 1:
+            return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+                role="model", parts=[types.Part.from_function_call(name="get_weather", args={"location": "Jakarta"})]
+            ))])
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+            role="model", parts=[types.Part.from_text(text="Scattered clouds and 31 degrees, Sir.")]
+        ))])
+
+
+class _Offline:
+    async def generate_content(self, model, contents, config):
+        raise AssertionError("replay reached the model")
+
+
+def _generate(brain, query=QUERY):
+    ctx = GenerationContext(query=query)
+    return asyncio.run(brain.generate(query, ctx))
+
+
+@pytest.fixture
+def recorded(monkeypatch, tmp_path, make_brain):
+    """Path of a cassette of QUERY recorded against fake Gemini and OpenWeather, and the recorded reply."""
+    original_get = config.get
+    monkeypatch.setattr(config, "get", lambda key, default=None: "secret-key" if key == "api_keys.openweather" else original_get(key, default))
+
+    def weather_api(session, method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(WEATHER).encode()
+        return response
+
+    monkeypatch.setattr(requests.sessions.Session, "request", weather_api)
+    brain = make_brain(_WeatherModels())
+    cassette = Cassette()
+    with cassette.recording(brain):
+        result = _generate(brain)
+    cassette.queries = [QUERY]
+    path = tmp_path / "weather.json"
+    cassette.save(str(path))
+
+    def offline(session, method, url, **kwargs):
+        raise AssertionError(f"replay reached the network: {url}")
+
+    monkeypatch.setattr(requests.sessions.Session, "request", offline)
+    return path, result
+
+
+def test_replay_matches_the_recording_offline(recorded, make_brain):
+    path, result = recorded
+    assert "secret-key" not in path.read_text() and "appid=REDACTED" in path.read_text()
+
+    brain = make_brain(_Offline())
+    cassette = Cassette.load(str(path), latency="none")
+    with cassette.replaying(brain):
+        replayed = _generate(brain)
+
+    assert replayed == result
+    assert [section["title"] for section in replayed["hud_sections"]][1] == "Weather - Jakarta, ID"
+    assert cassette.misses == []
+
+
+def test_injected_latency_applies_to_every_exchange(recorded, monkeypatch, make_brain):
+    path, _ = recorded
+    brain = make_brain(_Offline())
+    cassette = Cassette.load(str(path), latency=0.1)
+    delays = []
+    original_delay = cassette.delay
+
+    def delay(recorded):
+        delays.append(original_delay(recorded))
+        return delays[-1]
+
+    monkeypatch.setattr(cassette, "delay", delay)
+    with cassette.replaying(brain):
+        start = time.perf_counter()
+        _generate(brain)
+        elapsed = time.perf_counter() - start
+
+    # Two model calls and the weather request, each delayed by the injected latency
+    assert delays == [0.1, 0.1, 0.1]
+    # The two model calls are sequential (the weather request overlaps the first)
+    assert elapsed >= 0.2
+
+
+def test_unrecorded_requests_are_reported(recorded, make_brain):
+    path, _ = recorded
+    brain = make_brain(_Offline())
+    cassette = Cassette.load(str(path), latency="none")
+    with cassette.replaying(brain), pytest.raises(CassetteMissError):
+        _generate(brain, "What's the weather in Bandung?")
+    assert "model" in [kind for kind, _ in cassette.misses]
+
+
+
+def test_bench_fails_when_runs_raise(recorded, monkeypatch, capsys):
+    path, _ = recorded
+
+    async def failing_generate(self, query, ctx=None):
+        raise RuntimeError("tool crashed")
+
+    monkeypatch.setattr(core.brain.Brain, "generate", failing_generate)
+
+    assert cassette_cli(["bench", str(path), "--runs", "3", "--concurrency", "2", "--latency", "none"]) == 1
+    assert "3 of 3 run(s) raised, e.g. RuntimeError: tool crashed" in capsys.readouterr().out
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
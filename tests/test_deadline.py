@@ -0,0 +1,173 @@
+"""
+Tests for the per-request latency budget (core/deadline.py) and how
+Brain and the tools honour it.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+import core.brain
+from core.context import GenerationContext
+from core.deadline import http_timeout, remaining, request_deadline
+from core.metrics import TOOL_DEADLINE_EXCEEDED, TOOL_ERRORS
+from core.tools import ToolResult
+from core.tools import search_tool
+
+
+def test_http_timeouts_shrink_with_the_budget():
+    assert remaining() is None and http_timeout(10) == 10
+    with request_deadline(2):
+        assert 1.5 < http_timeout(10) <= 2
+        assert http_timeout(0.5) == 0.5
+    assert remaining() is None
+
+
+class _WeatherThenAnswer:
+    """Asks for the weather, then echoes the function response it got back."""
+
+    def __init__(self):
+        self.function_response = None
+
+    async def generate_content(self, model, contents, config):
+        if len(contents) == 1:
+            return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+                role="model", parts=[types.Part.from_function_call(name="get_weather", args={"location": "Jakarta"})]
+            ))])
+        self.function_response = contents[-1].parts[0].function_response.response
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+            role="model", parts=[types.Part.from_text(text="The weather service is slow right now, Sir.")]
+        ))])
+
+
+def test_slow_tools_are_cut_off_and_reported_missing(monkeypatch, make_brain):
+    seen_timeouts = []
+
+    def slow_weather(location, temperature="C"):
+        # The budget reaches the worker thread blocking tools run in
+        seen_timeouts.append(http_timeout(10))
+        time.sleep(1)
+        return "Sunny"
+
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_weather", slow_weather)
+    models = _WeatherThenAnswer()
+    brain = make_brain(models)
+    brain.round2_reserve = 0.2
+    cancelled_before = TOOL_DEADLINE_EXCEEDED.value(tool="get_weather", outcome="cancelled")
+
+    async def run():
+        ctx = GenerationContext(query="What's the weather in Jakarta?")
+        start = time.perf_counter()
+        with request_deadline(0.5):
+            result = await brain.generate(ctx.query, ctx)
+        return ctx, result, time.perf_counter() - start
+    ctx, result, elapsed = asyncio.run(run())
+
+    assert elapsed < 0.8
+    assert seen_timeouts and seen_timeouts[0] <= 0.5
+    assert result["response"] == "The weather service is slow right now, Sir."
+    assert "missing" in models.function_response["error"]
+    assert ctx.tool_results[0].error == "Timed out"
+    assert TOOL_DEADLINE_EXCEEDED.value(tool="get_weather", outcome="cancelled") == cancelled_before + 1
+
+
+def test_tool_side_timeouts_are_reported_as_tool_errors(monkeypatch, make_brain):
+    def timing_out_weather(location, temperature="C"):
+        # e.g. the weather API's socket timing out well inside the budget
+        raise TimeoutError("weather API read timed out")
+
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_weather", timing_out_weather)
+    models = _WeatherThenAnswer()
+    brain = make_brain(models)
+    cancelled_before = TOOL_DEADLINE_EXCEEDED.value(tool="get_weather", outcome="cancelled")
+    errors_before = TOOL_ERRORS.value(tool="get_weather")
+
+    async def run():
+        ctx = GenerationContext(query="What's the weather in Jakarta?")
+        with request_deadline(5):
+            await brain.generate(ctx.query, ctx)
+        return ctx
+    ctx = asyncio.run(run())
+
+    assert models.function_response == {"error": "weather API read timed out"}
+    assert ctx.tool_results[0].error == "weather API read timed out"
+    assert TOOL_ERRORS.value(tool="get_weather") == errors_before + 1
+    assert TOOL_DEADLINE_EXCEEDED.value(tool="get_weather", outcome="cancelled") == cancelled_before
+
+
+class _SearchResponse:
+    status_code = 200
+
+    def json(self):
+        return {"results": [
+            {"title": "First", "url": "http://example.com/1", "content": "One"},
+            {"title": "Second", "url": "http://example.com/2", "content": "Two"}
+        ]}
+
+
+def test_search_returns_partial_results_when_out_of_time(monkeypatch):
+    monkeypatch.setattr(search_tool.requests, "get", lambda *args, **kwargs: _SearchResponse())
+
+    with request_deadline(search_tool.ARTICLE_MIN_SECONDS / 2):
+        result = search_tool.search_web_result("python", max_results=2, fetch_content=True)
+
+    assert result.partial
+    assert result.data["unread"] == ["First", "Second"]
+    assert "could not be read" in result.text and "Content:" not in result.text
+
+
+
+class _SearchThenAnswer:
+    """Asks for a web search, then keeps the function response it got back."""
+
+    def __init__(self):
+        self.function_response = None
+
+    async def generate_content(self, model, contents, config):
+        if len(contents) == 1:
+            return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+                role="model", parts=[types.Part.from_function_call(name="search_web", args={"query": "python"})]
+            ))])
+        self.function_response = contents[-1].parts[0].function_response.response
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+            role="model", parts=[types.Part.from_text(text="Here is what I found, Sir.")]
+        ))])
+
+
+def test_slow_search_reaches_the_model_with_partial_results(monkeypatch, make_brain):
+    def slow_get(url, *args, **kwargs):
+        if "localhost:8888" in url:
+            return _SearchResponse()
+        time.sleep(0.5)
+        return type("Page", (), {"status_code": 404})()
+
+    monkeypatch.setattr(search_tool.requests, "get", slow_get)
+    models = _SearchThenAnswer()
+    brain = make_brain(models)
+    brain.round2_reserve = 0.5
+    brain.tool_grace = 0.2
+
+    async def run():
+        ctx = GenerationContext(query="Search the web for python")
+        # Tools must wrap up by 1.3s: one article fits, the second doesn't
+        with request_deadline(2):
+            await brain.generate(ctx.query, ctx)
+        return ctx
+    ctx = asyncio.run(run())
+
+    record = ctx.tool_results[0]
+    assert record.error is None
+    assert isinstance(record.result, ToolResult) and record.result.partial
+    assert record.result.data["unread"] == ["Second"]
+    assert "could not be read" in models.function_response["result"]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,46 @@
+"""
+Tests for POST /generate (main.py): sessions and the response cache.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from core.response_cache import ResponseCache
+
+
+def test_standalone_questions_hit_the_cache_within_a_session(main, monkeypatch):
+    generated = []
+
+    async def generate(query, ctx):
+        generated.append(query)
+        ctx.response = f"Answer to {query}"
+        return {"response": ctx.response, "hud_sections": []}
+
+    async def no_audio(text, ctx=None):
+        return None
+
+    monkeypatch.setattr(main.brain, "generate", generate)
+    monkeypatch.setattr(main, "_synthesize_to_store", no_audio)
+    monkeypatch.setattr(main, "response_cache", ResponseCache())
+    client = TestClient(main.app)
+
+    def ask(query, session_id):
+        return client.post("/generate", json={"query": query, "session_id": session_id}).json()
+
+    session_id = ask("Good morning", "new")["session_id"]
+    assert ask("What is the capital of France?", session_id)["cached"] is False
+    assert ask("And Germany?", session_id)["cached"] is False
+    # Asked again later in the conversation, the standalone question is cached
+    assert ask("What is the capital of France?", session_id)["cached"] is True
+    assert generated == ["Good morning", "What is the capital of France?", "And Germany?"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,130 @@
+"""
+Tests for the local intent fast path (core/intents.py) and templated
+replies (core/responses.py) that skip model calls.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from google.genai import types
+
+import core.brain
+from core.context import GenerationContext
+from core.intents import INTENT_PATTERNS, IntentMatcher
+from core.metrics import FAST_PATH_REQUESTS, MODEL_CALLS_SAVED
+from core.responses import RESPONSE_TEMPLATES
+
+
+def test_matcher_recognizes_deterministic_commands():
+    matcher = IntentMatcher(min_confidence=0.9)
+    assert matcher.match("Hey Aura, what's the time?").tool == "get_time"
+    assert matcher.match("Turn off the lights please").tool == "turn_off_light"
+    assert matcher.match("Can you show me my to-do list?").tool == "get_tasks"
+
+    brightness = matcher.match("Set brightness to 50%")
+    assert brightness.tool == "set_brightness"
+    assert brightness.args == {"brightness": 128}
+
+
+def test_matcher_leaves_ambiguous_queries_to_the_model():
+    matcher = IntentMatcher(min_confidence=0.9)
+    # Partial coverage: the light's name / the city need the model
+    assert matcher.score("turn off the light in the kitchen").confidence < 0.9
+    assert matcher.match("turn off the light in the kitchen") is None
+    assert matcher.match("what time is it in London") is None
+    assert matcher.match("set brightness to 150%") is None
+    assert matcher.match("what's the weather like?") is None
+
+
+def test_every_intent_tool_has_a_reply_template():
+    for _, tool, _, _ in INTENT_PATTERNS:
+        assert tool in RESPONSE_TEMPLATES
+
+
+class _NoModel:
+    async def generate_content(self, model, contents, config):
+        raise AssertionError("fast path must not call the model")
+
+
+def test_fast_path_answers_without_the_model(monkeypatch, make_brain):
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_time", lambda: "9:15 AM WIB")
+    brain = make_brain(_NoModel(), intents=True)
+    hits_before = FAST_PATH_REQUESTS.value(outcome="hit")
+
+    ctx = GenerationContext(query="What time is it?")
+    result = asyncio.run(brain.generate("What time is it?", ctx))
+
+    assert result["response"] == "It is 9:15 AM WIB, Sir."
+    assert [section["title"] for section in result["hud_sections"]] == ["Current Date & Time"]
+    assert [record.name for record in ctx.tool_results] == ["get_time"]
+    assert "fast_path" in ctx.timings and "llm_round1" not in ctx.timings
+    assert FAST_PATH_REQUESTS.value(outcome="hit") == hits_before + 1
+
+
+
+class _OneRoundModels:
+    """Requests the given calls in round 1 and fails if asked for round 2."""
+
+    def __init__(self, calls):
+        self.calls = calls
+        self.rounds = 0
+
+    async def generate_content(self, model, contents, config):
+        self.rounds += 1
+        if len(contents) > 1:
+            return types.GenerateContentResponse(candidates=[types.Candidate(
+                content=types.Content(role="model", parts=[types.Part.from_text(text="Model reply, Sir.")])
+            )])
+        parts = [types.Part.from_function_call(name=name, args=args) for name, args in self.calls]
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(role="model", parts=parts))])
+
+
+@pytest.fixture
+def brain_with(make_brain):
+    """Factory for a Brain with the fast path on and HUD rendering stubbed out."""
+    def make(models):
+        brain = make_brain(models, intents=True)
+        brain._process_tool_call_for_hud = lambda name, args, result: []
+        return brain
+    return make
+
+
+def test_templated_tools_skip_the_second_model_round(monkeypatch, brain_with):
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "add_task", lambda title: f"Task added: '{title}'.")
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_time", lambda: "9:15 AM WIB")
+    models = _OneRoundModels([("add_task", {"title": "Buy milk"}), ("get_time", {})])
+    brain = brain_with(models)
+    saved_before = MODEL_CALLS_SAVED.value(reason="template")
+
+    result = asyncio.run(brain.generate("Remind me to buy milk and tell me the time"))
+
+    assert models.rounds == 1
+    assert result["response"] == "I've added 'Buy milk' to your list, Sir. It is 9:15 AM WIB, Sir."
+    assert MODEL_CALLS_SAVED.value(reason="template") == saved_before + 1
+
+
+def test_untemplated_or_disabled_tools_use_the_model(monkeypatch, brain_with):
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "add_task", lambda title: f"Task added: '{title}'.")
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_date", lambda: "Saturday")
+
+    # get_date has no template, so the model phrases the combined answer
+    models = _OneRoundModels([("add_task", {"title": "Buy milk"}), ("get_date", {})])
+    assert asyncio.run(brain_with(models).generate("Add milk, what day is it?"))["response"] == "Model reply, Sir."
+    assert models.rounds == 2
+
+    # Removing a tool from responses.templated_tools turns its template off
+    models = _OneRoundModels([("add_task", {"title": "Buy milk"})])
+    brain = brain_with(models)
+    brain.templated_tools.discard("add_task")
+    assert asyncio.run(brain.generate("Add milk"))["response"] == "Model reply, Sir."
+    assert models.rounds == 2
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,82 @@
+"""
+Tests for token-budgeted conversation memory (core/memory.py) and sessions.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.memory import ConversationMemory
+from core.session import SessionStore
+
+
+def test_recent_turns_are_kept_verbatim():
+    memory = ConversationMemory(token_budget=2000, summary_budget=500)
+    memory.record_turn("Show my tasks", "You have 2 tasks, Sir: Buy milk and Call mom.")
+    memory.record_turn("Mark that one done", "I've marked 'Call mom' as complete, Sir.")
+
+    contents = memory.to_contents()
+    assert [content.role for content in contents] == ["user", "model", "user", "model"]
+    assert contents[1].parts[0].text == "You have 2 tasks, Sir: Buy milk and Call mom."
+    assert memory.turn_count == 2
+
+
+def test_history_stays_within_budget_over_long_sessions():
+    memory = ConversationMemory(token_budget=600, summary_budget=150, min_recent_turns=2)
+    sizes = []
+    for index in range(200):
+        memory.record_turn(f"Question number {index}? " + "detail " * 20, f"Answer {index}, Sir. " + "more " * 40)
+        sizes.append(memory.tokens)
+
+    assert max(sizes[20:]) <= 600
+    contents = memory.to_contents()
+    summary = contents[0].parts[0].text
+    assert summary.startswith("Summary of our earlier conversation:")
+    assert "earlier exchanges omitted" in summary
+    # The newest turn is verbatim, the oldest are compacted away
+    assert contents[-2].parts[0].text.startswith("Question number 199?")
+    assert "Question number 0?" not in summary
+
+
+def test_summary_keeps_roles_alternating():
+    memory = ConversationMemory(token_budget=400, summary_budget=150, min_recent_turns=1)
+    for index in range(20):
+        memory.record_turn(f"Question number {index}? " + "detail " * 20, f"Answer {index}, Sir. " + "more " * 40)
+
+    contents = memory.to_contents()
+    roles = [content.role for content in contents]
+    assert roles == ["user", "model"] * (len(contents) // 2)
+    # The summary rides along with the first user turn, ahead of its query
+    assert contents[0].parts[0].text.startswith("Summary of our earlier conversation:")
+    assert len(contents[0].parts) == 2
+    assert contents[0].parts[-1].text.startswith("Question number")
+
+
+def test_session_store_resumes_and_expires_sessions():
+    store = SessionStore(ttl_seconds=60, max_sessions=2)
+    first = store.create(voice="cori")
+    first.record_turn("Hello", "Good evening, Sir.")
+
+    assert store.get_or_create(first.session_id) is first
+    assert store.get_or_create("unknown").session_id != first.session_id
+    store.create()
+    # max_sessions=2: the least recently used session was dropped
+    assert store.get(first.session_id) is None
+    assert len(store) == 2
+
+
+def test_turns_without_reply_text_are_not_recorded():
+    # e.g. the model asked for another tool in round 2 and never answered
+    session = SessionStore().create(voice="cori")
+    session.record_turn("Check the lights", None)
+    session.record_turn("Hello", "Good evening, Sir.")
+
+    assert session.memory.turn_count == 1
+    assert [content.parts[0].text for content in session.history] == ["Hello", "Good evening, Sir."]
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,46 @@
+"""
+Tests for the Prometheus-style metrics in core/metrics.py.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test latency", ["stage"], buckets=[0.1, 1.0])
+    histogram.observe(0.05, stage="llm")
+    histogram.observe(0.5, stage="llm")
+    histogram.observe(5, stage="llm")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE test_seconds histogram" in lines
+    assert 'test_seconds_bucket{stage="llm",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="llm",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="llm",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="llm"} 3' in lines
+    assert histogram.stats(stage="llm") == (5.55, 3)
+
+
+def test_counter_labels_are_escaped_and_validated():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter", ["tool"])
+    counter.inc(tool='say "hi"')
+    counter.inc(2, tool='say "hi"')
+
+    assert 'test_total{tool="say \\"hi\\""} 3' in registry.render()
+    try:
+        counter.inc(other="x")
+        raise AssertionError("unknown label should be rejected")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
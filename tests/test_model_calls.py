@@ -0,0 +1,195 @@
+"""
+Tests for retries, backoff and hedging of model calls (core/model_calls.py).
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import errors as genai_errors
+
+import core.admission
+from core.admission import OverloadedError, StageLimiter
+from core.metrics import MODEL_HEDGES, MODEL_RETRIES, MODEL_RETRIES_EXHAUSTED
+from core.model_calls import ModelCaller, ModelUnavailableError
+
+
+def _error(code):
+    status = "RESOURCE_EXHAUSTED" if code == 429 else "UNAVAILABLE"
+    error_type = genai_errors.ClientError if code < 500 else genai_errors.ServerError
+    return error_type(code, {"error": {"code": code, "message": "try again", "status": status}})
+
+
+class _Flaky:
+    """Fails with the given errors, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_transient_errors_are_retried():
+    caller = ModelCaller(max_attempts=3, base_delay=0.01)
+    request = _Flaky(_error(429), _error(503))
+    retries_before = MODEL_RETRIES.value(reason="429")
+
+    assert asyncio.run(caller.call(request)) == "ok"
+    assert request.calls == 3
+    assert MODEL_RETRIES.value(reason="429") == retries_before + 1
+
+
+def test_exhausted_retries_are_served_as_503():
+    caller = ModelCaller(max_attempts=2, base_delay=0.01)
+    request = _Flaky(_error(503), _error(503), _error(503))
+    exhausted_before = MODEL_RETRIES_EXHAUSTED.value(reason="503")
+
+    try:
+        asyncio.run(caller.call(request))
+        raise AssertionError("exhausted retries should raise")
+    except ModelUnavailableError as e:
+        assert isinstance(e, OverloadedError)
+        assert e.status_code == 503 and e.retry_after >= 1
+    assert request.calls == 2
+    assert MODEL_RETRIES_EXHAUSTED.value(reason="503") == exhausted_before + 1
+
+
+def test_permanent_errors_are_not_retried():
+    caller = ModelCaller(max_attempts=3, base_delay=0.01)
+    request = _Flaky(_error(400))
+
+    try:
+        asyncio.run(caller.call(request))
+        raise AssertionError("a 400 should be raised unchanged")
+    except genai_errors.ClientError as e:
+        assert e.code == 400
+    assert request.calls == 1
+
+
+def test_deadline_bounds_retries():
+    caller = ModelCaller(max_attempts=10, base_delay=0.01, deadline=0.2, attempt_timeout=0.05)
+
+    async def hang():
+        await asyncio.Event().wait()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await caller.call(hang)
+            raise AssertionError("hanging calls should time out")
+        except ModelUnavailableError:
+            pass
+        return loop.time() - start
+    # Bounded by the 0.2s deadline, not by the hanging request
+    assert asyncio.run(run()) < 2.0
+
+
+def test_slow_requests_are_hedged():
+    caller = ModelCaller(hedge=True, hedge_min_delay=0.01, hedge_min_samples=3)
+    caller._latencies.extend([0.02, 0.02, 0.02])
+    calls, cancelled = [], []
+    fired_before = MODEL_HEDGES.value(outcome="fired")
+    won_before = MODEL_HEDGES.value(outcome="won")
+
+    async def request():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            # The primary never answers; only the hedged request can finish the call
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append("primary")
+                raise
+        return "backup"
+
+    assert asyncio.run(caller.call(request)) == "backup"
+    assert calls == [0, 1] and cancelled == ["primary"]
+    assert MODEL_HEDGES.value(outcome="fired") == fired_before + 1
+    assert MODEL_HEDGES.value(outcome="won") == won_before + 1
+
+
+def _test_stage(monkeypatch):
+    limiter = StageLimiter("test_llm", concurrency=1, queue_size=10, queue_timeout=1.0)
+    monkeypatch.setitem(core.admission.limiters, "test_llm", limiter)
+    return limiter
+
+
+def test_backoff_does_not_hold_a_slot(monkeypatch):
+    limiter = _test_stage(monkeypatch)
+    active_in_request, active_in_backoff = [], []
+
+    class Caller(ModelCaller):
+        def _backoff(self, attempt):
+            active_in_backoff.append(limiter.active)
+            return 0.0
+
+    caller = Caller(max_attempts=3, stage="test_llm")
+    request = _Flaky(_error(503), _error(503))
+
+    async def counted():
+        active_in_request.append(limiter.active)
+        return await request()
+
+    assert asyncio.run(caller.call(counted)) == "ok"
+    assert active_in_request == [1, 1, 1]
+    assert active_in_backoff == [0, 0]
+    assert limiter.active == 0
+
+
+def test_stream_slot_is_released_once_upstream_is_read(monkeypatch):
+    limiter = _test_stage(monkeypatch)
+    caller = ModelCaller(stage="test_llm")
+
+    async def upstream():
+        for chunk in ["a", "b", "c"]:
+            yield chunk
+
+    async def open_stream():
+        return upstream()
+
+    async def run():
+        chunks = await caller.stream(open_stream)
+        assert limiter.active == 1
+        # Nothing consumed yet: the slot frees once the model is done sending
+        for _ in range(10):
+            if limiter.active == 0:
+                break
+            await asyncio.sleep(0)
+        active_before_consuming = limiter.active
+        return active_before_consuming, [chunk async for chunk in chunks]
+
+    assert asyncio.run(run()) == (0, ["a", "b", "c"])
+
+
+def test_abandoned_stream_releases_its_slot(monkeypatch):
+    limiter = _test_stage(monkeypatch)
+    caller = ModelCaller(stage="test_llm")
+
+    async def upstream():
+        yield "a"
+        await asyncio.Event().wait()
+
+    async def open_stream():
+        return upstream()
+
+    async def run():
+        chunks = await caller.stream(open_stream)
+        assert await chunks.__anext__() == "a"
+        await chunks.aclose()
+        return limiter.active
+
+    assert asyncio.run(run()) == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
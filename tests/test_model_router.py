@@ -0,0 +1,79 @@
+"""
+Tests for fast/capable model tier routing (core/model_router.py).
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+from core.metrics import MODEL_TIER_TOKENS, MODEL_TIER_TURNS
+from core.model_router import ModelRouter
+from core.tool_router import ToolRouter
+
+TIERS = {"fast": "gemini-fast", "capable": "gemini-capable"}
+
+
+def test_simple_and_tool_only_turns_use_the_fast_model():
+    router = ModelRouter(TIERS)
+    assert router.choose("Turn on the bedroom light").tier == "fast"
+    assert router.choose("Add a task to buy milk").tier == "fast"
+    assert router.choose("What's the weather in Jakarta?").model == "gemini-fast"
+
+
+def test_open_ended_and_search_turns_escalate():
+    router = ModelRouter(TIERS, long_query_words=12)
+    assert router.choose("Search for the latest AI news").reason == "search"
+    assert router.choose("Why is the sky blue?").reason == "open_ended"
+    assert router.choose("I am planning a trip with my family next month and wonder about the trains").reason == "long_query"
+    # A follow-up to a search stays on the capable model
+    assert router.choose("And the second one?", "Look up the best Python courses").tier == "capable"
+
+
+
+def test_turns_reaching_search_only_through_the_fallback_stay_fast():
+    router = ModelRouter(TIERS)
+    for query in ["Hello AURA, how are you?", "Thank you", "Good morning", "Tell me a joke"]:
+        # The tool router still declares search for these, as its fallback
+        assert "search" in ToolRouter().select(query) and not ToolRouter.matched_groups(query)
+        choice = router.choose(query)
+        assert (choice.tier, choice.reason) == ("fast", "simple")
+    # A follow-up nothing matched gets every group declared, but stays fast too
+    assert router.choose("Turn it off", "I can't see a thing").tier == "fast"
+
+
+class _RecordingModels:
+    def __init__(self):
+        self.models = []
+
+    async def generate_content(self, model, contents, config):
+        self.models.append(model)
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text="Certainly, Sir.")]))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(prompt_token_count=100, candidates_token_count=5)
+        )
+
+
+def test_brain_sends_each_turn_to_its_tier(make_brain):
+    models = _RecordingModels()
+    brain = make_brain(models)
+    brain.model_router = ModelRouter(TIERS)
+    turns_before = MODEL_TIER_TURNS.value(tier="capable", reason="open_ended")
+    tokens_before = MODEL_TIER_TOKENS.value(tier="fast", kind="prompt")
+
+    asyncio.run(brain.generate("Dim the lights a little"))
+    asyncio.run(brain.generate("Why is the sky blue?"))
+    asyncio.run(brain.generate("Hello AURA, how are you?"))
+
+    assert models.models == ["gemini-fast", "gemini-capable", "gemini-fast"]
+    assert MODEL_TIER_TURNS.value(tier="capable", reason="open_ended") == turns_before + 1
+    assert MODEL_TIER_TOKENS.value(tier="fast", kind="prompt") == tokens_before + 200
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
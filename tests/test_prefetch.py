@@ -0,0 +1,91 @@
+"""
+Tests for speculative tool prefetch (core/prefetch.py) and its use in Brain.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+import core.brain
+from core.context import GenerationContext
+from core.metrics import PREFETCH_CALLS
+from core.prefetch import call_key, predict_calls
+
+
+def test_predicts_only_unambiguous_read_only_calls():
+    [weather] = predict_calls("What's the weather in Bandung today?")
+    assert weather.name == "get_weather" and weather.args == {"location": "Bandung"}
+    [calendar] = predict_calls("What's my next meeting?")
+    assert calendar.name == "get_calendar_events" and calendar.args == {"max_results": 1}
+
+    assert predict_calls("Add buy milk to my tasks") == []
+    assert predict_calls("Weather and my schedule for today") == []
+    assert predict_calls("Turn on the lights") == []
+
+
+def test_call_keys_compare_after_defaults():
+    assert call_key("get_weather", {"location": "Bandung"}) == call_key(
+        "get_weather", {"location": "bandung ", "temperature": "C"}
+    )
+    assert call_key("get_calendar_events", {"max_results": 5.0}) == call_key("get_calendar_events", {})
+    assert call_key("get_weather", {"city": "Bandung"}) is None
+
+
+class _AskForWeather:
+    """Asks for the weather in `location`, then answers."""
+
+    def __init__(self, location):
+        self.location = location
+
+    async def generate_content(self, model, contents, config):
+        if len(contents) == 1:
+            await asyncio.sleep(0.05)
+            return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+                role="model", parts=[types.Part.from_function_call(name="get_weather", args={"location": self.location})]
+            ))])
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+            role="model", parts=[types.Part.from_text(text="Sunny, Sir.")]
+        ))])
+
+
+def _run(monkeypatch, make_brain, location):
+    calls = []
+
+    def weather(location, temperature="C"):
+        calls.append(location)
+        return f"Sunny in {location}"
+
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_weather", weather)
+    brain = make_brain(_AskForWeather(location))
+
+    ctx = GenerationContext(query="What's the weather in Bandung?")
+    asyncio.run(brain.generate(ctx.query, ctx))
+    return calls, ctx
+
+
+def test_matching_prediction_is_reused(monkeypatch, make_brain):
+    hits = PREFETCH_CALLS.value(tool="get_weather", outcome="hit")
+    calls, ctx = _run(monkeypatch, make_brain, "Bandung")
+
+    assert calls == ["Bandung"]
+    assert ctx.tool_results[0].result == "Sunny in Bandung"
+    assert PREFETCH_CALLS.value(tool="get_weather", outcome="hit") == hits + 1
+
+
+def test_mismatched_prediction_is_wasted(monkeypatch, make_brain):
+    wasted = PREFETCH_CALLS.value(tool="get_weather", outcome="wasted")
+    calls, ctx = _run(monkeypatch, make_brain, "Jakarta")
+
+    assert calls == ["Bandung", "Jakarta"]
+    assert ctx.tool_results[0].result == "Sunny in Jakarta"
+    assert PREFETCH_CALLS.value(tool="get_weather", outcome="wasted") == wasted + 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
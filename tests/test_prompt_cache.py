@@ -0,0 +1,159 @@
+"""
+Tests for Gemini context caching of the static prompt prefix (core/prompt_cache.py).
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from core.metrics import LLM_CACHED_TOKENS, PROMPT_CACHE_EVENTS
+from core.prompt_cache import PromptCache
+
+
+class _FakeCaches:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.created = []
+
+    async def create(self, model, config):
+        if self.fail:
+            raise genai_errors.ClientError(400, {"error": {"code": 400, "message": "too small", "status": "INVALID_ARGUMENT"}})
+        self.created.append(config)
+        return types.CachedContent(name=f"cachedContents/{len(self.created)}")
+
+
+_STATUS = {400: "INVALID_ARGUMENT", 404: "NOT_FOUND"}
+
+
+class _FakeModels:
+    """Fails the first cached request with the status code in reject_cache, if any."""
+
+    def __init__(self, reject_cache=None):
+        self.reject_cache = reject_cache
+        self.configs = []
+
+    async def generate_content(self, model, contents, config):
+        self.configs.append(config)
+        if config.cached_content and self.reject_cache:
+            code, self.reject_cache = self.reject_cache, None
+            raise genai_errors.ClientError(code, {"error": {"code": code, "message": "rejected", "status": _STATUS[code]}})
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text="Hello, Sir.")]))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=3000, cached_content_token_count=2900 if config.cached_content else 0
+            )
+        )
+
+
+@pytest.fixture
+def cached_brain(make_brain):
+    """Factory for a Brain with the prompt cache on."""
+    def make(caches, models):
+        brain = make_brain(models, caches, intents=True, prompt_cache=True)
+        # Declare every tool, so all requests share one cached prefix
+        brain.tool_router = None
+        return brain
+    return make
+
+
+def test_static_prefix_is_cached_once_and_referenced(cached_brain):
+    caches, models = _FakeCaches(), _FakeModels()
+    brain = cached_brain(caches, models)
+    cached_before = LLM_CACHED_TOKENS.value()
+
+    async def run():
+        await brain.generate("Tell me a joke")
+        await brain.generate("Another one")
+    asyncio.run(run())
+
+    assert len(caches.created) == 1
+    assert caches.created[0].tools == [brain.tools]
+    assert all(config.cached_content == "cachedContents/1" for config in models.configs)
+    assert all(config.system_instruction is None and config.tools is None for config in models.configs)
+    assert LLM_CACHED_TOKENS.value() == cached_before + 2 * 2900
+
+
+def test_rejected_cache_falls_back_to_full_prompt(cached_brain):
+    caches, models = _FakeCaches(), _FakeModels(reject_cache=404)
+    brain = cached_brain(caches, models)
+    fallbacks_before = PROMPT_CACHE_EVENTS.value(event="fallback")
+
+    result = asyncio.run(brain.generate("Tell me a joke"))
+
+    assert result["response"] == "Hello, Sir."
+    assert models.configs[-1] is brain._config
+    assert PROMPT_CACHE_EVENTS.value(event="fallback") == fallbacks_before + 1
+    # The rejected cache is forgotten and recreated on the next request
+    asyncio.run(brain.generate("Another one"))
+    assert len(caches.created) == 2
+
+
+def test_other_client_errors_keep_the_cache(cached_brain):
+    caches, models = _FakeCaches(), _FakeModels(reject_cache=400)
+    brain = cached_brain(caches, models)
+    fallbacks_before = PROMPT_CACHE_EVENTS.value(event="fallback")
+
+    # A 400 is not the cache's fault: raised unchanged, no resend without the cache
+    with pytest.raises(genai_errors.ClientError) as raised:
+        asyncio.run(brain.generate("Tell me a joke"))
+    assert raised.value.code == 400
+    assert len(models.configs) == 1
+    assert PROMPT_CACHE_EVENTS.value(event="fallback") == fallbacks_before
+    asyncio.run(brain.generate("Another one"))
+    assert len(caches.created) == 1
+    assert models.configs[-1].cached_content == "cachedContents/1"
+
+
+def test_unavailable_caching_sends_full_prompt(cached_brain):
+    caches, models = _FakeCaches(fail=True), _FakeModels()
+    brain = cached_brain(caches, models)
+
+    asyncio.run(brain.generate("Tell me a joke"))
+
+    assert models.configs == [brain._config]
+    assert models.configs[0].system_instruction
+
+
+
+class _BlockingCaches:
+    """Holds every create() until two are in flight at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.both_started = asyncio.Event()
+
+    async def create(self, model, config):
+        self.in_flight += 1
+        if self.in_flight == 2:
+            self.both_started.set()
+        await self.both_started.wait()
+        return types.CachedContent(name=f"cachedContents/{model}")
+
+
+def test_different_prefixes_are_created_concurrently(fake_client):
+    caches = _BlockingCaches()
+    cache = PromptCache()
+    client = fake_client(caches=caches)
+    tool = types.Tool(function_declarations=[])
+
+    async def run():
+        # Would time out if creating one prefix blocked the other
+        async with asyncio.timeout(5):
+            return await asyncio.gather(
+                cache.get(client, "gemini-fast", "prompt", tool),
+                cache.get(client, "gemini-capable", "prompt", tool)
+            )
+
+    assert asyncio.run(run()) == ["cachedContents/gemini-fast", "cachedContents/gemini-capable"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
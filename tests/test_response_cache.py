@@ -0,0 +1,110 @@
+"""
+Tests for the local semantic response cache (core/response_cache.py).
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.context import ToolCallRecord
+from core.response_cache import ResponseCache, standalone
+from core.tools import TOOL_DECLARATIONS, TOOL_FRESHNESS, ToolResult
+
+HUD = [{"title": "Search: python", "type": "list", "data": {"items": []}}]
+
+
+def test_near_identical_questions_hit():
+    cache = ResponseCache()
+    assert cache.put("What is the capital of France?", "Paris, Sir.", [], [], audio=b"RIFF")
+
+    hit = cache.get("Hey Aura, what's the capital of France")
+    assert hit is not None
+    assert (hit.response, hit.audio) == ("Paris, Sir.", b"RIFF")
+    # One word apart, but a different question
+    assert cache.get("What is the capital of Spain?") is None
+
+
+
+def test_near_miss_questions_do_not_hit():
+    cache = ResponseCache()
+    cache.put("What did the president of France say about the new climate agreement yesterday?", "...", [], [])
+    cache.put("how many people live in the city of bandung in west java province today", "...", [], [])
+    cache.put("Set a reminder for 3 pm about the meeting with the design team", "...", [], [])
+
+    # Long questions that differ only in a name, city or number
+    assert cache.get("What did the president of Germany say about the new climate agreement yesterday?") is None
+    assert cache.get("how many people live in the city of bogor in west java province today") is None
+    assert cache.get("Set a reminder for 4 pm about the meeting with the design team") is None
+    # Same names and numbers, different filler
+    assert cache.get("Aura, what did the president of France say about the new climate agreement yesterday") is not None
+
+
+def test_hits_return_copies_of_the_hud():
+    cache = ResponseCache()
+    search = ToolCallRecord(name="search_web", args={}, result=ToolResult("...", {"results": []}))
+    cache.put("search for python tutorials", "I'd recommend the official tutorial, Sir.", HUD, [search])
+
+    cache.get("search for python tutorials").hud_sections.clear()
+    assert cache.get("search for python tutorials").hud_sections == HUD
+
+
+def test_time_sensitive_and_failed_replies_are_not_stored():
+    cache = ResponseCache()
+    weather = ToolCallRecord(name="get_weather", args={}, result=ToolResult("Sunny", {"temperature": 30}))
+    light = ToolCallRecord(name="turn_on_light", args={}, result={"success": True})
+    failed_search = ToolCallRecord(name="search_web", args={}, result=ToolResult("Search failed", None))
+
+    assert not cache.put("weather in Jakarta", "Sunny, Sir.", [], [weather])
+    assert not cache.put("turn on the light", "Done, Sir.", [], [light])
+    assert not cache.put("search for python", "I couldn't search, Sir.", [], [failed_search])
+    assert len(cache) == 0
+
+
+def test_every_tool_declares_a_freshness_class():
+    for declaration in TOOL_DECLARATIONS:
+        assert TOOL_FRESHNESS[declaration["name"]] in ("stable", "recent", "live", "action")
+
+
+def test_least_recently_used_replies_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("tell me a joke", "Joke, Sir.", [], [])
+    cache.put("who wrote hamlet", "Shakespeare, Sir.", [], [])
+    cache.get("tell me a joke")
+    cache.put("how far is the moon", "384,400 kilometers, Sir.", [], [])
+
+    assert len(cache) == 2
+    assert cache.get("tell me a joke") is not None
+    assert cache.get("who wrote hamlet") is None
+
+
+
+def test_search_replies_expire_sooner_than_stable_ones():
+    cache = ResponseCache()
+    search = ToolCallRecord(name="search_web", args={}, result=ToolResult("...", {"results": []}))
+    assert cache.freshness_ttl(["search_web"]) == 300
+    assert cache.freshness_ttl([]) == 3600
+    assert cache.put("latest AI news", "OpenAI released a model, Sir.", [], [search])
+
+
+def test_replies_expire():
+    cache = ResponseCache(ttls={"stable": 0.05})
+    cache.put("tell me a joke", "Joke, Sir.", [], [])
+    time.sleep(0.1)
+
+    assert cache.get("tell me a joke") is None
+    assert len(cache) == 0
+
+
+def test_only_standalone_questions_are_cacheable_mid_conversation():
+    for query in ["What is the capital of France?", "Tell me a joke", "Hello Aura, how are you?"]:
+        assert standalone(query), query
+    for query in ["Another one", "And in Bandung?", "Turn it off", "What about tomorrow?", "Why is that?"]:
+        assert not standalone(query), query
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
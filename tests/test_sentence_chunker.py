@@ -0,0 +1,42 @@
+"""
+Tests for splitting streamed text into sentences for TTS (core/mouth.py SentenceChunker).
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.mouth import SentenceChunker
+
+
+def test_sentences_are_released_as_soon_as_they_complete():
+    chunker = SentenceChunker()
+
+    assert chunker.feed("It is sunny in Jak") == []
+    assert chunker.feed("arta, Sir. Highs of 31") == ["It is sunny in Jakarta, Sir."]
+    assert chunker.feed(" degrees! Shall I") == ["Highs of 31 degrees!"]
+    assert chunker.flush() == ["Shall I"]
+    assert chunker.flush() == []
+
+
+def test_a_boundary_needs_following_whitespace():
+    chunker = SentenceChunker()
+
+    # "3.5" and a trailing "." might still continue; only ". " ends a sentence
+    assert chunker.feed("It is 3.5 degrees.") == []
+    assert chunker.feed(" Anything else?") == ["It is 3.5 degrees."]
+    assert chunker.flush() == ["Anything else?"]
+
+
+def test_whitespace_only_text_is_not_a_sentence():
+    chunker = SentenceChunker()
+
+    assert chunker.feed("Done.   \n ") == ["Done."]
+    assert chunker.flush() == []
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
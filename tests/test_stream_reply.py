@@ -0,0 +1,68 @@
+"""
+Tests for sentence-level TTS while a reply streams (main.py _stream_reply).
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.admission import OverloadedError
+from core.context import GenerationContext
+
+SENTENCES = [f"Sentence number {index}." for index in range(6)]
+
+
+async def _six_sentences(query, ctx):
+    for sentence in SENTENCES:
+        yield "text_delta", {"text": sentence + " "}
+    ctx.response = " ".join(SENTENCES)
+
+
+def test_each_stream_synthesizes_a_few_sentences_at_a_time(main, monkeypatch):
+    monkeypatch.setattr(main.brain, "generate_stream", _six_sentences)
+    in_flight, peak = [0], [0]
+
+    async def synthesize(sentence):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return sentence.encode()
+
+    async def collect():
+        ctx = GenerationContext(query="Tell me a story")
+        return [event async for event in main._stream_reply(ctx.query, ctx, synthesize)]
+
+    events = asyncio.run(collect())
+
+    assert peak[0] == main.STREAM_SYNTHESIS
+    assert [data["text"] for event, data in events if event == "audio"] == SENTENCES
+
+
+def test_busy_tts_sends_the_sentence_without_audio(main, monkeypatch):
+    monkeypatch.setattr(main.brain, "generate_stream", _six_sentences)
+
+    async def synthesize(sentence):
+        if sentence == SENTENCES[2]:
+            raise OverloadedError("tts", 429, 1, "queue full")
+        return sentence.encode()
+
+    async def collect():
+        ctx = GenerationContext(query="Tell me a story")
+        return [event async for event in main._stream_reply(ctx.query, ctx, synthesize)]
+
+    audio = [data for event, data in asyncio.run(collect()) if event == "audio"]
+
+    # The stream carries on past the overloaded sentence
+    assert [data["index"] for data in audio] == list(range(6))
+    assert audio[2]["audio"] is None
+    assert audio[5]["audio"] == SENTENCES[5].encode()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
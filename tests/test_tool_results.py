@@ -0,0 +1,121 @@
+"""
+Tests that external tools fetch once and share the result between the
+model-facing text and the HUD sections.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.genai import types
+
+import core.brain
+import core.tools.weather_tool as weather_tool
+from core.brain import Brain
+from core.context import GenerationContext
+from core.tools import ToolResult
+from core.tools.calendar_tool import calendar_hud
+from settings.config_loader import config
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {
+            "name": "Jakarta", "sys": {"country": "ID", "sunrise": 1760000000, "sunset": 1760040000},
+            "main": {"temp": 31.26, "feels_like": 35.0, "humidity": 66, "pressure": 1009},
+            "weather": [{"description": "scattered clouds", "icon": "03d"}],
+            "wind": {"speed": 3.1}, "clouds": {"all": 40}, "visibility": 10000
+        }
+
+
+def test_weather_is_fetched_once_for_text_and_hud(monkeypatch):
+    requests_made = []
+
+    def fake_get(url, params=None, timeout=None):
+        requests_made.append(params)
+        return _FakeResponse()
+
+    original_get = config.get
+    monkeypatch.setattr(weather_tool.requests, "get", fake_get)
+    monkeypatch.setattr(config, "get", lambda key, default=None: "key" if key == "api_keys.openweather" else original_get(key, default))
+
+    result = weather_tool.get_weather_result("Jakarta")
+    assert isinstance(result, ToolResult)
+    assert "The weather in Jakarta is scattered clouds" in result.text
+    assert "31.3 degrees Celsius" in result.text
+
+    sections = Brain()._process_tool_call_for_hud("get_weather", {"location": "Jakarta"}, result)
+    assert [section["title"] for section in sections] == ["Current Conditions", "Weather - Jakarta, ID", "Sun Times"]
+    assert len(requests_made) == 1
+
+
+def test_failed_tool_result_has_no_hud_data():
+    result = ToolResult(text="Location 'Atlantis' not found. Please check the city name.")
+    assert str(result) == result.text
+    assert Brain()._process_tool_call_for_hud("get_weather", {"location": "Atlantis"}, result) == []
+
+
+
+def test_unusable_calendar_data_falls_back_to_text():
+    result = ToolResult(text="Your next event is Standup at 9:00 AM.", data={"events": [{"summary": "Standup"}]})
+    assert calendar_hud({}, result) == [
+        {"title": "Upcoming Events", "type": "text", "data": {"text": "Your next event is Standup at 9:00 AM."}}
+    ]
+
+    empty = ToolResult(text="No upcoming events found.", data={"events": None})
+    assert calendar_hud({}, empty) == []
+
+
+class _SecondRoundWaitingForHud:
+    """Asks for the weather, then answers only once HUD rendering has started."""
+
+    def __init__(self, hud_started, round2_started):
+        self.hud_started = hud_started
+        self.round2_started = round2_started
+        self.saw_hud_rendering = False
+
+    async def generate_content(self, model, contents, config):
+        if len(contents) == 1:
+            return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+                role="model", parts=[types.Part.from_function_call(name="get_weather", args={"location": "Jakarta"})]
+            ))])
+        self.round2_started.set()
+        for _ in range(500):
+            if self.hud_started.is_set():
+                self.saw_hud_rendering = True
+                break
+            await asyncio.sleep(0.01)
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+            role="model", parts=[types.Part.from_text(text="Sunny, Sir.")]
+        ))])
+
+
+def test_hud_is_rendered_while_the_model_replies(monkeypatch, make_brain):
+    # Each side waits for the other, so only overlapping stages see both events
+    hud_started, round2_started = threading.Event(), threading.Event()
+
+    def waiting_weather_hud(args, result):
+        hud_started.set()
+        overlapped = round2_started.wait(timeout=5)
+        return [{"title": f"Weather - {args['location']}", "overlapped": overlapped}]
+
+    monkeypatch.setitem(core.brain.TOOL_FUNCTIONS, "get_weather", lambda location, temperature="C": "Sunny")
+    monkeypatch.setitem(core.brain.HUD_RENDERERS, "get_weather", waiting_weather_hud)
+    models = _SecondRoundWaitingForHud(hud_started, round2_started)
+    brain = make_brain(models)
+
+    ctx = GenerationContext(query="What's the weather in Jakarta?")
+    result = asyncio.run(brain.generate(ctx.query, ctx))
+
+    assert result["hud_sections"] == [{"title": "Weather - Jakarta", "overlapped": True}]
+    assert models.saw_hud_rendering
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,108 @@
+"""
+Tests for query-aware tool declaration pruning (core/tool_router.py).
+"""
+
+import asyncio
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from google.genai import types
+
+from core.context import GenerationContext
+from core.tool_router import ToolRouter
+from core.tools import TOOL_DECLARATIONS, TOOL_GROUPS
+
+
+def _names(declarations):
+    return {declaration["name"] for declaration in declarations}
+
+
+def test_every_declaration_belongs_to_one_group():
+    grouped = [declaration["name"] for declarations in TOOL_GROUPS.values() for declaration in declarations]
+    assert sorted(grouped) == sorted(_names(TOOL_DECLARATIONS))
+
+
+def test_router_selects_groups_from_keywords():
+    router = ToolRouter(always=["time"], fallback=["search"])
+    assert router.select("Will it rain in Bandung?") == {"weather", "time"}
+    assert router.select("What's on my calendar?") == {"calendar", "time"}
+    assert router.select("Dim the lamp and add a task to buy milk") == {"lights", "todo", "time"}
+    assert router.select("Look up the latest AI news") == {"search", "time"}
+
+
+def test_router_falls_back_and_follows_up():
+    router = ToolRouter(always=["time"], fallback=["search"])
+    # Nothing matched: the safe fallback set is declared
+    assert router.select("Tell me a joke") == {"search", "time"}
+    # A follow-up keeps the groups of the question it refers to
+    assert router.select("And in Surabaya?", "What's the weather in Jakarta?") == {"weather", "time"}
+    assert router.select("Turn it off", "Turn on the bedroom lights") == {"lights", "time"}
+    # A follow-up that can't be placed gets every tool, not just the fallback
+    assert router.select("Turn it off", "I can't see a thing") == set(TOOL_GROUPS)
+
+
+def test_router_rejects_unknown_groups():
+    try:
+        ToolRouter(always=["time"], fallback=["teleport"])
+        raise AssertionError("unknown group should be rejected")
+    except ValueError:
+        pass
+
+
+class _RecordingModels:
+    def __init__(self):
+        self.configs = []
+
+    async def generate_content(self, model, contents, config):
+        self.configs.append(config)
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text="Hello, Sir.")]))]
+        )
+
+
+@pytest.fixture
+def routed_brain(make_brain):
+    """Factory for a Brain whose router always adds time and falls back to search."""
+    def make(models):
+        brain = make_brain(models)
+        brain.tool_router = ToolRouter(always=["time"], fallback=["search"])
+        return brain
+    return make
+
+
+def test_brain_declares_only_the_selected_tools(routed_brain):
+    models = _RecordingModels()
+    brain = routed_brain(models)
+
+    asyncio.run(brain.generate("What's the weather in Jakarta?"))
+
+    declared = {declaration.name for declaration in models.configs[0].tools[0].function_declarations}
+    assert declared == {"get_weather", "get_time", "get_date"}
+    # The instruction only describes the declared tools
+    instruction = models.configs[0].system_instruction
+    assert "get_weather:" in instruction and "get_date:" in instruction
+    assert "turn_on_light" not in instruction and "get_calendar_events" not in instruction
+
+
+def test_brain_uses_the_previous_turn_for_follow_ups(routed_brain):
+    models = _RecordingModels()
+    brain = routed_brain(models)
+    history = [
+        types.Content(role="user", parts=[types.Part.from_text(text="Show my tasks")]),
+        types.Content(role="model", parts=[types.Part.from_text(text="You have 2 pending tasks, Sir.")])
+    ]
+
+    ctx = GenerationContext(query="What about the urgent ones?", conversation=history)
+    asyncio.run(brain.generate("What about the urgent ones?", ctx))
+
+    declared = {declaration.name for declaration in models.configs[0].tools[0].function_declarations}
+    assert "get_tasks" in declared and "get_weather" not in declared
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
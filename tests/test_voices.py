@@ -0,0 +1,97 @@
+"""
+Tests for loading Piper voices on demand (core/mouth.py VoicePool) and
+switching them over /ws.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from core.mouth import Mouth, VoicePool, installed_voices
+
+
+def _install(data_dir, *names):
+    for name in names:
+        (data_dir / f"en_GB-{name}-medium.onnx").write_bytes(b"")
+
+
+def test_installed_voices_are_read_from_model_names(tmp_path):
+    _install(tmp_path, "cori", "alba", "northern_english_male")
+
+    assert installed_voices(tmp_path) == {"cori", "alba", "northern_english_male"}
+
+
+def test_unknown_voices_are_rejected_without_loading(tmp_path):
+    _install(tmp_path, "cori", "alba")
+    pool = VoicePool(Mouth(model_name="cori", data_dir=tmp_path))
+
+    # "co" would match the cori model by substring; "*" would match any model
+    for voice in ["nobody", "co", "*", "../cori"]:
+        with pytest.raises(FileNotFoundError):
+            pool.get(voice)
+    assert len(pool) == 1
+    assert pool.get("alba").model_name == "alba"
+
+
+def test_least_recently_used_voices_are_unloaded(tmp_path):
+    _install(tmp_path, "cori", "alba", "jenny", "semaine")
+    default = Mouth(model_name="cori", data_dir=tmp_path)
+    pool = VoicePool(default, max_voices=3)
+
+    alba = pool.get("alba")
+    pool.get("jenny")
+    assert pool.get("alba") is alba
+    pool.get("semaine")
+
+    assert len(pool) == 3
+    assert pool.get("cori") is default
+    assert pool.get("alba") is alba
+    assert pool.get("jenny") is not None  # reloaded after eviction
+    assert len(pool) == 3
+
+
+
+class _FakeMouth:
+    def __init__(self, voice):
+        self.model_name = voice
+
+    async def synthesize_async(self, text):
+        return self.model_name.encode()
+
+
+def test_ws_resolves_the_voice_when_it_is_set_not_per_query(main, monkeypatch):
+    resolved = []
+
+    def mouth_for_voice(voice):
+        resolved.append(voice)
+        return _FakeMouth(voice)
+
+    async def one_sentence(query, ctx):
+        yield "text_delta", {"text": "Hello, Sir."}
+        ctx.response = "Hello, Sir."
+
+    monkeypatch.setattr(main, "_mouth_for_voice", mouth_for_voice)
+    monkeypatch.setattr(main.brain, "generate_stream", one_sentence)
+
+    with TestClient(main.app).websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "session", "voice": "alba"})
+        assert ws.receive_json()["voice"] == "alba"
+        for _ in range(2):
+            ws.send_json({"type": "query", "query": "Hi"})
+            while ws.receive_json()["type"] != "audio":
+                pass
+            assert ws.receive_bytes() == b"alba"
+            while ws.receive_json()["type"] != "done":
+                pass
+
+    assert resolved == ["alba"]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
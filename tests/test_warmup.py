@@ -0,0 +1,71 @@
+"""
+Tests for startup warm-up and readiness (core/warmup.py).
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from core.warmup import WarmUp
+
+
+def test_steps_run_concurrently_and_report_their_outcome():
+    gemini_started = asyncio.Event()
+
+    async def gemini():
+        gemini_started.set()
+
+    async def piper():
+        # Only finishes if the gemini step runs alongside it
+        await asyncio.wait_for(gemini_started.wait(), timeout=5)
+
+    async def calendar():
+        return False
+
+    async def tasks():
+        raise RuntimeError("database is locked")
+
+    warm_up = WarmUp({"piper": piper, "gemini": gemini, "calendar": calendar, "tasks": tasks})
+    assert not warm_up.ready
+    asyncio.run(warm_up.run())
+
+    # A failed step is reported but does not hold back readiness
+    assert warm_up.ready
+    assert {name: result["status"] for name, result in warm_up.results.items()} == {
+        "piper": "ok", "gemini": "ok", "calendar": "skipped", "tasks": "failed"
+    }
+    assert warm_up.results["tasks"]["error"] == "database is locked"
+
+
+def test_hung_steps_are_abandoned_after_the_timeout():
+    async def hang():
+        await asyncio.Event().wait()
+
+    warm_up = WarmUp({"gemini": hang}, timeout=0.05)
+    asyncio.run(warm_up.run())
+
+    assert warm_up.ready
+    assert warm_up.results["gemini"]["status"] == "failed"
+    assert warm_up.results["gemini"]["error"] == "TimeoutError"
+
+
+def test_readyz_waits_for_warm_up_but_healthz_does_not(main, monkeypatch):
+    client = TestClient(main.app)
+
+    monkeypatch.setattr(main.warm_up, "ready", False)
+    assert client.get("/healthz").status_code == 200
+    assert client.get("/readyz").status_code == 503
+
+    monkeypatch.setattr(main.warm_up, "ready", True)
+    assert client.get("/readyz").json()["status"] == "ready"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))